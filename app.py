@@ -1,15 +1,17 @@
 """Streamlit Web UI for Verizon Customer Call Classification System."""
 
+import csv
+import io
+import os
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from tools.classification_tools import (
-    classify_call_category,
-    analyze_call_transcript,
-    extract_customer_info,
-    generate_classification_report
-)
+from dotenv import load_dotenv
+
+load_dotenv()
 
 # Page configuration
 st.set_page_config(
@@ -31,9 +33,451 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Initialize session state for call history
-if 'call_history' not in st.session_state:
-    st.session_state.call_history = []
+# ==================== CACHED RESOURCES ====================
+# Streamlit re-runs this script on every interaction. The classifier is
+# built once per server, results and reports are memoized per transcript
+# hash, and plotly is only imported when a chart is first drawn. pandas is
+# not needed: tables take lists of rows and counts come from Counter.
+# With CLASSIFICATION_SERVICE_URL set, calls are classified by
+# classification_service.py and this app only renders the results.
+
+@st.cache_resource(show_spinner=False)
+def load_classifier():
+    """Compile the keyword ruleset and open the shared result cache, once per server."""
+    from tools.result_cache import get_default_cache
+    from tools.ruleset import get_ruleset
+    
+    get_ruleset()
+    return get_default_cache()
+
+
+@st.cache_resource(show_spinner=False)
+def load_service_client():
+    """The classification service client, or None when CLASSIFICATION_SERVICE_URL is unset."""
+    from tools.service_client import get_service_client
+    
+    return get_service_client()
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def service_health() -> Optional[Dict]:
+    """The classification service's health, or None if it cannot be reached; re-checked every few seconds."""
+    try:
+        return load_service_client().health()
+    except (OSError, RuntimeError, ValueError):
+        return None
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _classify(key: str, _transcript: str) -> Dict:
+    """Keyword results and rendered exports of a transcript, memoized by its content hash."""
+    from tools.classification_tools import render_report
+    from tools.result_cache import classify_transcript_cached
+    
+    results = classify_transcript_cached(_transcript, load_classifier())
+    return {
+        **results,
+        'report': render_report(**results),
+        'csv': render_report(**results, output_format="csv"),
+        'json': render_report(**results, output_format="json")
+    }
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _classify_remote(key: str, _transcript: str) -> Dict:
+    """Service results and rendered exports of a transcript; failures raise and are not memoized."""
+    call = load_service_client().classify(_transcript, reports=("text", "csv", "json"))
+    reports = call.pop('reports')
+    call.pop('status', None)
+    return {**call, 'report': reports['text'], 'csv': reports['csv'], 'json': reports['json']}
+
+
+@st.cache_resource(show_spinner=False)
+def load_history():
+    """Open the persistent call history, once per server."""
+    from tools.history_store import get_history_store
+    
+    return get_history_store()
+
+
+def classify_call(transcript: str) -> Dict:
+    """
+    Classify a transcript, through the classification service when one is configured and up.
+    
+    The hash includes the ruleset fingerprint (the service's, when it is used),
+    so rule changes are picked up even without a version bump.
+    """
+    from tools.result_cache import cache_key
+    from tools.service_client import ServiceError
+    
+    health = service_health() if load_service_client() is not None else None
+    if health is not None:
+        try:
+            return _classify_remote(cache_key(transcript, health['ruleset_fingerprint']), transcript)
+        except (ServiceError, OSError) as e:
+            # Classify in this process rather than fail the user's request
+            st.warning(f"Classification service failed ({e}); classified in this app instead.")
+    load_classifier()
+    return _classify(cache_key(transcript), transcript)
+
+
+# Figures are cached as shared resources: unpickling a cached copy costs
+# more than building one, and st.plotly_chart does not modify them
+@st.cache_resource(max_entries=256, show_spinner=False)
+def bar_chart(labels: Sequence[str], values: Sequence[float], title: str, x_title: str, y_title: str,
+              highlight: Optional[str] = None):
+    """Build a bar chart; plotly is imported on first use."""
+    import plotly.graph_objects as go
+    
+    colors = None
+    if highlight is not None:
+        colors = ['#1f77b4' if label == highlight else '#d3d3d3' for label in labels]
+    fig = go.Figure(data=[go.Bar(x=list(labels), y=list(values), marker_color=colors)])
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        height=400,
+        showlegend=False
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def pie_chart(labels: Sequence[str], values: Sequence[int], title: str):
+    """Build a pie chart; plotly is imported on first use."""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(data=[go.Pie(labels=list(labels), values=list(values))])
+    fig.update_layout(title=title)
+    return fig
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def timeline_chart(series: Sequence, granularity: str, title: str):
+    """Build a stacked bar chart of (bucket start, calls) points per label; plotly is imported on first use."""
+    import plotly.graph_objects as go
+    
+    time_format = "%Y-%m-%d" if granularity == "day" else "%Y-%m-%d %H:%M"
+    fig = go.Figure(data=[
+        go.Bar(name=label, x=[datetime.fromtimestamp(bucket).strftime(time_format) for bucket, _ in points],
+               y=[calls for _, calls in points])
+        for label, points in series
+    ])
+    fig.update_layout(title=title, barmode="stack", height=400,
+                      xaxis={"type": "category", "categoryorder": "category ascending"})
+    return fig
+
+
+def value_counts(values: List[str]) -> Dict[str, int]:
+    """Count values, most common first."""
+    return dict(Counter(values).most_common())
+
+
+def to_csv(rows: List[Dict]) -> str:
+    """Render table rows as CSV."""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=list(rows[0].keys()))
+    writer.writeheader()
+    writer.writerows(rows)
+    return output.getvalue()
+
+
+def render_call_result(call: Dict) -> None:
+    """Show the keyword classification of one call with its charts and exports."""
+    classification = call['classification']
+    analysis = call['analysis']
+    customer_info = call['customer_info']
+    
+    # Display results
+    st.success("✅ Classification Complete!")
+    
+    # Main classification card
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric(
+            "Primary Category",
+            classification['primary_category'].upper(),
+            f"{classification['confidence_score']}% confident"
+        )
+    
+    with col2:
+        st.metric(
+            "Sentiment",
+            analysis['sentiment'],
+            analysis['urgency_level'] + " Urgency"
+        )
+    
+    with col3:
+        st.metric(
+            "Duration Estimate",
+            analysis['duration_estimate'],
+            f"{analysis['word_count']} words"
+        )
+    
+    st.markdown("---")
+    
+    # Detailed Results
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.markdown("### 📊 Classification Details")
+        st.markdown(f"""
+        **Primary Category:** {classification['primary_category'].upper()}
+    
+        **Description:** {classification['category_description']}
+    
+        **Confidence Score:** {classification['confidence_score']}%
+    
+        **Recommendation:** {classification['recommendation']}
+        """)
+    
+    with col2:
+        st.markdown("### 📝 Analysis Summary")
+        st.markdown(f"""
+        **Sentiment:** {analysis['sentiment']}
+    
+        **Urgency:** {analysis['urgency_level']}
+    
+        **Duration:** {analysis['duration_estimate']}
+    
+        **Topics:** {', '.join(analysis['key_topics'])}
+        """)
+    
+    st.markdown("---")
+    
+    # Customer Information
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("### 📱 Services Mentioned")
+        if customer_info['mentioned_services']:
+            for service in customer_info['mentioned_services']:
+                st.write(f"• {service.title()}")
+        else:
+            st.write("None identified")
+    
+    with col2:
+        st.markdown("### ⚠️ Issues Reported")
+        if customer_info['issues_reported']:
+            for issue in customer_info['issues_reported']:
+                st.write(f"• {issue.title()}")
+        else:
+            st.write("None reported")
+    
+    with col3:
+        st.markdown("### 🎯 Customer Requests")
+        if customer_info['requests']:
+            for request in customer_info['requests']:
+                st.write(f"• {request.title()}")
+        else:
+            st.write("No specific requests")
+    
+    st.markdown("---")
+    
+    # Category Confidence Chart
+    st.markdown("### 📊 Category Confidence Scores")
+    
+    fig = bar_chart(
+        tuple(classification['all_scores'].keys()),
+        tuple(classification['all_scores'].values()),
+        "Confidence Scores by Category", "Category", "Score",
+        highlight=classification['primary_category']
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Sentiment Indicators
+    if customer_info['sentiment_markers']:
+        st.markdown("### 💭 Sentiment Indicators")
+        for marker in customer_info['sentiment_markers']:
+            st.info(marker)
+    
+    # Full Report, rendered once per transcript together with the exports
+    with st.expander("📄 Full Classification Report"):
+        st.text(call['report'])
+    
+    # Export options
+    st.markdown("---")
+    st.markdown("### 💾 Export Options")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.download_button(
+            label="📥 Download Report (TXT)",
+            data=call['report'],
+            file_name="classification_report.txt",
+            mime="text/plain"
+        )
+    
+    with col2:
+        st.download_button(
+            label="📊 Download CSV",
+            data=call['csv'],
+            file_name="classification_data.csv",
+            mime="text/csv"
+        )
+    
+    with col3:
+        st.download_button(
+            label="📋 Download JSON",
+            data=call['json'],
+            file_name="classification_data.json",
+            mime="application/json"
+        )
+
+
+@st.cache_resource(show_spinner=False)
+def setup_crew_locks() -> None:
+    """Set up crewai's process-wide locks, once per server, before the first crew runs."""
+    from src.crew import install_crew_locks
+    
+    install_crew_locks()
+
+
+def start_crew_run(transcript: str) -> None:
+    """Start a background crew run for the transcript, replacing any earlier one."""
+    if not os.getenv("OPENAI_API_KEY"):
+        st.warning("⚠️ Set OPENAI_API_KEY to run the AI analysis; showing the keyword result only.")
+        return
+    # Imported here so keyword-only sessions never load crewai
+    from src.progressive import ProgressiveCrewRun
+    
+    setup_crew_locks()
+    previous = st.session_state.get("crew_run")
+    if previous is not None and not previous.done:
+        previous.cancel()
+    st.session_state.crew_run = ProgressiveCrewRun(transcript).start()
+
+
+def render_crew_run() -> None:
+    """Show the crew stages finished so far, with a cancel button while the run is in flight."""
+    run = st.session_state.crew_run
+    st.markdown("---")
+    if not run.done and st.button("⏹️ Cancel AI Analysis", key="cancel_crew_run"):
+        run.cancel()
+    
+    snapshot = run.snapshot()
+    labels = {
+        "running": f"🤖 AI analysis in progress... ({snapshot['elapsed']}s)",
+        "cancelling": "⏹️ Cancelling after the current stage...",
+        "cancelled": f"⏹️ AI analysis cancelled after {len(snapshot['stages'])} stages",
+        "done": f"✅ AI analysis complete in {snapshot['elapsed']}s",
+        "error": "❌ AI analysis failed"
+    }
+    states = {"done": "complete", "error": "error"}
+    with st.status(labels.get(snapshot["status"], snapshot["status"]),
+                   state=states.get(snapshot["status"], "running"), expanded=True):
+        for stage in snapshot["stages"]:
+            st.markdown(f"#### {stage['title']} · {stage['seconds']}s")
+            st.markdown(stage["output"])
+        if snapshot["error"]:
+            st.error(snapshot["error"])
+        if snapshot["tokens_saved"]:
+            st.caption(f"Transcript condensed for the prompts, saving {snapshot['tokens_saved']} tokens per stage")
+
+
+# Calls per page of the Analysis tab's history table
+HISTORY_PAGE_SIZE = 50
+
+# Analysis tab time ranges: (seconds back, rollup granularity); None means all time
+TIME_RANGES = {
+    "Last hour": (3600, "minute"),
+    "Last 24 hours": (86400, "hour"),
+    "Last 30 days": (30 * 86400, "day"),
+    "All time": (None, "day")
+}
+
+# Rows of a finished batch job shown in the table; the CSV download has all of them
+BATCH_PREVIEW_ROWS = 1000
+
+
+def submit_batch_job(name: str, data: bytes) -> None:
+    """Queue an uploaded file on the shared batch job manager and remember it for this session."""
+    from tools.batch_jobs import get_job_manager
+    
+    job = get_job_manager().submit(name, data)
+    st.session_state.setdefault("batch_jobs", []).append(job.id)
+
+
+def session_batch_jobs() -> List:
+    """This session's batch jobs, newest first; jobs dropped from the manager's history are skipped."""
+    from tools.batch_jobs import get_job_manager
+    
+    manager = get_job_manager()
+    jobs = [manager.get(job_id) for job_id in reversed(st.session_state.get("batch_jobs", []))]
+    return [job for job in jobs if job is not None]
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def batch_results_csv(job_id: str, status: str, processed: int, _job) -> str:
+    """A finished job's results as CSV, serialized once rather than on every rerun and poll."""
+    output = io.StringIO()
+    _job.write_results(output, "csv")
+    return output.getvalue()
+
+
+def render_batch_jobs() -> None:
+    """Show progress, throughput and, once finished, the results of this session's batch jobs."""
+    jobs = session_batch_jobs()
+    for job in jobs:
+        snapshot = job.snapshot()
+        st.markdown("---")
+        header, action = st.columns([4, 1])
+        header.markdown(f"### 📁 {snapshot['name']} · {snapshot['status']}")
+        if not job.done and action.button("⏹️ Cancel", key=f"cancel_batch_{snapshot['id']}"):
+            job.cancel()
+            snapshot = job.snapshot()
+        
+        total = snapshot["total"]
+        if total:
+            st.progress(min(1.0, snapshot["processed"] / total),
+                        text=f"{snapshot['processed']:,} of {total:,} calls")
+        elif not job.done:
+            st.progress(0.0, text="Reading upload...")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Processed", f"{snapshot['processed']:,}")
+        col2.metric("Throughput", f"{snapshot['calls_per_second']:,.0f} calls/s")
+        col3.metric("Elapsed", f"{snapshot['elapsed']:.1f}s")
+        col4.metric("Errors", snapshot["errors"])
+        
+        if snapshot["error"]:
+            st.error(f"❌ Error processing {snapshot['name']}: {snapshot['error']}")
+        if not job.done or not snapshot["processed"]:
+            continue
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            categories = snapshot["categories"]
+            fig = bar_chart(tuple(label.upper() for label in categories), tuple(categories.values()),
+                            "Category Distribution", "Category", "Count")
+            st.plotly_chart(fig, use_container_width=True, key=f"batch_categories_{snapshot['id']}")
+        with col2:
+            sentiments = snapshot["sentiments"]
+            fig = pie_chart(tuple(sentiments), tuple(sentiments.values()), "Sentiment Distribution")
+            st.plotly_chart(fig, use_container_width=True, key=f"batch_sentiments_{snapshot['id']}")
+        
+        st.dataframe(job.rows[:BATCH_PREVIEW_ROWS], use_container_width=True)
+        if snapshot["processed"] > BATCH_PREVIEW_ROWS:
+            st.caption(f"Showing the first {BATCH_PREVIEW_ROWS:,} calls; download the CSV for all of them")
+        
+        st.download_button(
+            label="📥 Download Batch Results (CSV)",
+            data=batch_results_csv(snapshot['id'], snapshot['status'], snapshot['processed'], job),
+            file_name=f"{os.path.splitext(snapshot['name'])[0]}_results.csv",
+            mime="text/csv",
+            use_container_width=True,
+            key=f"download_batch_{snapshot['id']}"
+        )
+    
+    # Polling fragments keep their interval; once every job is finished, rerun the page to stop polling
+    if st.session_state.get("batch_jobs_polling") and all(job.done for job in jobs):
+        st.session_state.batch_jobs_polling = False
+        st.rerun()
+
 
 # ==================== HEADER ====================
 st.markdown("# 📞 ABC Telecom Customer Call Classifier")
@@ -67,6 +511,21 @@ with st.sidebar:
     
     st.markdown("### 📈 Call History")
     show_history = st.checkbox("Show Call History", value=False)
+    
+    st.markdown("### ⚡ Result Cache")
+    if load_service_client() is not None and service_health() is not None:
+        health = service_health()
+        st.caption(f"Classification service {load_service_client().base_url} · ruleset "
+                   f"{health['ruleset_version']} · {health['workers']} workers")
+        cache_stats = health['cache']
+    else:
+        if load_service_client() is not None:
+            st.warning("⚠️ Classification service unreachable; classifying in this app")
+        cache_stats = load_classifier().stats()
+    st.caption(
+        f"{cache_stats['hits']} hits · {cache_stats['misses']} misses · "
+        f"{cache_stats['hit_rate']}% hit rate"
+    )
 
 # ==================== MAIN CONTENT ====================
 
@@ -104,244 +563,129 @@ Agent: Let me escalate this to technical support.""",
     # Classify button
     if st.button("🔍 Classify Call", use_container_width=True, type="primary"):
         if transcript.strip():
-            with st.spinner("🔄 Analyzing call..."):
-                try:
-                    # Analyze the transcript
-                    analysis = analyze_call_transcript(transcript)
-                    customer_info = extract_customer_info(transcript)
-                    classification = classify_call_category(transcript, analysis)
-                    
-                    # Store in session state
-                    st.session_state.call_history.append({
-                        'transcript': transcript,
-                        'classification': classification,
-                        'analysis': analysis,
-                        'customer_info': customer_info
-                    })
-                    
-                    # Display results
-                    st.success("✅ Classification Complete!")
-                    
-                    # Main classification card
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric(
-                            "Primary Category",
-                            classification['primary_category'].upper(),
-                            f"{classification['confidence_score']}% confident"
-                        )
-                    
-                    with col2:
-                        st.metric(
-                            "Sentiment",
-                            analysis['sentiment'],
-                            analysis['urgency_level'] + " Urgency"
-                        )
-                    
-                    with col3:
-                        st.metric(
-                            "Duration Estimate",
-                            analysis['duration_estimate'],
-                            len(transcript.split()) + " words"
-                        )
-                    
-                    st.markdown("---")
-                    
-                    # Detailed Results
-                    col1, col2 = st.columns([1, 1])
-                    
-                    with col1:
-                        st.markdown("### 📊 Classification Details")
-                        st.markdown(f"""
-                        **Primary Category:** {classification['primary_category'].upper()}
-                        
-                        **Description:** {classification['category_description']}
-                        
-                        **Confidence Score:** {classification['confidence_score']}%
-                        
-                        **Recommendation:** {classification['recommendation']}
-                        """)
-                    
-                    with col2:
-                        st.markdown("### 📝 Analysis Summary")
-                        st.markdown(f"""
-                        **Sentiment:** {analysis['sentiment']}
-                        
-                        **Urgency:** {analysis['urgency_level']}
-                        
-                        **Duration:** {analysis['duration_estimate']}
-                        
-                        **Topics:** {', '.join(analysis['key_topics'])}
-                        """)
-                    
-                    st.markdown("---")
-                    
-                    # Customer Information
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.markdown("### 📱 Services Mentioned")
-                        if customer_info['mentioned_services']:
-                            for service in customer_info['mentioned_services']:
-                                st.write(f"• {service.title()}")
-                        else:
-                            st.write("None identified")
-                    
-                    with col2:
-                        st.markdown("### ⚠️ Issues Reported")
-                        if customer_info['issues_reported']:
-                            for issue in customer_info['issues_reported']:
-                                st.write(f"• {issue.title()}")
-                        else:
-                            st.write("None reported")
-                    
-                    with col3:
-                        st.markdown("### 🎯 Customer Requests")
-                        if customer_info['requests']:
-                            for request in customer_info['requests']:
-                                st.write(f"• {request.title()}")
-                        else:
-                            st.write("No specific requests")
-                    
-                    st.markdown("---")
-                    
-                    # Category Confidence Chart
-                    st.markdown("### 📊 Category Confidence Scores")
-                    
-                    # Prepare data for chart
-                    categories = list(classification['all_scores'].keys())
-                    scores = list(classification['all_scores'].values())
-                    
-                    # Create bar chart
-                    fig = go.Figure(data=[
-                        go.Bar(
-                            x=categories,
-                            y=scores,
-                            marker_color=['#1f77b4' if cat == classification['primary_category'] else '#d3d3d3' 
-                                        for cat in categories]
-                        )
-                    ])
-                    fig.update_layout(
-                        title="Confidence Scores by Category",
-                        xaxis_title="Category",
-                        yaxis_title="Score",
-                        height=400,
-                        showlegend=False
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    st.markdown("---")
-                    
-                    # Sentiment Indicators
-                    if customer_info['sentiment_markers']:
-                        st.markdown("### 💭 Sentiment Indicators")
-                        for marker in customer_info['sentiment_markers']:
-                            st.info(marker)
-                    
-                    # Full Report
-                    with st.expander("📄 Full Classification Report"):
-                        report = generate_classification_report(transcript)
-                        st.text(report)
-                    
-                    # Export options
-                    st.markdown("---")
-                    st.markdown("### 💾 Export Options")
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        report = generate_classification_report(transcript)
-                        st.download_button(
-                            label="📥 Download Report (TXT)",
-                            data=report,
-                            file_name="classification_report.txt",
-                            mime="text/plain"
-                        )
-                    
-                    with col2:
-                        csv_data = f"""Category,Confidence,Sentiment,Urgency,Duration
-{classification['primary_category']},{classification['confidence_score']},{analysis['sentiment']},{analysis['urgency_level']},{analysis['duration_estimate']}"""
-                        st.download_button(
-                            label="📊 Download CSV",
-                            data=csv_data,
-                            file_name="classification_data.csv",
-                            mime="text/csv"
-                        )
-                    
-                    with col3:
-                        import json
-                        json_data = json.dumps({
-                            'classification': classification,
-                            'analysis': analysis,
-                            'customer_info': {k: v for k, v in customer_info.items() if k != 'sentiment_markers'}
-                        }, indent=2)
-                        st.download_button(
-                            label="📋 Download JSON",
-                            data=json_data,
-                            file_name="classification_data.json",
-                            mime="application/json"
-                        )
+            try:
+                # Analyze the transcript (re-submitted calls come from the cache)
+                call = classify_call(transcript)
+                
+                # Record in the persistent history
+                load_history().add(transcript, call)
+                st.session_state.current_call = call
                 
-                except Exception as e:
-                    st.error(f"❌ Error processing call: {str(e)}")
+                # The keyword verdict is final for routing; the crew's
+                # analysis streams in below as each stage finishes
+                if method == "AI-Powered (Slow)":
+                    start_crew_run(transcript)
+            
+            except Exception as e:
+                st.session_state.current_call = None
+                st.error(f"❌ Error processing call: {str(e)}")
         else:
             st.warning("⚠️ Please enter a call transcript first!")
+    
+    # Results stay on the page across reruns; charts and reports come from the cache
+    if st.session_state.get("current_call"):
+        render_call_result(st.session_state.current_call)
+    
+    crew_run = st.session_state.get("crew_run")
+    if crew_run is not None:
+        st.fragment(run_every=None if crew_run.done else 1.0)(render_crew_run)()
 
 # ==================== TAB 2: ANALYSIS ====================
 with tab2:
     st.markdown("## Historical Analysis")
     
-    if st.session_state.call_history:
-        st.success(f"✅ Processed {len(st.session_state.call_history)} calls")
+    history = load_history()
+    # Totals and charts come from the minute/hour/day rollups; only filtered views query the calls
+    all_calls = history.rollup_summary()
+    
+    if all_calls["total"]:
+        col0, col1, col2, col3 = st.columns(4)
+        with col0:
+            time_range = st.selectbox("Time Range", list(TIME_RANGES), index=len(TIME_RANGES) - 1, key="history_range")
+        with col1:
+            category_filter = st.selectbox("Category", ["All"] + sorted(all_calls["categories"]), key="history_category")
+        with col2:
+            sentiment_filter = st.selectbox("Sentiment", ["All"] + sorted(all_calls["sentiments"]), key="history_sentiment")
+        with col3:
+            urgency_filter = st.selectbox("Urgency", ["All"] + sorted(all_calls["urgencies"]), key="history_urgency")
+        filters = {
+            "category": None if category_filter == "All" else category_filter,
+            "sentiment": None if sentiment_filter == "All" else sentiment_filter,
+            "urgency": None if urgency_filter == "All" else urgency_filter
+        }
+        from tools.rollups import bucket_start
+        
+        seconds, granularity = TIME_RANGES[time_range]
+        now = time.time()
+        # Rounded down to a whole bucket so rollups and filtered queries cover the same calls
+        since = bucket_start(now - seconds, granularity) if seconds else None
+        if any(filters.values()):
+            summary = history.summary(since=since, **filters)
+        else:
+            summary = history.rollup_summary(granularity, since)
+        
+        st.success(f"✅ Processed {all_calls['total']:,} calls" +
+                   (f" · {summary['total']:,} in view" if summary['total'] != all_calls['total'] else ""))
         
         # Summary statistics
         col1, col2, col3, col4 = st.columns(4)
         
-        categories_list = [call['classification']['primary_category'] for call in st.session_state.call_history]
-        
         with col1:
-            st.metric("Total Calls", len(st.session_state.call_history))
+            st.metric("Total Calls", f"{summary['total']:,}")
         
         with col2:
-            avg_confidence = sum([call['classification']['confidence_score'] for call in st.session_state.call_history]) / len(st.session_state.call_history)
-            st.metric("Avg Confidence", f"{avg_confidence:.1f}%")
+            st.metric("Avg Confidence", f"{summary['avg_confidence']:.1f}%")
         
         with col3:
-            st.metric("Unique Categories", len(set(categories_list)))
+            st.metric("Unique Categories", len(summary["categories"]))
         
         with col4:
-            sentiments = [call['analysis']['sentiment'] for call in st.session_state.call_history]
-            st.metric("Most Common Sentiment", max(set(sentiments), key=sentiments.count))
+            st.metric("Most Common Sentiment", next(iter(summary["sentiments"]), "-"))
         
         st.markdown("---")
         
         # Category distribution
         st.markdown("### 📊 Category Distribution")
-        category_counts = pd.Series(categories_list).value_counts()
+        category_counts = summary["categories"]
         
-        fig = px.pie(
-            values=category_counts.values,
-            names=category_counts.index,
-            title="Distribution of Call Categories"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        if category_counts:
+            fig = pie_chart(tuple(category_counts), tuple(category_counts.values()), "Distribution of Call Categories")
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Calls over time, stacked by category
+        st.markdown(f"### 📈 Calls per {granularity.title()}")
+        series = history.rollup_series(granularity, "category", since)
+        if series:
+            fig = timeline_chart(tuple((label, tuple(points)) for label, points in series.items()),
+                                 granularity, f"Calls per {granularity} by category")
+            st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("---")
         
-        # Call history table
+        # Call history table, one page at a time
         st.markdown("### 📋 Call History")
-        history_data = []
-        for i, call in enumerate(st.session_state.call_history, 1):
-            history_data.append({
-                'Call #': i,
-                'Category': call['classification']['primary_category'].upper(),
-                'Confidence': f"{call['classification']['confidence_score']}%",
-                'Sentiment': call['analysis']['sentiment'],
-                'Urgency': call['analysis']['urgency_level']
-            })
+        pages = max(1, -(-summary["total"] // HISTORY_PAGE_SIZE))
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, key="history_page")
+        rows = history.page(page, HISTORY_PAGE_SIZE, since=since, **filters)
+        
+        st.dataframe([{
+            'Call #': row['id'],
+            'Time': datetime.fromtimestamp(row['created_at']).strftime("%Y-%m-%d %H:%M:%S"),
+            'Category': row['category'].upper(),
+            'Confidence': f"{row['confidence']:g}%",
+            'Sentiment': row['sentiment'],
+            'Urgency': row['urgency'],
+            'Transcript': row['preview']
+        } for row in rows], use_container_width=True)
         
-        df = pd.DataFrame(history_data)
-        st.dataframe(df, use_container_width=True)
+        if rows:
+            with st.expander("🔎 View a call"):
+                call_id = st.selectbox("Call #", [row['id'] for row in rows], key="history_call")
+                call = history.get(call_id)
+                if call is not None:
+                    st.text_area("Transcript", call["transcript"], height=200, disabled=True,
+                                 key=f"history_transcript_{call_id}")
+                    st.json({key: call[key] for key in ("classification", "analysis", "customer_info") if key in call})
     else:
         st.info("📭 No calls classified yet. Start by classifying a call in the first tab!")
 
@@ -350,13 +694,22 @@ with tab3:
     st.markdown("## Batch Process Multiple Calls")
     
     st.markdown("""
-    Paste multiple call transcripts separated by "---" divider
+    Upload CSV or JSONL exports (a `transcript` or `text` column, optionally `id`/`call_id`),
+    text files with calls separated by a line containing only `---`, or a ZIP of any of these.
+    Jobs run in the background: you can switch tabs or rerun while they process.
     """)
     
-    batch_text = st.text_area(
-        "Paste Multiple Transcripts (separated by ---):",
-        height=400,
-        placeholder="""Call 1 transcript here...
+    uploads = st.file_uploader(
+        "Upload Transcript Files:",
+        type=["csv", "jsonl", "ndjson", "txt", "zip"],
+        accept_multiple_files=True
+    )
+    
+    with st.expander("✍️ Or paste transcripts (separated by a line containing only ---)"):
+        batch_text = st.text_area(
+            "Paste Multiple Transcripts:",
+            height=300,
+            placeholder="""Call 1 transcript here...
 
 ---
 
@@ -365,79 +718,21 @@ Call 2 transcript here...
 ---
 
 Call 3 transcript here..."""
-    )
+        )
     
     if st.button("⚡ Process Batch", use_container_width=True, type="primary"):
+        files = [(upload.name, upload.getvalue()) for upload in uploads or []]
         if batch_text.strip():
-            # Split by ---
-            calls = [call.strip() for call in batch_text.split("---") if call.strip()]
-            
-            if calls:
-                progress_bar = st.progress(0)
-                results_list = []
-                
-                for i, transcript in enumerate(calls):
-                    try:
-                        analysis = analyze_call_transcript(transcript)
-                        classification = classify_call_category(transcript, analysis)
-                        
-                        results_list.append({
-                            'Call #': i + 1,
-                            'Category': classification['primary_category'].upper(),
-                            'Confidence': f"{classification['confidence_score']}%",
-                            'Sentiment': analysis['sentiment'],
-                            'Urgency': analysis['urgency_level']
-                        })
-                        
-                        progress_bar.progress((i + 1) / len(calls))
-                    except Exception as e:
-                        st.error(f"Error processing call {i + 1}: {str(e)}")
-                
-                if results_list:
-                    st.success(f"✅ Successfully processed {len(results_list)} calls!")
-                    
-                    # Display results
-                    df = pd.DataFrame(results_list)
-                    st.dataframe(df, use_container_width=True)
-                    
-                    # Category summary
-                    st.markdown("---")
-                    st.markdown("### 📊 Summary")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        category_counts = pd.Series([r['Category'] for r in results_list]).value_counts()
-                        fig = px.bar(
-                            x=category_counts.index,
-                            y=category_counts.values,
-                            title="Category Distribution",
-                            labels={'x': 'Category', 'y': 'Count'}
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-                    
-                    with col2:
-                        sentiment_counts = pd.Series([r['Sentiment'] for r in results_list]).value_counts()
-                        fig = px.pie(
-                            values=sentiment_counts.values,
-                            names=sentiment_counts.index,
-                            title="Sentiment Distribution"
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Download batch results
-                    st.markdown("---")
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download Batch Results (CSV)",
-                        data=csv,
-                        file_name="batch_results.csv",
-                        mime="text/csv",
-                        use_container_width=True
-                    )
-            else:
-                st.warning("⚠️ No transcripts found. Make sure they're separated by ---")
+            files.append(("pasted.txt", batch_text.encode("utf-8")))
+        if files:
+            for name, data in files:
+                submit_batch_job(name, data)
         else:
-            st.warning("⚠️ Please enter at least one call transcript!")
+            st.warning("⚠️ Please upload a file or paste at least one call transcript!")
+    
+    if st.session_state.get("batch_jobs"):
+        st.session_state.batch_jobs_polling = any(not job.done for job in session_batch_jobs())
+        st.fragment(run_every=1.0 if st.session_state.batch_jobs_polling else None)(render_batch_jobs)()
 
 # ==================== TAB 4: SAMPLE CALLS ====================
 with tab4:
@@ -493,8 +788,7 @@ Agent: We offer up to 940 Mbps!"""
             
             if st.button(f"Classify this sample", key=f"sample_{i}"):
                 with st.spinner("Classifying..."):
-                    analysis = analyze_call_transcript(sample['transcript'])
-                    classification = classify_call_category(sample['transcript'], analysis)
+                    classification = classify_call(sample['transcript'])['classification']
                     
                     st.success("✅ Classified!")
                     st.metric("Category", classification['primary_category'].upper(), f"{classification['confidence_score']}% confident")
@@ -0,0 +1,302 @@
+"""Micro-benchmarks for the classification tools and batch entry points.
+
+Every public function in tools/classification_tools.py is timed on short,
+median and very long transcripts, together with the single-call and batch
+entry points. Each benchmark reports ops/sec, p50/p99 latency and peak
+Python heap usage; results are written as JSON and can be compared against
+a stored baseline to flag regressions.
+
+Usage:
+    python benchmarks/bench_classification.py --output bench.json
+    python benchmarks/bench_classification.py --compare bench.json --threshold 0.15
+    python benchmarks/bench_classification.py --batch-sizes 1000,100000,1000000 --workers 0
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.sample_transcripts import SAMPLE_TRANSCRIPTS
+from tools import classification_tools as tools
+from tools.parallel_batch import iter_classify_parallel, resolve_workers
+from tools.result_cache import ResultCache, classify_transcript_cached, get_default_cache
+from tools.ruleset import get_ruleset
+
+DEFAULT_BATCH_SIZES = [1000, 100000]
+DEFAULT_MIN_TIME = 0.5
+DEFAULT_THRESHOLD = 0.10
+
+# Public functions that take a transcript (or its features) as their only argument
+TRANSCRIPT_FUNCTIONS = [
+    "extract_features",
+    "scan_keywords",
+    "analyze_call_transcript",
+    "classify_call_category",
+    "extract_customer_info",
+    "classify_transcript",
+    "generate_classification_report",
+    "detect_sentiment",
+    "estimate_duration",
+    "extract_topics",
+    "assess_urgency",
+    "extract_services",
+    "extract_issues",
+    "extract_requests",
+    "extract_sentiment_indicators"
+]
+
+
+def build_transcripts() -> Dict[str, str]:
+    """Return the short, median and very long benchmark transcripts."""
+    samples = sorted((sample["transcript"].strip() for sample in SAMPLE_TRANSCRIPTS), key=len)
+    median = samples[len(samples) // 2]
+    long_parts = []
+    while sum(len(part) for part in long_parts) < 200_000:
+        long_parts.extend(samples)
+    return {
+        "short": samples[0].splitlines()[0],
+        "median": median,
+        "long": "\n".join(long_parts)
+    }
+
+
+def batch_corpus(size: int) -> List[str]:
+    """Return size distinct transcripts built from the samples."""
+    samples = [sample["transcript"] for sample in SAMPLE_TRANSCRIPTS]
+    return [f"{samples[i % len(samples)]}\nCall reference {i}" for i in range(size)]
+
+
+def _summarize(latencies: List[float], operations: int, elapsed: float, peak_bytes: int) -> Dict:
+    """Turn raw timings into the reported metrics."""
+    latencies = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e6
+
+    return {
+        "ops_per_sec": round(operations / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_us": round(percentile(0.50), 2),
+        "p99_us": round(percentile(0.99), 2),
+        "samples": len(latencies),
+        "peak_memory_kb": round(peak_bytes / 1024, 1)
+    }
+
+
+def _peak_memory(func: Callable[[], object]) -> int:
+    """Return the peak traced heap growth of one call, in bytes."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - baseline)
+
+
+def bench(func: Callable[[], object], min_time: float, operations_per_call: int = 1,
+          max_calls: Optional[int] = None) -> Dict:
+    """
+    Time repeated calls of func.
+
+    Args:
+        func: Zero-argument callable to measure
+        min_time: Keep calling for at least this many seconds
+        operations_per_call: Logical operations per call (calls per batch)
+        max_calls: Optional cap on the number of calls
+
+    Returns:
+        Metrics dictionary
+    """
+    func()  # warm-up
+    latencies = []
+    started = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or (max_calls and len(latencies) >= max_calls):
+            break
+    total = sum(latencies)
+    result = _summarize(latencies, len(latencies) * operations_per_call, total, _peak_memory(func))
+    if operations_per_call > 1:
+        result["batch_size"] = operations_per_call
+    return result
+
+
+def _run(results: Dict[str, Dict], name: str, func: Callable[[], object], min_time: float,
+         only: Optional[str] = None, **kwargs) -> None:
+    """Benchmark func under name unless it is filtered out by only."""
+    if only and only not in name:
+        return
+    results[name] = bench(func, min_time, **kwargs)
+
+
+def run_function_benchmarks(min_time: float, only: Optional[str] = None) -> Dict[str, Dict]:
+    """Benchmark every public tool on every transcript size."""
+    results = {}
+    for size, transcript in build_transcripts().items():
+        features = tools.extract_features(transcript)
+        computed = tools.classify_transcript(features)
+        for name in TRANSCRIPT_FUNCTIONS:
+            func = getattr(tools, name)
+            _run(results, f"{name}[{size}]", lambda: func(transcript), min_time, only)
+            if name not in ("extract_features", "scan_keywords"):
+                _run(results, f"{name}[{size},features]", lambda: func(features), min_time, only)
+        for output_format in ("text", "json", "csv"):
+            _run(results, f"render_report[{size},{output_format}]",
+                 lambda: tools.render_report(**computed, output_format=output_format), min_time, only)
+    return results
+
+
+def run_entry_point_benchmarks(min_time: float, only: Optional[str] = None) -> Dict[str, Dict]:
+    """Benchmark the single-call entry points."""
+    from classify_direct import classify_single_call_direct
+
+    results = {}
+    default_cache = get_default_cache()
+    for size, transcript in build_transcripts().items():
+        def direct(cold: bool):
+            if cold:
+                default_cache.clear()
+            with contextlib.redirect_stdout(io.StringIO()):
+                classify_single_call_direct(transcript)
+
+        cache = ResultCache()
+        # classify_single_call_direct goes through the process-wide cache: time misses and hits apart
+        _run(results, f"classify_single_call_direct[{size},cold]", lambda: direct(True), min_time, only)
+        _run(results, f"classify_single_call_direct[{size},warm]", lambda: direct(False), min_time, only)
+        _run(results, f"classify_transcript_cached[{size},hit]",
+             lambda: classify_transcript_cached(transcript, cache), min_time, only)
+    return results
+
+
+def run_batch_benchmarks(batch_sizes: Iterable[int], workers: Optional[int], min_time: float,
+                         only: Optional[str] = None) -> Dict[str, Dict]:
+    """Benchmark the batch entry points on each batch size."""
+    results = {}
+    try:
+        from tools.batch_scoring import classify_batch
+    except ImportError:
+        classify_batch = None
+        print("numpy is not installed; skipping classify_batch", file=sys.stderr)
+
+    for size in batch_sizes:
+        corpus = batch_corpus(size)
+        _run(results, f"classify_transcript[batch={size}]",
+             lambda: [tools.classify_transcript(t) for t in corpus], min_time, only,
+             operations_per_call=size, max_calls=3)
+        if classify_batch is not None:
+            per_call = f"classify_call_category[batch={size}]"
+            vectorized = f"classify_batch[batch={size},workers={resolve_workers(workers)}]"
+            _run(results, per_call, lambda: [tools.classify_call_category(t) for t in corpus], min_time, only,
+                 operations_per_call=size, max_calls=3)
+            _run(results, vectorized, lambda: classify_batch(corpus, workers=workers), min_time, only,
+                 operations_per_call=size, max_calls=3)
+            if per_call in results and vectorized in results:
+                results[vectorized]["speedup"] = round(
+                    results[vectorized]["ops_per_sec"] / max(results[per_call]["ops_per_sec"], 1e-9), 2)
+        _run(results, f"iter_classify_parallel[batch={size},workers={resolve_workers(workers)}]",
+             lambda: sum(1 for _ in iter_classify_parallel(corpus, workers)), min_time, only,
+             operations_per_call=size, max_calls=3)
+    return results
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compare results against a baseline.
+
+    Returns:
+        Descriptions of every benchmark whose throughput dropped or whose p99
+        latency grew by more than threshold (a fraction, e.g. 0.1 for 10%)
+    """
+    regressions = []
+    for name, metrics in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        if before["ops_per_sec"] and metrics["ops_per_sec"] < before["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{name}: ops/sec {before['ops_per_sec']} -> {metrics['ops_per_sec']}")
+        if before["p99_us"] and metrics["p99_us"] > before["p99_us"] * (1 + threshold):
+            regressions.append(f"{name}: p99 {before['p99_us']}us -> {metrics['p99_us']}us")
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the call classification tools.")
+    parser.add_argument("-o", "--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown before flagging a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help=f"Seconds to spend per benchmark (default: {DEFAULT_MIN_TIME})")
+    parser.add_argument("--batch-sizes", default=",".join(str(size) for size in DEFAULT_BATCH_SIZES),
+                        help="Comma-separated batch sizes, e.g. 1000,100000,1000000 (empty to skip)")
+    parser.add_argument("--workers", type=int, default=0, help="Workers for the parallel batch mode (0: all cores)")
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this text")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run the benchmarks; returns 1 when a regression is flagged."""
+    args = parse_args(argv)
+    # The cold benchmarks clear the process-wide cache; keep it in memory so no cache file is touched
+    os.environ.pop("CLASSIFICATION_CACHE_PATH", None)
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",") if size.strip()]
+
+    results = {}
+    results.update(run_function_benchmarks(args.min_time, args.only))
+    results.update(run_entry_point_benchmarks(args.min_time, args.only))
+    results.update(run_batch_benchmarks(batch_sizes, args.workers, args.min_time, args.only))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "ruleset_version": get_ruleset().version
+        },
+        "results": results
+    }
+
+    print(f"{'benchmark':<60} {'ops/sec':>12} {'p50 us':>10} {'p99 us':>10} {'peak KB':>10}")
+    for name, metrics in results.items():
+        print(f"{name:<60} {metrics['ops_per_sec']:>12} {metrics['p50_us']:>10} "
+              f"{metrics['p99_us']:>10} {metrics['peak_memory_kb']:>10}")
+    for name, metrics in results.items():
+        if "speedup" in metrics:
+            print(f"{name}: {metrics['speedup']}x the throughput of per-call classify_call_category")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Load test of the crew path against the offline chat-completions server.
+
+Starts benchmarks/fake_openai_server.py in-process, points the crews at it
+and runs main.py's batch entry points for each mode and concurrency level.
+Reports throughput, per-call latency, the share of latency spent outside
+the (simulated) LLM, and the 429/500 responses seen. No network access or
+API key is needed.
+
+The overhead is approximate: mean call latency minus the LLM time on the
+critical path of a call, i.e. with parallel stages only the slower of
+analysis and classification counts. The path is built from per-stage mean
+latencies, which slightly understates the mean of per-call maxima, so the
+overhead errs high rather than going negative.
+
+Usage:
+    python benchmarks/bench_crew.py --calls 40 --modes quick,full --concurrency 1,8 --latency-ms 300
+    python benchmarks/bench_crew.py --calls 100 --concurrency 16 --rpm 600 --error-rate 0.05 --output crew.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_openai_server import FakeOpenAIServer, ServerConfig
+from data.synthetic_transcripts import SyntheticConfig, generate_transcripts
+
+
+def _configure_environment(base_url: str) -> None:
+    """Point crewai at the local server and keep it off the network."""
+    os.environ["OPENAI_API_KEY"] = "fake-key"
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["CREWAI_DISABLE_TELEMETRY"] = "true"
+    os.environ["OTEL_SDK_DISABLED"] = "true"
+
+
+# Stages that run side by side in a staged crew; the remaining tasks run after them
+PARALLEL_TASKS = ("analysis", "classification")
+
+
+def llm_critical_path_seconds(latency_by_task: Dict[str, float], staged: bool) -> float:
+    """
+    Return the LLM time on the critical path of the run.
+
+    Args:
+        latency_by_task: Summed simulated LLM seconds per task kind
+        staged: Whether analysis and classification ran in parallel
+    """
+    if not staged:
+        return sum(latency_by_task.values())
+    parallel = max((latency_by_task.get(task, 0.0) for task in PARALLEL_TASKS), default=0.0)
+    return parallel + sum(seconds for task, seconds in latency_by_task.items() if task not in PARALLEL_TASKS)
+
+
+def run_scenario(transcripts: List[str], quick_mode: bool, concurrency: int,
+                 server: FakeOpenAIServer, verbose: bool = False) -> Dict:
+    """
+    Classify the transcripts through the crews once.
+
+    Returns:
+        Metrics of the run
+    """
+    import main
+    from src.crew import parallel_stages_enabled
+
+    stats = main.CascadeStats()
+    before = server.stats()
+    started = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if not verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        if concurrency > 1:
+            results = main.concurrent_batch_classify_calls(transcripts, quick_mode, concurrency, stats=stats)
+        else:
+            results = main.batch_classify_calls(transcripts, quick_mode, stats=stats)
+    elapsed = time.perf_counter() - started
+    after = server.stats()
+
+    tier = "quick_crew" if quick_mode else "full_crew"
+    latency = stats.summary().get(tier, {})
+    calls = len(results)
+    llm_seconds = after["latency_seconds"] - before["latency_seconds"]
+    llm_ms_per_call = llm_seconds / calls * 1000 if calls else 0.0
+    latency_by_task = {task: seconds - before["latency_by_task"].get(task, 0.0)
+                       for task, seconds in after["latency_by_task"].items()}
+    critical_seconds = llm_critical_path_seconds(latency_by_task, parallel_stages_enabled())
+    critical_ms_per_call = critical_seconds / calls * 1000 if calls else 0.0
+    return {
+        "mode": "quick" if quick_mode else "full",
+        "concurrency": concurrency,
+        "calls": calls,
+        "failed_calls": sum(1 for r in results if r["result"].get("status") != "success"),
+        "wall_seconds": round(elapsed, 3),
+        "calls_per_second": round(calls / elapsed, 3) if elapsed else 0.0,
+        "mean_ms": latency.get("mean_ms"),
+        "p50_ms": latency.get("p50_ms"),
+        "p95_ms": latency.get("p95_ms"),
+        "llm_ms_per_call": round(llm_ms_per_call, 3),
+        "llm_critical_ms_per_call": round(critical_ms_per_call, 3),
+        # Approximate; see the module docstring
+        "overhead_ms_per_call": round(latency.get("mean_ms", 0.0) - critical_ms_per_call, 3),
+        "llm_requests": after["requests"] - before["requests"],
+        "rate_limited": after["rate_limited"] - before["rate_limited"],
+        "server_errors": after["errors"] - before["errors"]
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Load-test the crews against an offline LLM stand-in.")
+    parser.add_argument("--calls", type=int, default=20, help="Transcripts per scenario (default: 20)")
+    parser.add_argument("--modes", default="quick,full", help="Comma-separated crews: quick, full")
+    parser.add_argument("--concurrency", default="1,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Median simulated LLM latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=float, default=None, help="Simulated requests-per-minute quota")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Write results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show crew output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run every mode/concurrency scenario and print a table."""
+    args = parse_args(argv)
+    config = ServerConfig(args.latency_ms, args.latency_sigma, args.error_rate, args.rpm, args.seed)
+    transcripts = [record["transcript"]
+                   for record in generate_transcripts(args.calls, SyntheticConfig(seed=args.seed))]
+
+    from src.crew import install_crew_locks
+
+    install_crew_locks()
+    results = []
+    with FakeOpenAIServer(config) as server:
+        _configure_environment(server.url)
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            for concurrency in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+                results.append(run_scenario(transcripts, mode == "quick", concurrency, server, args.verbose))
+
+    columns = ["mode", "concurrency", "calls", "failed_calls", "calls_per_second", "p50_ms", "p95_ms",
+               "llm_ms_per_call", "llm_critical_ms_per_call", "overhead_ms_per_call", "llm_requests",
+               "rate_limited", "server_errors"]
+    print(" ".join(f"{column:>20}" for column in columns))
+    for result in results:
+        print(" ".join(f"{str(result[column]):>20}" for column in columns))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"server": vars(config), "results": results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
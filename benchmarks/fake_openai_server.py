@@ -0,0 +1,346 @@
+"""Offline OpenAI-compatible chat-completions server for crew load testing.
+
+Answers are templated from the keyword classifier, so they are
+deterministic and plausible for every crew task (analysis, classification,
+QA review, action plan and batched classification). Latency, error rate and
+a requests-per-minute limit are configurable; limited requests get HTTP 429
+with a Retry-After header, like the real API.
+
+Usage:
+    python benchmarks/fake_openai_server.py --port 8765 --latency-ms 800 --error-rate 0.02 --rpm 300
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python main.py
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.rate_limit import TokenBucket, estimate_tokens
+from tools.classification_tools import classify_transcript
+
+FINAL_ANSWER = "Thought: I now can give a great answer\nFinal Answer: {answer}"
+
+_BATCH_CALL_PATTERN = re.compile(r"### Call (\d+)\n(.*?)(?=\n\s*### Call \d+\n|\n\s*Answer with a JSON array|\Z)",
+                                 re.DOTALL)
+# (task kind, text just before the transcript, text just after it) per crew task prompt
+_TASK_MARKERS = [
+    ("analysis", "Analyze the following customer call transcript:", "Extract and report on:"),
+    ("classification", "Call transcript:", "Provide:"),
+    ("qa", "- Transcript:", "- Analysis:"),
+    ("action_plan", "Call context:", None)
+]
+
+
+@dataclass
+class ServerConfig:
+    """
+    Behavior of the stand-in server.
+
+    Attributes:
+        latency_ms: Median response latency in milliseconds
+        latency_sigma: Sigma of the log-normal latency distribution (0: constant)
+        error_rate: Fraction of requests answered with HTTP 500
+        requests_per_minute: Request quota; over-quota requests get HTTP 429 (None: unlimited)
+        seed: Seed of the latency and error draws
+    """
+
+    latency_ms: float = 0.0
+    latency_sigma: float = 0.0
+    error_rate: float = 0.0
+    requests_per_minute: Optional[float] = None
+    seed: int = 0
+
+
+def _between(text: str, start: Optional[str], end: Optional[str]) -> Optional[str]:
+    """Return the text between two markers, or None if start is missing."""
+    begin = text.find(start)
+    if begin < 0:
+        return None
+    begin += len(start)
+    finish = text.find(end, begin) if end else -1
+    return text[begin:finish if finish >= 0 else len(text)].strip()
+
+
+def _message_text(messages: List[Dict]) -> str:
+    """Concatenate the text of the user messages of a request."""
+    parts = []
+    for message in messages:
+        if message.get("role") != "user":
+            continue
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        parts.append(content or "")
+    return "\n".join(parts)
+
+
+def template_answer(messages: List[Dict]) -> Tuple[str, str]:
+    """
+    Build a deterministic answer for a crew request.
+
+    Returns:
+        (task kind, answer content)
+    """
+    text = _message_text(messages)
+
+    if "JSON array holding one object per call" in text:
+        answer = []
+        for number, transcript in _BATCH_CALL_PATTERN.findall(text):
+            classification = classify_transcript(transcript)["classification"]
+            answer.append({
+                "id": int(number),
+                "category": classification["primary_category"],
+                "confidence": classification["confidence_score"],
+                "reasoning": "Keyword evidence in the transcript.",
+                "department": classification["recommendation"]
+            })
+        return "batch", FINAL_ANSWER.format(answer=json.dumps(answer))
+
+    for kind, start, end in _TASK_MARKERS:
+        transcript = _between(text, start, end)
+        if transcript is None:
+            continue
+        result = classify_transcript(transcript)
+        analysis, classification = result["analysis"], result["classification"]
+        if kind == "analysis":
+            answer = (f"Sentiment: {analysis['sentiment']}. Key topics: {', '.join(analysis['key_topics']) or 'none'}. "
+                      f"Urgency: {analysis['urgency_level']}. Services: "
+                      f"{', '.join(result['customer_info']['mentioned_services']) or 'none'}.")
+        elif kind == "classification":
+            answer = (f"Primary category: {classification['primary_category']} "
+                      f"({classification['category_description']}). Confidence: {classification['confidence_score']}%. "
+                      f"Routing: {classification['recommendation']}.")
+        elif kind == "qa":
+            answer = (f"Classification as {classification['primary_category']} is consistent with the transcript. "
+                      f"Compliance: OK. Risk level: {analysis['urgency_level']}.")
+        else:
+            answer = ("Immediate actions: contact the customer within 24 hours. "
+                      "Follow-up: confirm resolution after 3 days. Escalation: none required.")
+        return kind, FINAL_ANSWER.format(answer=answer)
+
+    return "other", FINAL_ANSWER.format(answer="Acknowledged.")
+
+
+class FakeOpenAIServer:
+    """Threaded HTTP server speaking the chat-completions protocol."""
+
+    def __init__(self, config: Optional[ServerConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Create a server; port 0 picks a free port.
+
+        Args:
+            config: Latency, error and rate-limit behavior
+            host: Interface to listen on
+            port: Port to listen on
+        """
+        self.config = config or ServerConfig()
+        self._rng = random.Random(self.config.seed)
+        self._bucket = TokenBucket(self.config.requests_per_minute) if self.config.requests_per_minute else None
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "completions": 0, "rate_limited": 0, "errors": 0,
+                          "latency_seconds": 0.0, "by_task": {}, "latency_by_task": {}}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as OPENAI_BASE_URL."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def stats(self) -> Dict:
+        """Return request counters and the injected latency, in total and per answered task kind."""
+        with self._lock:
+            return json.loads(json.dumps(self._counters))
+
+    def _draw(self) -> Tuple[float, bool]:
+        """Draw the latency and whether to fail the next request."""
+        config = self.config
+        with self._lock:
+            latency = config.latency_ms / 1000.0
+            if latency and config.latency_sigma:
+                latency = self._rng.lognormvariate(math.log(latency), config.latency_sigma)
+            fail = bool(config.error_rate) and self._rng.random() < config.error_rate
+        return latency, fail
+
+    def _count(self, key: str, amount=1) -> None:
+        with self._lock:
+            self._counters[key] += amount
+
+    def handle_completion(self, body: Dict) -> Tuple[int, Dict, Dict[str, str]]:
+        """
+        Produce the status, JSON body and extra headers for one request.
+
+        Exposed separately from the HTTP layer so it can be exercised directly.
+        """
+        self._count("requests")
+        if self._bucket is not None:
+            wait = self._bucket.try_acquire()
+            if wait > 0:
+                self._count("rate_limited")
+                return 429, {"error": {"message": "Rate limit reached for requests", "type": "requests",
+                                       "code": "rate_limit_exceeded"}}, {"Retry-After": f"{wait:.3f}"}
+
+        latency, fail = self._draw()
+        if latency:
+            time.sleep(latency)
+        self._count("latency_seconds", latency)
+        if fail:
+            self._count("errors")
+            return 500, {"error": {"message": "The server had an error processing your request.",
+                                   "type": "server_error"}}, {}
+
+        messages = body.get("messages") or []
+        kind, content = template_answer(messages)
+        with self._lock:
+            self._counters["completions"] += 1
+            self._counters["by_task"][kind] = self._counters["by_task"].get(kind, 0) + 1
+            self._counters["latency_by_task"][kind] = self._counters["latency_by_task"].get(kind, 0.0) + latency
+        prompt_tokens = estimate_tokens(json.dumps(messages))
+        completion_tokens = estimate_tokens(content)
+        return 200, {
+            "id": f"chatcmpl-fake-{self._counters['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }, {}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, payload: Dict) -> None:
+                # One content chunk, then the usage chunk and the terminator
+                chunk = {key: payload[key] for key in ("id", "created", "model")}
+                chunk["object"] = "chat.completion.chunk"
+                message = payload["choices"][0]["message"]
+                events = [
+                    dict(chunk, choices=[{"index": 0, "delta": {"role": "assistant", "content": message["content"]},
+                                          "finish_reason": None}]),
+                    dict(chunk, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]),
+                    dict(chunk, choices=[], usage=payload["usage"])
+                ]
+                data = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+                encoded = data.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(200, {"object": "list", "data": [{"id": "fake-model", "object": "model"}]})
+                elif self.path.rstrip("/").endswith("/stats"):
+                    self._send_json(200, server.stats())
+                else:
+                    self._send_json(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": {"message": "invalid JSON body"}})
+                    return
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                status, payload, headers = server.handle_completion(body)
+                if status == 200 and body.get("stream"):
+                    self._send_stream(payload)
+                else:
+                    self._send_json(status, payload, headers)
+
+        return Handler
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    defaults = ServerConfig()
+    parser = argparse.ArgumentParser(description="Run an offline OpenAI-compatible chat-completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Median latency")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma,
+                        help="Log-normal sigma of the latency (0: constant)")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Fraction of HTTP 500s")
+    parser.add_argument("--rpm", type=float, default=None, help="Requests per minute before HTTP 429")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Serve until interrupted."""
+    args = parse_args(argv)
+    config = ServerConfig(args.latency_ms, args.latency_sigma, args.error_rate, args.rpm, args.seed)
+    server = FakeOpenAIServer(config, args.host, args.port)
+    print(f"Serving chat completions at {server.url} (Ctrl+C to stop)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Async HTTP service for keyword classification.
+
+Exposes the keyword engine of tools/classification_tools.py to the
+Streamlit app, batch jobs and other systems such as IVR routing, so
+classification capacity scales separately from the UIs that use it.
+Connections are kept alive between requests; calls are classified on a
+process pool (or a thread with --workers 1) so the event loop stays free,
+and results are shared through the result cache.
+
+Endpoints:
+    GET  /health              Ruleset version and fingerprint, worker count and cache stats
+    POST /v1/classify         {"transcript": str, "reports": ["text", "json", "csv"]?}
+    POST /v1/classify/batch   {"transcripts": [str, ...]} or {"calls": [{"id", "transcript"}, ...]}
+    POST /v1/report           {"transcript": str, "format": "text" | "json" | "csv"}
+
+Usage:
+    python classification_service.py --port 8000 --workers 0
+    CLASSIFICATION_SERVICE_URL=http://127.0.0.1:8000 streamlit run app.py
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from aiohttp import web
+from dotenv import load_dotenv
+
+from tools.classification_tools import render_report
+from tools.parallel_batch import DEFAULT_CHUNK_SIZE, _classify_chunk, resolve_workers
+from tools.result_cache import ResultCache, cache_key, get_default_cache
+from tools.ruleset import Ruleset, get_ruleset
+
+REPORT_FORMATS = ("text", "json", "csv")
+REPORT_CONTENT_TYPES = {"text": "text/plain", "json": "application/json", "csv": "text/csv"}
+
+# Largest batch accepted per request, and largest request body
+MAX_BATCH_SIZE = 10000
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# Seconds an idle client connection is kept open
+KEEPALIVE_SECONDS = 75
+
+
+def _bad_request(message: str) -> web.HTTPBadRequest:
+    """A 400 error with a JSON {"error": message} body."""
+    return web.HTTPBadRequest(text=json.dumps({"error": message}), content_type="application/json")
+
+
+async def _json_body(request: web.Request) -> Dict:
+    """Parse a JSON object body or fail the request with 400."""
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise _bad_request("request body must be JSON")
+    if not isinstance(body, dict):
+        raise _bad_request("request body must be a JSON object")
+    return body
+
+
+def _transcript(body: Dict) -> str:
+    """Return the non-empty transcript field of a request body or fail with 400."""
+    transcript = body.get("transcript")
+    if not isinstance(transcript, str) or not transcript.strip():
+        raise _bad_request('"transcript" must be a non-empty string')
+    return transcript
+
+
+class ClassificationService:
+    """aiohttp application classifying calls off the event loop, with a shared result cache."""
+
+    def __init__(self, workers: Optional[int] = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 cache: Optional[ResultCache] = None):
+        """
+        Create a service.
+
+        Args:
+            workers: Worker processes; 1 classifies on a thread of this process, 0 or None uses every core
+            chunk_size: Transcripts of a batch handed to a worker at a time
+            cache: Result cache; defaults to the process-wide cache
+        """
+        self.workers = resolve_workers(workers)
+        self.chunk_size = max(1, chunk_size)
+        self.cache = cache if cache is not None else get_default_cache()
+        self._executor: Optional[Executor] = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+        self._address = None
+
+    async def classify_many(self, transcripts: List) -> List[Dict]:
+        """
+        Classify transcripts, answering repeats from the cache.
+
+        Returns:
+            One {"status": "success", ...results} or {"status": "error", "error": message}
+            per transcript, in input order
+        """
+        results: List[Optional[Dict]] = [None] * len(transcripts)
+        valid = []
+        for i, transcript in enumerate(transcripts):
+            if isinstance(transcript, str):
+                valid.append(i)
+            else:
+                results[i] = {"status": "error", "error": f"transcript must be a string, not {type(transcript).__name__}"}
+
+        # Results are cached under the rules active now; ones computed by a worker on other rules are not stored
+        ruleset = get_ruleset()
+        loop = asyncio.get_running_loop()
+        chunks = [valid[start:start + self.chunk_size] for start in range(0, len(valid), self.chunk_size)]
+        chunk_results = await asyncio.gather(*(
+            loop.run_in_executor(None, self._classify_cached, [transcripts[i] for i in chunk], ruleset)
+            for chunk in chunks
+        ))
+        for chunk, computed in zip(chunks, chunk_results):
+            for i, result in zip(chunk, computed):
+                results[i] = result
+        return results
+
+    def _classify_cached(self, chunk: List[str], ruleset: Ruleset) -> List[Dict]:
+        """
+        Executor task: answer a chunk from the cache, classify the misses and store their results.
+
+        Runs on a thread, so cache lookups (possibly on disk) never block the
+        event loop; the misses go to the worker processes when there are any.
+        """
+        keys = [cache_key(transcript, ruleset.fingerprint) for transcript in chunk]
+        results: List[Optional[Dict]] = []
+        misses = []
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            results.append({"status": "success", **cached} if cached is not None else None)
+            if cached is None:
+                misses.append(i)
+        if not misses:
+            return results
+
+        texts = [chunk[i] for i in misses]
+        try:
+            if self._executor is not None:
+                computed = self._executor.submit(_classify_chunk, texts).result()
+            else:
+                computed = _classify_chunk(texts)
+        except Exception as e:
+            computed = [{"status": "error", "error": f"worker failed: {e}"}] * len(texts)
+        for i, result in zip(misses, computed):
+            results[i] = result
+            if result["status"] == "success" and result["classification"]["ruleset_version"] == ruleset.version:
+                self.cache.put(keys[i], {key: value for key, value in result.items() if key != "status"})
+        return results
+
+    async def health(self, request: web.Request) -> web.Response:
+        """GET /health"""
+        ruleset = get_ruleset()
+        # Counting the disk tier is a query; keep it off the event loop
+        cache_stats = await asyncio.get_running_loop().run_in_executor(None, self.cache.stats)
+        return web.json_response({
+            "status": "ok",
+            "ruleset_version": ruleset.version,
+            "ruleset_fingerprint": ruleset.fingerprint,
+            "workers": self.workers,
+            "cache": cache_stats
+        })
+
+    async def classify(self, request: web.Request) -> web.Response:
+        """POST /v1/classify: one call, optionally with rendered reports."""
+        body = await _json_body(request)
+        transcript = _transcript(body)
+        reports = body.get("reports") or []
+        if not isinstance(reports, list) or any(fmt not in REPORT_FORMATS for fmt in reports):
+            raise _bad_request(f'"reports" must be a list of {", ".join(REPORT_FORMATS)}')
+
+        result = (await self.classify_many([transcript]))[0]
+        if result["status"] != "success":
+            return web.json_response(result, status=500)
+        if reports:
+            results = {key: result[key] for key in ("classification", "analysis", "customer_info")}
+            result["reports"] = {fmt: render_report(**results, output_format=fmt) for fmt in reports}
+        return web.json_response(result)
+
+    async def classify_batch(self, request: web.Request) -> web.Response:
+        """POST /v1/classify/batch: many calls, each succeeding or failing on its own."""
+        body = await _json_body(request)
+        if "calls" in body:
+            calls = body["calls"]
+            if not isinstance(calls, list) or not all(isinstance(call, dict) for call in calls):
+                raise _bad_request('"calls" must be a list of {"id", "transcript"} objects')
+            transcripts = [call.get("transcript") for call in calls]
+        else:
+            calls = None
+            transcripts = body.get("transcripts")
+            if not isinstance(transcripts, list):
+                raise _bad_request('body must have a "transcripts" or "calls" list')
+        if len(transcripts) > MAX_BATCH_SIZE:
+            return web.json_response({"error": f"at most {MAX_BATCH_SIZE} calls per batch"}, status=413)
+
+        results = await self.classify_many(transcripts)
+        if calls is not None:
+            results = [{"id": call.get("id", i), **result} for i, (call, result) in enumerate(zip(calls, results))]
+        return web.json_response({"results": results})
+
+    async def report(self, request: web.Request) -> web.Response:
+        """POST /v1/report: the rendered classification report of one call."""
+        body = await _json_body(request)
+        transcript = _transcript(body)
+        output_format = body.get("format", "text")
+        if output_format not in REPORT_FORMATS:
+            raise _bad_request(f'"format" must be one of {", ".join(REPORT_FORMATS)}')
+
+        result = (await self.classify_many([transcript]))[0]
+        if result["status"] != "success":
+            return web.json_response(result, status=500)
+        results = {key: result[key] for key in ("classification", "analysis", "customer_info")}
+        return web.Response(text=render_report(**results, output_format=output_format),
+                            content_type=REPORT_CONTENT_TYPES[output_format])
+
+    def create_app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application(client_max_size=MAX_BODY_BYTES)
+        app.router.add_get("/health", self.health)
+        app.router.add_post("/v1/classify", self.classify)
+        app.router.add_post("/v1/classify/batch", self.classify_batch)
+        app.router.add_post("/v1/report", self.report)
+        return app
+
+    @property
+    def url(self) -> str:
+        """Base URL of a service started with start()."""
+        host, port = self._address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> "ClassificationService":
+        """Serve on an event loop in a background thread; port 0 picks a free port."""
+        self._loop = asyncio.new_event_loop()
+
+        async def serve() -> None:
+            self._runner = web.AppRunner(self.create_app(), keepalive_timeout=KEEPALIVE_SECONDS)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, host, port)
+            await site.start()
+            self._address = self._runner.addresses[0]
+
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(serve())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="classification-service", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        """Stop a service started with start() and its worker processes."""
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "ClassificationService":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def serve_forever(self, host: str, port: int) -> None:
+        """Serve in the calling thread until interrupted."""
+        try:
+            web.run_app(self.create_app(), host=host, port=port, keepalive_timeout=KEEPALIVE_SECONDS,
+                        print=lambda message: None)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Serve keyword call classification over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Worker processes; 0 uses every core (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Batch transcripts per worker task (default: {DEFAULT_CHUNK_SIZE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Serve until interrupted."""
+    load_dotenv()
+    args = parse_args(argv)
+    service = ClassificationService(args.workers, args.chunk_size)
+    get_ruleset()
+    print(f"Serving call classification at http://{args.host}:{args.port} "
+          f"with {service.workers} workers (Ctrl+C to stop)")
+    service.serve_forever(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
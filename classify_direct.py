@@ -1,13 +1,14 @@
 """Direct classification application without requiring Crew AI/API."""
 
+import argparse
 import os
+import sys
+from collections import deque
 from dotenv import load_dotenv
-from tools.classification_tools import (
-    classify_call_category,
-    analyze_call_transcript,
-    extract_customer_info,
-    generate_classification_report
-)
+from tools.classification_tools import render_report
+from tools.parallel_batch import DEFAULT_CHUNK_SIZE, ThroughputMeter, iter_classify_parallel, resolve_workers
+from tools.result_cache import classify_transcript_cached, get_default_cache
+from tools.transcript_io import INPUT_FORMATS, OUTPUT_FORMATS, ResultWriter, detect_format, iter_transcripts
 
 # Load environment variables
 load_dotenv()
@@ -31,17 +32,15 @@ def classify_single_call_direct(transcript: str) -> dict:
     print("-" * 70)
     
     try:
-        # Analyze the transcript
-        analysis = analyze_call_transcript(transcript)
+        # Analyze, classify and extract customer information in one pass,
+        # reusing the cached result for transcripts seen before
+        results = classify_transcript_cached(transcript)
+        analysis = results["analysis"]
+        customer_info = results["customer_info"]
+        classification = results["classification"]
         
-        # Extract customer information
-        customer_info = extract_customer_info(transcript)
-        
-        # Classify the call
-        classification = classify_call_category(transcript, analysis)
-        
-        # Generate detailed report
-        report = generate_classification_report(transcript)
+        # Render the detailed report from the results above
+        report = render_report(classification, analysis, customer_info)
         
         print(report)
         
@@ -60,16 +59,24 @@ def classify_single_call_direct(transcript: str) -> dict:
         }
 
 
-def batch_classify_calls_direct(transcripts: list) -> list:
+def batch_classify_calls_direct(transcripts: list, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list:
     """
     Classify multiple customer calls in batch using direct classification.
     
+    With workers=1 every call is processed in this process and its full
+    report is printed. Any other value switches to the parallel mode.
+    
     Args:
         transcripts: List of transcript strings
+        workers: Worker processes; 1 runs sequentially, 0 or None uses every core
+        chunk_size: Transcripts handed to a worker at a time in parallel mode
         
     Returns:
         List of classification results
     """
+    if workers != 1:
+        return parallel_batch_classify_calls_direct(transcripts, workers, chunk_size)
+    
     results = []
     
     for i, transcript in enumerate(transcripts, 1):
@@ -86,8 +93,135 @@ def batch_classify_calls_direct(transcripts: list) -> list:
     return results
 
 
-def main():
+def parallel_batch_classify_calls_direct(transcripts: list, workers: int = None,
+                                         chunk_size: int = DEFAULT_CHUNK_SIZE, include_reports: bool = True) -> list:
+    """
+    Classify calls on a process pool without printing per-call reports.
+    
+    Results keep input order and errors are isolated per call, so one bad
+    transcript never takes down the rest of its chunk. A throughput summary
+    is printed at the end.
+    
+    Args:
+        transcripts: List of transcript strings
+        workers: Worker processes; None or 0 uses every core
+        chunk_size: Transcripts handed to a worker at a time
+        include_reports: Render each successful call's "report" as the
+            sequential mode does; False skips the rendering
+        
+    Returns:
+        List of classification results
+    """
+    meter = ThroughputMeter()
+    results = []
+    
+    for i, result in enumerate(iter_classify_parallel(transcripts, workers, chunk_size), 1):
+        meter.record(result)
+        if include_reports and result["status"] == "success":
+            result["report"] = render_report(result["classification"], result["analysis"], result["customer_info"])
+        results.append({
+            "call_number": i,
+            "result": result
+        })
+    
+    print_throughput_summary(meter.summary(), resolve_workers(workers))
+    return results
+
+
+def print_throughput_summary(summary: dict, workers: int) -> None:
+    """Print the throughput summary of a batch run."""
+    print("\n" + "="*70)
+    print("THROUGHPUT SUMMARY")
+    print("="*70)
+    print(f"Workers: {workers}")
+    print(f"Calls processed: {summary['calls']} ({summary['errors']} errors)")
+    print(f"Elapsed: {summary['elapsed_seconds']}s")
+    print(f"Throughput: {summary['calls_per_second']} calls/sec")
+
+
+def classify_stream(source: str, output, input_format: str = None, output_format: str = "jsonl",
+                    workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Classify transcripts from a file, directory or stdin, writing each result as it finishes.
+    
+    Input is read lazily and only a bounded window of calls is in flight,
+    so memory use does not grow with the size of the input.
+    
+    Args:
+        source: File path, directory path or "-" for stdin
+        output: Open text stream for the results
+        input_format: "jsonl", "csv" or "text"; None detects it from file extensions
+        output_format: "jsonl" or "csv"
+        workers: Worker processes; 1 runs in this process, 0 or None uses every core
+        chunk_size: Transcripts handed to a worker at a time
+        
+    Returns:
+        Throughput summary of the run
+    """
+    writer = ResultWriter(output, output_format)
+    meter = ThroughputMeter()
+    call_ids = deque()
+    
+    def transcripts():
+        for record in iter_transcripts(source, input_format):
+            call_ids.append(record["id"])
+            yield record["transcript"]
+    
+    for result in iter_classify_parallel(transcripts(), workers, chunk_size):
+        meter.record(result)
+        writer.write(call_ids.popleft(), result)
+    
+    return meter.summary()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Classify customer call transcripts with the keyword engine (no API required). "
+                    "Without --input, a built-in set of sample calls is classified."
+    )
+    parser.add_argument("-i", "--input", help='Transcript file, directory, or "-" for stdin')
+    parser.add_argument("--input-format", choices=INPUT_FORMATS,
+                        help="Input format (default: from file extension; text for stdin)")
+    parser.add_argument("-o", "--output", default="-", help='Results file, or "-" for stdout (default)')
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS,
+                        help="Output format (default: from file extension, else jsonl)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Worker processes; 0 uses every core (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Transcripts per worker task (default: {DEFAULT_CHUNK_SIZE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main entry point for the application."""
+    args = parse_args(argv)
+    
+    if args.input:
+        output_format = args.output_format or (
+            detect_format(args.output, "jsonl") if args.output != "-" else "jsonl"
+        )
+        if output_format not in OUTPUT_FORMATS:
+            output_format = "jsonl"
+        
+        if args.output == "-":
+            summary = classify_stream(args.input, sys.stdout, args.input_format, output_format,
+                                      args.workers, args.chunk_size)
+        else:
+            with open(args.output, "w", encoding="utf-8", newline="") as output:
+                summary = classify_stream(args.input, output, args.input_format, output_format,
+                                          args.workers, args.chunk_size)
+        
+        print(f"Classified {summary['calls']} calls ({summary['errors']} errors) in "
+              f"{summary['elapsed_seconds']}s - {summary['calls_per_second']} calls/sec",
+              file=sys.stderr)
+        return
+    
+    run_samples()
+
+
+def run_samples():
+    """Classify the built-in sample calls and print a summary."""
     
     # Sample customer call transcripts for Verizon
     sample_calls = [
@@ -166,6 +300,9 @@ def main():
         else:
             print(f"Call {call_num}: ERROR - {result_data.get('error')} ❌")
     
+    stats = get_default_cache().stats()
+    print(f"\nResult cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']}% hit rate)")
+    
     print("\n" + "="*70)
     print("✅ Classification complete!")
     print("="*70)
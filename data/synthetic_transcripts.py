@@ -0,0 +1,317 @@
+"""Deterministic synthetic call transcripts for load and accuracy testing.
+
+Transcripts are composed from the hand-written samples and the keyword
+tables of the active ruleset. Every transcript is derived from the seed and
+its own index only, so the first N calls of a large corpus are identical to
+a corpus of N calls, and any call can be regenerated on its own.
+
+Usage:
+    python data/synthetic_transcripts.py --count 1000000 --seed 7 --output corpus.jsonl
+    python data/synthetic_transcripts.py -n 1000 --mix billing=3,fraud=1 --noise 0.2 --duplicate-rate 0.1
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.sample_transcripts import SAMPLE_TRANSCRIPTS
+from tools.features import split_turns
+from tools.ruleset import Ruleset, get_ruleset
+
+CUSTOMER_TEMPLATES = [
+    "Hi, I'm calling about {keyword} on my {service}.",
+    "I need help with the {keyword}. It's about my {service} account.",
+    "There is a {keyword} problem again and I'm not happy about it.",
+    "Can you look at the {keyword}? My {service} has {issue}.",
+    "I've been a customer for {years} years and this {keyword} thing keeps happening.",
+    "It's my {service}. I want to {request} because of the {keyword}.",
+    "Yes, the {keyword} was on {month} {day}. Can you check it?",
+    "My {service} has {issue} since {month} {day}.",
+    "Honestly I just want this {keyword} sorted out today."
+]
+
+AGENT_LINES = [
+    "Thank you for calling ABC Telecom. How can I help you today?",
+    "Let me pull up your account.",
+    "Can you confirm the phone number on the account?",
+    "I understand. Let me look into that for you.",
+    "Thanks for your patience while I check this.",
+    "I can see the details here. Give me one moment.",
+    "Is there anything else I can help you with?",
+    "I've added a note to your account.",
+    "Let me transfer you to the right team.",
+    "You'll receive a confirmation email shortly."
+]
+
+FILLER_WORDS = ["um", "uh", "like", "you know", "so", "well", "okay"]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+
+
+@dataclass
+class SyntheticConfig:
+    """
+    Settings of a synthetic corpus.
+
+    Attributes:
+        seed: Seed every transcript is derived from
+        category_mix: Relative weight per category; None weighs all categories equally
+        median_turns: Median number of speaker turns (lengths are log-normal)
+        length_spread: Sigma of the log-normal length distribution
+        min_turns: Shortest transcript, in turns
+        max_turns: Longest transcript, in turns
+        noise: Probability of noise per turn (typos, filler words, stray keywords)
+        duplicate_rate: Probability that a call repeats an earlier call verbatim
+        ruleset: Ruleset supplying the keyword tables; defaults to the active ruleset
+    """
+
+    seed: int = 0
+    category_mix: Optional[Dict[str, float]] = None
+    median_turns: int = 8
+    length_spread: float = 0.5
+    min_turns: int = 2
+    max_turns: int = 200
+    noise: float = 0.0
+    duplicate_rate: float = 0.0
+    ruleset: Optional[Ruleset] = field(default=None, repr=False)
+
+
+def _sample_lines() -> Tuple[Dict[str, List[str]], List[str]]:
+    """Return the sample customer lines per category and all sample agent lines."""
+    customer_lines: Dict[str, List[str]] = {}
+    agent_lines: List[str] = []
+    for sample in SAMPLE_TRANSCRIPTS:
+        for turn in split_turns(sample["transcript"]):
+            text = " ".join(turn.text.split())
+            if turn.speaker.lower() == "customer":
+                customer_lines.setdefault(sample["category"], []).append(text)
+            else:
+                agent_lines.append(text)
+    return customer_lines, agent_lines
+
+
+class TranscriptGenerator:
+    """Composes labeled Customer/Agent transcripts from a config."""
+
+    def __init__(self, config: Optional[SyntheticConfig] = None):
+        """
+        Create a generator.
+
+        Args:
+            config: Corpus settings; defaults to SyntheticConfig()
+
+        Raises:
+            ValueError: If the category mix names unknown categories or has no positive weight
+        """
+        self.config = config or SyntheticConfig()
+        self.ruleset = self.config.ruleset or get_ruleset()
+
+        mix = self.config.category_mix or {category: 1.0 for category in self.ruleset.categories}
+        unknown = sorted(set(mix) - set(self.ruleset.categories))
+        if unknown:
+            raise ValueError(f"unknown categories in mix: {', '.join(unknown)}")
+        self.categories = [category for category, weight in mix.items() if weight > 0]
+        if not self.categories:
+            raise ValueError("category mix has no positive weight")
+        self.cum_weights = []
+        total = 0.0
+        for category in self.categories:
+            total += mix[category]
+            self.cum_weights.append(total)
+
+        self.customer_lines, sample_agent_lines = _sample_lines()
+        self.agent_lines = AGENT_LINES + sample_agent_lines
+        self.services = [keyword for keywords in self.ruleset.service_keywords.values() for keyword in keywords]
+        self.issues = [keyword for keywords in self.ruleset.issue_keywords.values() for keyword in keywords]
+        self.requests = [keyword for keywords in self.ruleset.request_keywords.values() for keyword in keywords]
+        self.all_category_keywords = sorted({
+            keyword for keywords in self.ruleset.category_keywords.values() for keyword in keywords
+        })
+
+    def _rng(self, index: int) -> random.Random:
+        """Return the random generator of one transcript."""
+        return random.Random(f"{self.config.seed}:{index}")
+
+    def _turn_count(self, rng: random.Random) -> int:
+        """Draw a transcript length in turns."""
+        config = self.config
+        turns = round(rng.lognormvariate(math.log(max(1, config.median_turns)), config.length_spread))
+        return min(config.max_turns, max(config.min_turns, turns))
+
+    def _customer_turn(self, rng: random.Random, category: str) -> str:
+        """Compose one customer line for a category."""
+        samples = self.customer_lines.get(category)
+        if samples and rng.random() < 0.3:
+            return rng.choice(samples)
+        return rng.choice(CUSTOMER_TEMPLATES).format(
+            keyword=rng.choice(self.ruleset.category_keywords[category]),
+            service=rng.choice(self.services),
+            issue=rng.choice(self.issues),
+            request=rng.choice(self.requests),
+            years=rng.randint(1, 20),
+            month=rng.choice(MONTHS),
+            day=rng.randint(1, 28)
+        )
+
+    def _add_noise(self, rng: random.Random, line: str) -> str:
+        """Apply one kind of noise to a line."""
+        kind = rng.randrange(3)
+        words = line.split()
+        if kind == 0 and words:
+            # Transpose two adjacent letters of a random word
+            i = rng.randrange(len(words))
+            word = words[i]
+            if len(word) > 3:
+                j = rng.randrange(len(word) - 1)
+                words[i] = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+        elif kind == 1:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(FILLER_WORDS) + ",")
+        else:
+            # A keyword of a random category, as in calls that touch several topics
+            words.append(f"Also, the {rng.choice(self.all_category_keywords)}.")
+        return " ".join(words)
+
+    def compose(self, index: int) -> Dict:
+        """
+        Compose transcript number index, ignoring the duplicate rate.
+
+        Returns:
+            Dictionary with "id", "category" (the label) and "transcript"
+        """
+        rng = self._rng(index)
+        category = rng.choices(self.categories, cum_weights=self.cum_weights)[0]
+        lines = []
+        for turn in range(self._turn_count(rng)):
+            if turn % 2 == 0:
+                speaker, line = "Customer", self._customer_turn(rng, category)
+            else:
+                speaker, line = "Agent", rng.choice(self.agent_lines)
+            if self.config.noise and rng.random() < self.config.noise:
+                line = self._add_noise(rng, line)
+            lines.append(f"{speaker}: {line}")
+        return {"id": index, "category": category, "transcript": "\n".join(lines)}
+
+    def _repeated_index(self, index: int) -> Optional[int]:
+        """The earlier call that call index repeats, or None if it is not a duplicate."""
+        if index > 0 and self.config.duplicate_rate:
+            rng = random.Random(f"{self.config.seed}:dup:{index}")
+            if rng.random() < self.config.duplicate_rate:
+                return rng.randrange(index)
+        return None
+
+    def generate(self, index: int) -> Dict:
+        """
+        Return transcript number index.
+
+        With probability duplicate_rate the call repeats an earlier call; it then
+        carries that call's transcript and label plus "duplicate_of", the id of
+        the first call with that transcript.
+        """
+        source = self._repeated_index(index)
+        if source is None:
+            return self.compose(index)
+        # The repeated call may itself be a repeat; follow the chain to the call that was composed
+        while True:
+            earlier = self._repeated_index(source)
+            if earlier is None:
+                break
+            source = earlier
+        original = self.compose(source)
+        return {
+            "id": index,
+            "category": original["category"],
+            "transcript": original["transcript"],
+            "duplicate_of": original["id"]
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Yield transcripts 0, 1, 2, ... without end."""
+        index = 0
+        while True:
+            yield self.generate(index)
+            index += 1
+
+
+def generate_transcripts(count: int, config: Optional[SyntheticConfig] = None, start: int = 0) -> Iterator[Dict]:
+    """
+    Stream labeled synthetic transcripts.
+
+    Args:
+        count: Number of transcripts
+        config: Corpus settings
+        start: Index of the first transcript
+
+    Returns:
+        Iterator of dictionaries with "id", "category" and "transcript"
+    """
+    generator = TranscriptGenerator(config)
+    return (generator.generate(index) for index in range(start, start + count))
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse a category mix such as "billing=3,fraud=1"."""
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        category, _, weight = part.partition("=")
+        mix[category.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    defaults = SyntheticConfig()
+    parser = argparse.ArgumentParser(description="Generate labeled synthetic call transcripts as JSONL.")
+    parser.add_argument("-n", "--count", type=int, default=1000, help="Number of transcripts (default: 1000)")
+    parser.add_argument("-o", "--output", default="-", help="Output JSONL file, '-' for stdout (default)")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--start", type=int, default=0, help="Index of the first transcript")
+    parser.add_argument("--mix", help="Category weights, e.g. billing=3,fraud=1 (default: uniform)")
+    parser.add_argument("--median-turns", type=int, default=defaults.median_turns)
+    parser.add_argument("--length-spread", type=float, default=defaults.length_spread)
+    parser.add_argument("--min-turns", type=int, default=defaults.min_turns)
+    parser.add_argument("--max-turns", type=int, default=defaults.max_turns)
+    parser.add_argument("--noise", type=float, default=defaults.noise, help="Noise probability per turn")
+    parser.add_argument("--duplicate-rate", type=float, default=defaults.duplicate_rate)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Write the requested corpus."""
+    args = parse_args(argv)
+    try:
+        config = SyntheticConfig(
+            seed=args.seed,
+            category_mix=parse_mix(args.mix) if args.mix else None,
+            median_turns=args.median_turns,
+            length_spread=args.length_spread,
+            min_turns=args.min_turns,
+            max_turns=args.max_turns,
+            noise=args.noise,
+            duplicate_rate=args.duplicate_rate
+        )
+        records = generate_transcripts(args.count, config, args.start)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        for record in records:
+            output.write(json.dumps(record) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,98 +1,361 @@
 """Main application for Verizon Customer Call Analysis using Crew AI."""
 
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
-from src.crew import create_customer_call_crew, create_quick_classification_crew
-from tools.classification_tools import generate_classification_report
+from src.batch_prompting import DEFAULT_MAX_BATCH_SIZE, DEFAULT_TOKEN_BUDGET, BatchPromptClassifier
+from src.crew import get_crew_pool, install_crew_locks
+from src.rate_limit import (
+    DEFAULT_BASE_DELAY, RateLimiter, call_with_backoff, estimate_tokens, is_rate_limit_error, retry_after_seconds
+)
+from src.stage_scheduler import StagedCrew
+from src.tracing import Tracer, create_tracer, get_tracer, print_trace_summary, snapshot_tasks
+from tools.classification_tools import render_report
+from tools.condensation import condense_transcript, token_budget_from_env
+from tools.result_cache import classify_transcript_cached
 
 # Load environment variables
 load_dotenv()
 
+# Rough size of the agent and task instructions sent with every LLM request
+CREW_PROMPT_TOKENS = 600
 
-def classify_single_call(transcript: str, quick_mode: bool = False) -> dict:
+# Longest transcript, in estimated tokens, passed to the crew prompts; longer
+# ones are condensed to their most relevant sentences (unset or 0 disables)
+TRANSCRIPT_TOKEN_BUDGET = token_budget_from_env()
+
+
+class CascadeStats:
+    """Thread-safe per-tier call counts and latencies of the cascade."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = {}
+
+    def record(self, tier: str, seconds: float) -> None:
+        """Record one call answered by a tier."""
+        with self._lock:
+            self._latencies.setdefault(tier, []).append(seconds)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Return the share of traffic and latency percentiles of each tier."""
+        with self._lock:
+            total = sum(len(latencies) for latencies in self._latencies.values())
+            summary = {}
+            for tier, latencies in self._latencies.items():
+                ordered = sorted(latencies)
+                summary[tier] = {
+                    "calls": len(ordered),
+                    "fraction": round(len(ordered) / total, 4),
+                    "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+                    "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+                    "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3)
+                }
+            return summary
+
+
+def print_tokens_saved(results: List[Dict]) -> None:
+    """Print the prompt tokens condensation saved across a batch, if any."""
+    saved = [r["result"].get("tokens_saved", 0) for r in results]
+    condensed = sum(1 for tokens in saved if tokens)
+    if condensed:
+        print(f"\nCondensed {condensed} of {len(results)} transcripts, "
+              f"saving {sum(saved)} prompt tokens per task")
+
+
+def cascade_threshold_from_env() -> Optional[float]:
+    """Return CASCADE_CONFIDENCE_THRESHOLD, or None when the cascade is disabled."""
+    value = os.getenv("CASCADE_CONFIDENCE_THRESHOLD")
+    return float(value) if value else None
+
+
+def print_cascade_summary(stats: CascadeStats) -> None:
+    """Print the per-tier share of calls and latencies."""
+    print("\nCascade tiers:")
+    for tier, tier_stats in stats.summary().items():
+        print(f"  {tier:<12} {tier_stats['calls']:>6} calls ({tier_stats['fraction']:.1%})  "
+              f"mean {tier_stats['mean_ms']} ms  p50 {tier_stats['p50_ms']} ms  p95 {tier_stats['p95_ms']} ms")
+
+
+def _kickoff_rate_limited(crew, inputs: Dict[str, str], limiter: Optional[RateLimiter],
+                          task_tokens: int, span):
+    """
+    Run a crew within the rate limits.
+
+    A staged crew charges and retries each stage on its own, so a 429 never
+    re-runs (and re-bills) stages that already finished. A sequential crew is
+    one unit: it is charged up front and not retried as a whole; crewai
+    already retries throttled LLM requests, and a 429 that still escapes
+    pauses the other workers for the server's Retry-After and fails the call.
+    """
+    def on_wait(seconds: float) -> None:
+        span.add("queue_wait_ms", round(seconds * 1000, 3))
+
+    if isinstance(crew, StagedCrew):
+        return crew.kickoff(inputs=inputs, call_stage=lambda name, run: call_with_backoff(
+            run, limiter, requests=1, tokens=task_tokens,
+            on_wait=on_wait, on_retry=lambda error, delay: span.add("retries")
+        ))
+
+    if limiter is None:
+        return crew.kickoff(inputs=inputs)
+    task_count = len(crew.tasks)
+    on_wait(limiter.acquire(task_count, task_count * task_tokens))
+    try:
+        return crew.kickoff(inputs=inputs)
+    except Exception as e:
+        if is_rate_limit_error(e):
+            limiter.pause(retry_after_seconds(e) or DEFAULT_BASE_DELAY)
+        raise
+
+
+def classify_single_call(transcript: str, quick_mode: bool = False,
+                         cascade_threshold: Optional[float] = None,
+                         stats: Optional[CascadeStats] = None,
+                         limiter: Optional[RateLimiter] = None,
+                         tracer: Optional[Tracer] = None) -> dict:
     """
     Classify a single customer call transcript.
     
     Args:
         transcript: Customer call transcript text
         quick_mode: If True, use faster classification without full QA
+        cascade_threshold: If set, calls whose keyword confidence reaches this
+            percentage are answered by the keyword engine without running the crew
+        stats: Optional CascadeStats that records the tier and latency of the call
+        limiter: Optional shared RateLimiter; every crew stage is charged against it
+            and a stage the API answers with 429 is retried with backoff on its own
+        tracer: Tracer receiving the spans of the crew run and its tasks;
+            defaults to the process-wide tracer
         
     Returns:
-        Dictionary with classification results
+        Dictionary with classification results; "tier" names what answered the call
     """
+    started = time.perf_counter()
+    tier = "quick_crew" if quick_mode else "full_crew"
+    
+    if cascade_threshold is not None:
+        keyword_result = classify_transcript_cached(transcript)
+        classification = keyword_result["classification"]
+        if classification["confidence_score"] >= cascade_threshold:
+            report = render_report(**keyword_result)
+            if stats is not None:
+                stats.record("keyword", time.perf_counter() - started)
+            return {
+                "status": "success",
+                "tier": "keyword",
+                "result": f"{classification['primary_category']} "
+                          f"({classification['confidence_score']}% keyword confidence)",
+                "report": report
+            }
+    
     print("\n" + "="*70)
     print("VERIZON CUSTOMER CALL ANALYSIS & CLASSIFICATION")
     print("="*70)
     
     if quick_mode:
         print("\nMode: Quick Classification (Analysis + Classification)")
-        crew = create_quick_classification_crew()
     else:
         print("\nMode: Full Analysis (Analysis + Classification + QA + Action Plan)")
-        crew = create_customer_call_crew()
     
     print("\nProcessing call transcript...")
     print("-" * 70)
     
+    # The transcript goes into several task prompts; send a condensed copy of long calls
+    prompt_transcript = transcript
+    tokens_saved = 0
+    if TRANSCRIPT_TOKEN_BUDGET > 0:
+        condensed = condense_transcript(transcript, TRANSCRIPT_TOKEN_BUDGET)
+        prompt_transcript, tokens_saved = condensed.text, condensed.tokens_saved
+        if tokens_saved:
+            print(f"Condensed transcript: {condensed.original_tokens} -> {condensed.condensed_tokens} "
+                  f"tokens ({tokens_saved} saved per prompt)")
+    
     inputs = {
-        "call_transcript": transcript,
+        "call_transcript": prompt_transcript,
         "analysis_result": "",
         "classification_result": "",
         "qa_result": ""
     }
     
+    tracer = tracer if tracer is not None else get_tracer()
     try:
-        # Run the crew
-        result = crew.kickoff(inputs=inputs)
+        # Run a pooled crew; it is built on first use and reused for later calls.
+        # Each task is one LLM request that sends at least the transcript.
+        with tracer.run(tier, transcript_tokens=estimate_tokens(prompt_transcript),
+                        tokens_saved=tokens_saved) as span, get_crew_pool(quick_mode).acquire() as crew:
+            before = snapshot_tasks(crew)
+            try:
+                result = _kickoff_rate_limited(crew, inputs, limiter,
+                                               estimate_tokens(prompt_transcript) + CREW_PROMPT_TOKENS, span)
+            finally:
+                tracer.record_tasks(span, crew, before)
         
-        # Generate detailed report
-        report = generate_classification_report(transcript)
+        # Generate detailed report from the (cached) keyword results
+        report = render_report(**classify_transcript_cached(transcript))
         
         print("\n" + report)
         
         return {
             "status": "success",
+            "tier": tier,
             "result": str(result),
-            "report": report
+            "report": report,
+            "tokens_saved": tokens_saved
         }
     except Exception as e:
         print(f"\nError during processing: {str(e)}")
         return {
             "status": "error",
+            "tier": tier,
             "error": str(e)
         }
+    finally:
+        if stats is not None:
+            stats.record(tier, time.perf_counter() - started)
 
 
-def batch_classify_calls(transcripts: list, quick_mode: bool = False) -> list:
+def batch_classify_calls(transcripts: list, quick_mode: bool = False,
+                         cascade_threshold: Optional[float] = None,
+                         stats: Optional[CascadeStats] = None) -> list:
     """
     Classify multiple customer calls in batch.
     
     Args:
         transcripts: List of transcript strings
         quick_mode: If True, use faster classification
+        cascade_threshold: If set, only calls below this keyword confidence go to the crew
+        stats: Optional CascadeStats collecting per-call tiers and latencies
         
     Returns:
         List of classification results
     """
     results = []
+    stats = stats if stats is not None else CascadeStats()
+    tracer = create_tracer()
     
     for i, transcript in enumerate(transcripts, 1):
         print(f"\n\n{'='*70}")
         print(f"Processing Call {i} of {len(transcripts)}")
         print(f"{'='*70}")
         
-        result = classify_single_call(transcript, quick_mode)
+        result = classify_single_call(transcript, quick_mode, cascade_threshold, stats, tracer=tracer)
+        if result.get("tier") == "keyword":
+            print(f"Answered by keyword engine: {result['result']}")
         results.append({
             "call_number": i,
             "result": result
         })
     
+    print_tokens_saved(results)
+    print_trace_summary(tracer)
+    if cascade_threshold is not None:
+        print_cascade_summary(stats)
+    
     return results
 
 
+def concurrent_batch_classify_calls(transcripts: list, quick_mode: bool = False,
+                                    max_concurrency: int = 8,
+                                    requests_per_minute: Optional[float] = None,
+                                    tokens_per_minute: Optional[float] = None,
+                                    cascade_threshold: Optional[float] = None,
+                                    stats: Optional[CascadeStats] = None) -> list:
+    """
+    Classify multiple customer calls with several crews running at once.
+    
+    Crew runs are bounded by max_concurrency and paced by a shared
+    requests/tokens-per-minute limiter; calls that hit a 429 back off and are
+    retried. Results come back in input order.
+    
+    Args:
+        transcripts: List of transcript strings
+        quick_mode: If True, use faster classification
+        max_concurrency: Maximum crews running at the same time
+        requests_per_minute: LLM request quota; None for no limit
+        tokens_per_minute: LLM token quota; None for no limit
+        cascade_threshold: If set, only calls below this keyword confidence go to the crew
+        stats: Optional CascadeStats collecting per-call tiers and latencies
+        
+    Returns:
+        List of classification results
+    """
+    max_concurrency = max(1, max_concurrency)
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    stats = stats if stats is not None else CascadeStats()
+    tracer = create_tracer()
+    # Size the shared pool so every worker gets its own crew
+    get_crew_pool(quick_mode, max_concurrency)
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [
+            executor.submit(classify_single_call, transcript, quick_mode, cascade_threshold, stats, limiter, tracer)
+            for transcript in transcripts
+        ]
+        results = [{"call_number": i, "result": future.result()} for i, future in enumerate(futures, 1)]
+    elapsed = time.perf_counter() - started
+    
+    print(f"\nProcessed {len(results)} calls in {elapsed:.1f}s with up to {max_concurrency} concurrent crews")
+    print_tokens_saved(results)
+    print_trace_summary(tracer)
+    if cascade_threshold is not None:
+        print_cascade_summary(stats)
+    
+    return results
+
+
+def batch_prompt_classify_calls(transcripts: list, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                                token_budget: int = DEFAULT_TOKEN_BUDGET,
+                                max_concurrency: int = 1,
+                                requests_per_minute: Optional[float] = None,
+                                tokens_per_minute: Optional[float] = None) -> list:
+    """
+    Classify many calls with several transcripts per LLM request.
+    
+    Transcripts are packed into requests within the token budget, so the
+    category list and round trip are shared; calls whose result cannot be
+    parsed are retried one at a time; a request that still fails after the
+    rate-limit backoff is raised. Meant for backfills, it only classifies
+    (no analysis, QA or action plan).
+    
+    Args:
+        transcripts: List of transcript strings
+        max_batch_size: Maximum calls per request
+        token_budget: Estimated prompt tokens allowed per request
+        max_concurrency: Requests in flight at the same time
+        requests_per_minute: LLM request quota; None for no limit
+        tokens_per_minute: LLM token quota; None for no limit
+        
+    Returns:
+        List of classification results
+    """
+    classifier = BatchPromptClassifier(
+        token_budget=token_budget,
+        max_batch_size=max_batch_size,
+        limiter=RateLimiter(requests_per_minute, tokens_per_minute),
+        max_concurrency=max_concurrency
+    )
+    started = time.perf_counter()
+    results = classifier.classify(transcripts)
+    elapsed = time.perf_counter() - started
+    
+    stats = classifier.stats()
+    print(f"\nClassified {len(results)} calls with {stats['requests']} LLM requests "
+          f"({len(results) / max(1, stats['requests']):.1f} calls per request, "
+          f"{stats['retried_calls']} retried individually) in {elapsed:.1f}s")
+    
+    return [{"call_number": i, "result": {"tier": "batch_prompt", **result}} for i, result in enumerate(results, 1)]
+
+
 def main():
     """Main entry point for the application."""
     
+    install_crew_locks()
+    
     # Sample customer call transcripts for Verizon
     sample_calls = [
         """
@@ -145,8 +408,31 @@ def main():
     print("Starting ABC Telecom Customer Call Classification System")
     print("=" * 70)
     
-    # Classify all sample calls
-    results = batch_classify_calls(sample_calls, quick_mode=True)
+    # Classify all sample calls; CASCADE_CONFIDENCE_THRESHOLD lets clear-cut calls skip the crew
+    # BATCH_CONCURRENCY > 1 runs several crews at once within the LLM_*_PER_MINUTE quotas
+    # BATCH_PROMPT_SIZE > 1 packs that many calls into each classification request
+    concurrency = int(os.getenv("BATCH_CONCURRENCY", "1"))
+    prompt_batch_size = int(os.getenv("BATCH_PROMPT_SIZE", "1"))
+    if prompt_batch_size > 1:
+        results = batch_prompt_classify_calls(
+            sample_calls,
+            max_batch_size=prompt_batch_size,
+            max_concurrency=concurrency,
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0")) or None,
+            tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "0")) or None
+        )
+    elif concurrency > 1:
+        results = concurrent_batch_classify_calls(
+            sample_calls,
+            quick_mode=True,
+            max_concurrency=concurrency,
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0")) or None,
+            tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "0")) or None,
+            cascade_threshold=cascade_threshold_from_env()
+        )
+    else:
+        results = batch_classify_calls(sample_calls, quick_mode=True,
+                                       cascade_threshold=cascade_threshold_from_env())
     
     # Print summary
     print("\n\n" + "="*70)
@@ -155,7 +441,7 @@ def main():
     print(f"Total calls processed: {len(results)}")
     for result in results:
         status = result['result'].get('status', 'unknown')
-        print(f"Call {result['call_number']}: {status.upper()}")
+        print(f"Call {result['call_number']}: {status.upper()} ({result['result'].get('tier')})")
 
 
 if __name__ == "__main__":
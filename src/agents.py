@@ -5,6 +5,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from crewai import Agent
+from src.llm_cache import create_agent_llm
 from tools.classification_tools import (
     analyze_call_transcript,
     classify_call_category,
@@ -13,6 +14,12 @@ from tools.classification_tools import (
 )
 
 
+def _llm_settings() -> dict:
+    """Agent keyword arguments selecting the LLM; empty keeps crewai's default."""
+    llm = create_agent_llm()
+    return {"llm": llm} if llm is not None else {}
+
+
 def create_call_analyzer_agent() -> Agent:
     """Create an agent that analyzes customer call transcripts."""
     return Agent(
@@ -23,7 +30,8 @@ def create_call_analyzer_agent() -> Agent:
         and assessing the overall sentiment and urgency of customer calls. You have deep knowledge 
         of Verizon services including mobile, internet, TV, and business solutions.""",
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
+        **_llm_settings()
     )
 
 
@@ -38,7 +46,8 @@ def create_call_classifier_agent() -> Agent:
         billing, technical support, account management, customer service, retention, sales, refunds, 
         and fraud prevention.""",
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
+        **_llm_settings()
     )
 
 
@@ -53,7 +62,8 @@ def create_quality_assurance_agent() -> Agent:
         You understand regulatory requirements and customer satisfaction metrics.""",
         tools=[],
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
+        **_llm_settings()
     )
 
 
@@ -68,5 +78,6 @@ def create_action_plan_agent() -> Agent:
         need to be involved and what timelines are appropriate for different issue types.""",
         tools=[],
         verbose=True,
-        allow_delegation=False
+        allow_delegation=False,
+        **_llm_settings()
     )
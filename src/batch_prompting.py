@@ -0,0 +1,224 @@
+"""Batched LLM classification: several transcripts per classification request."""
+
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+from tools.ruleset import get_ruleset
+from .crew import CrewPool, create_batch_classification_crew
+from .rate_limit import RateLimiter, call_with_backoff, estimate_tokens
+
+DEFAULT_TOKEN_BUDGET = 6000
+DEFAULT_MAX_BATCH_SIZE = 20
+# Tokens of the category list and answer instructions sent once per request
+BATCH_PROMPT_TOKENS = 400
+# Tokens of the call header and answer object added per packed call
+PER_CALL_TOKENS = 60
+
+_ARRAY_PATTERN = re.compile(r"\[.*\]", re.DOTALL)
+_OBJECT_PATTERN = re.compile(r"\{[^{}]*\}", re.DOTALL)
+
+
+def pack_batches(transcripts: Sequence[str], token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE) -> List[List[int]]:
+    """
+    Greedily group transcripts into requests that fit a token budget.
+
+    Args:
+        transcripts: Transcripts to classify
+        token_budget: Estimated prompt tokens allowed per request
+        max_batch_size: Maximum calls per request
+
+    Returns:
+        Lists of transcript indices, in input order; a transcript larger than
+        the budget gets a request of its own
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = BATCH_PROMPT_TOKENS
+    for index, transcript in enumerate(transcripts):
+        cost = estimate_tokens(transcript) + PER_CALL_TOKENS
+        if current and (used + cost > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, used = [], BATCH_PROMPT_TOKENS
+        current.append(index)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def format_call_batch(transcripts: Sequence[str]) -> str:
+    """Number the transcripts of one request, starting at 1."""
+    return "\n\n".join(
+        f"### Call {number}\n{' '.join(transcript.split())}"
+        for number, transcript in enumerate(transcripts, 1)
+    )
+
+
+def normalize_category(value: object) -> Optional[str]:
+    """Map a category name such as "Technical Support" to its ruleset key, or None."""
+    if not isinstance(value, str):
+        return None
+    key = re.sub(r"[\s\-]+", "_", value.strip().lower())
+    return key if key in get_ruleset().categories else None
+
+
+def parse_batch_response(text: str, size: int) -> Dict[int, Dict]:
+    """
+    Extract per-call results from a batched classification answer.
+
+    Args:
+        text: Raw model output, ideally a JSON array
+        size: Number of calls in the request
+
+    Returns:
+        Mapping of call number (1-based) to its parsed result; calls whose
+        object is missing or invalid are left out
+    """
+    items: List = []
+    match = _ARRAY_PATTERN.search(text)
+    if match:
+        try:
+            parsed = json.loads(match.group(0))
+            items = parsed if isinstance(parsed, list) else []
+        except json.JSONDecodeError:
+            items = []
+    if not items:
+        # Truncated or malformed array: salvage the objects that are complete
+        for candidate in _OBJECT_PATTERN.findall(text):
+            try:
+                items.append(json.loads(candidate))
+            except json.JSONDecodeError:
+                continue
+
+    results = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            number = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        category = normalize_category(item.get("category"))
+        if not 1 <= number <= size or category is None or number in results:
+            continue
+        try:
+            confidence = float(item.get("confidence", 0))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        results[number] = {
+            "status": "success",
+            "primary_category": category,
+            "confidence_score": round(min(100.0, max(0.0, confidence)), 2),
+            "reasoning": str(item.get("reasoning", "")),
+            "department": str(item.get("department", ""))
+        }
+    return results
+
+
+class BatchPromptClassifier:
+    """
+    Classifies transcripts with one LLM request per packed batch.
+
+    Calls whose result is missing or unparsable in a batched answer are
+    retried one at a time. A request that fails (after the rate-limit
+    backoff) raises instead: re-sending its calls one by one would only
+    multiply the failing requests.
+    """
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 limiter: Optional[RateLimiter] = None,
+                 max_concurrency: int = 1,
+                 run_batch: Optional[Callable[[str], str]] = None):
+        """
+        Create a classifier.
+
+        Args:
+            token_budget: Estimated prompt tokens allowed per request
+            max_batch_size: Maximum calls per request
+            limiter: Optional shared RateLimiter for the requests
+            max_concurrency: Requests in flight at the same time
+            run_batch: Function sending one formatted call batch to the LLM and
+                returning its raw answer; defaults to a pooled batch crew
+        """
+        self.token_budget = token_budget
+        self.max_batch_size = max(1, max_batch_size)
+        self.limiter = limiter
+        self.max_concurrency = max(1, max_concurrency)
+        self._pool = CrewPool(create_batch_classification_crew, self.max_concurrency)
+        self._run_batch = run_batch or self._run_crew
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retried_calls = 0
+
+    def _run_crew(self, call_batch: str) -> str:
+        """Send one batch through a pooled batch classification crew."""
+        with self._pool.acquire() as crew:
+            return str(crew.kickoff(inputs={"call_batch": call_batch}))
+
+    def _request(self, transcripts: Sequence[str]) -> Dict[int, Dict]:
+        """Make one rate-limited request; returns the parsed results by call number."""
+        call_batch = format_call_batch(transcripts)
+        with self._lock:
+            self.requests += 1
+        answer = call_with_backoff(
+            lambda: self._run_batch(call_batch),
+            self.limiter,
+            tokens=estimate_tokens(call_batch) + BATCH_PROMPT_TOKENS
+        )
+        return parse_batch_response(answer, len(transcripts))
+
+    def _classify_batch(self, transcripts: Sequence[str]) -> List[Dict]:
+        """Classify one packed batch, retrying missing or unparsable calls individually."""
+        parsed = self._request(transcripts)
+
+        results = []
+        for number, transcript in enumerate(transcripts, 1):
+            result = parsed.get(number)
+            if result is None:
+                with self._lock:
+                    self.retried_calls += 1
+                result = self._request([transcript]).get(1) or {
+                    "status": "error",
+                    "error": "unparsable classification response"
+                }
+                result["retried"] = True
+            else:
+                result["retried"] = False
+            results.append(result)
+        return results
+
+    def classify(self, transcripts: Sequence[str]) -> List[Dict]:
+        """
+        Classify transcripts in packed batches.
+
+        Returns:
+            One result per transcript, in input order
+
+        Raises:
+            Exception: The error of the first request that failed
+        """
+        transcripts = list(transcripts)
+        batches = pack_batches(transcripts, self.token_budget, self.max_batch_size)
+        results: List[Optional[Dict]] = [None] * len(transcripts)
+
+        def run(indices: List[int]) -> None:
+            for index, result in zip(indices, self._classify_batch([transcripts[i] for i in indices])):
+                results[index] = result
+
+        if self.max_concurrency == 1:
+            for indices in batches:
+                run(indices)
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                list(executor.map(run, batches))
+        return results
+
+    def stats(self) -> Dict:
+        """Return how many requests were made and how many calls needed a retry."""
+        with self._lock:
+            return {"requests": self.requests, "retried_calls": self.retried_calls}
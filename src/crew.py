@@ -1,5 +1,11 @@
 """Crew AI Crew configuration for customer call analysis."""
 
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
 from crewai import Crew, Process
 from .agents import (
     create_call_analyzer_agent,
@@ -11,8 +17,10 @@ from .tasks import (
     create_analysis_task,
     create_classification_task,
     create_qa_review_task,
-    create_action_plan_task
+    create_action_plan_task,
+    create_batch_classification_task
 )
+from .stage_scheduler import create_staged_crew, install_thread_aware_locks
 
 
 def create_customer_call_crew() -> Crew:
@@ -25,10 +33,10 @@ def create_customer_call_crew() -> Crew:
     action_agent = create_action_plan_agent()
     
     # Create tasks
-    analysis_task = create_analysis_task()
-    classification_task = create_classification_task()
-    qa_task = create_qa_review_task()
-    action_task = create_action_plan_task()
+    analysis_task = create_analysis_task(analyzer_agent)
+    classification_task = create_classification_task(classifier_agent)
+    qa_task = create_qa_review_task(qa_agent)
+    action_task = create_action_plan_task(action_agent)
     
     # Create crew
     crew = Crew(
@@ -49,8 +57,8 @@ def create_quick_classification_crew() -> Crew:
     classifier_agent = create_call_classifier_agent()
     
     # Create tasks
-    analysis_task = create_analysis_task()
-    classification_task = create_classification_task()
+    analysis_task = create_analysis_task(analyzer_agent)
+    classification_task = create_classification_task(classifier_agent)
     
     # Create crew
     crew = Crew(
@@ -61,3 +69,137 @@ def create_quick_classification_crew() -> Crew:
     )
     
     return crew
+
+
+def create_batch_classification_crew() -> Crew:
+    """Create a single-task crew that classifies several calls per LLM request."""
+    
+    classifier_agent = create_call_classifier_agent()
+    batch_task = create_batch_classification_task(classifier_agent)
+    
+    crew = Crew(
+        agents=[classifier_agent],
+        tasks=[batch_task],
+        process=Process.sequential,
+        verbose=True
+    )
+    
+    return crew
+
+
+class CrewPool:
+    """
+    Pool of reusable crews of one kind.
+
+    Crews are built lazily, at most max_size of them, and handed out one
+    caller at a time: a crew keeps per-run state (interpolated task
+    descriptions, task outputs) during kickoff, so it must not be shared by
+    concurrent calls. Inputs are bound on each kickoff, which re-interpolates
+    the original task templates, so a returned crew is ready for the next call.
+    """
+
+    def __init__(self, factory: Callable[[], Crew], max_size: int = 1):
+        """
+        Create a pool.
+
+        Args:
+            factory: Function that builds one crew
+            max_size: Maximum number of crews; acquire() blocks when all are in use
+        """
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self._idle: "queue.LifoQueue[Crew]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[Crew]:
+        """
+        Borrow a crew for one kickoff.
+
+        Args:
+            timeout: Seconds to wait for a free crew; None waits forever
+
+        Raises:
+            queue.Empty: If no crew became free within the timeout
+        """
+        crew = self._checkout(timeout)
+        try:
+            yield crew
+        finally:
+            self._idle.put(crew)
+
+    def _checkout(self, timeout: Optional[float]) -> Crew:
+        """Return an idle crew, building one if the pool is not full yet."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            build = self._created < self.max_size
+            if build:
+                self._created += 1
+        if build:
+            try:
+                return self.factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get(timeout=timeout)
+
+    @property
+    def size(self) -> int:
+        """Number of crews built so far."""
+        return self._created
+
+
+_pools: Dict[bool, CrewPool] = {}
+_pools_lock = threading.Lock()
+
+
+def parallel_stages_enabled() -> bool:
+    """Whether pooled crews run independent stages in parallel (CREW_PARALLEL_STAGES, default on)."""
+    return os.getenv("CREW_PARALLEL_STAGES", "1").strip().lower() not in ("0", "false", "no")
+
+
+def install_crew_locks() -> None:
+    """
+    Set up crewai's locks for this process; call once at startup.
+
+    With parallel stages, threads of the process queue on an in-process
+    lock before crewai's file lock instead of polling it.
+    """
+    if parallel_stages_enabled():
+        install_thread_aware_locks()
+
+
+def _crew_factory(quick_mode: bool) -> Callable[[], Crew]:
+    """Return the function building one crew for a mode."""
+    if parallel_stages_enabled():
+        return lambda: create_staged_crew(quick_mode)
+    return create_quick_classification_crew if quick_mode else create_customer_call_crew
+
+
+def get_crew_pool(quick_mode: bool = False, max_size: int = 1) -> CrewPool:
+    """
+    Return the process-wide crew pool for a mode.
+
+    Unless CREW_PARALLEL_STAGES is 0, the pooled crews are StagedCrews that
+    run analysis and classification side by side.
+
+    Args:
+        quick_mode: Pool of quick classification crews instead of full crews
+        max_size: Minimum pool size; an existing smaller pool is allowed to grow
+
+    Returns:
+        The shared CrewPool
+    """
+    with _pools_lock:
+        pool = _pools.get(quick_mode)
+        if pool is None:
+            pool = _pools[quick_mode] = CrewPool(_crew_factory(quick_mode), max_size)
+        elif max_size > pool.max_size:
+            with pool._lock:
+                pool.max_size = max_size
+        return pool
@@ -0,0 +1,259 @@
+"""Persistent cache of LLM responses for the crew agents."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from crewai.llms.base_llm import BaseLLM, call_stop_override
+from crewai.utilities.llm_utils import create_llm
+from pydantic import Field
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class CacheMissError(RuntimeError):
+    """Raised in replay-only mode when a prompt has no cached response."""
+
+
+class LLMResponseCache:
+    """
+    SQLite cache of LLM responses keyed by prompt, model and parameters.
+
+    Entries older than ttl_seconds are treated as misses and removed; when
+    the cache grows past max_entries the least recently used entries are
+    evicted. All methods are thread-safe.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = DEFAULT_MAX_ENTRIES, replay_only: bool = False):
+        """
+        Create or open a cache.
+
+        Args:
+            db_path: SQLite file (":memory:" for a throwaway cache)
+            ttl_seconds: Maximum age of a usable entry; None keeps entries forever
+            max_entries: Maximum number of entries; None for no limit
+            replay_only: Never call the model; misses raise CacheMissError
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.replay_only = replay_only
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, messages: Any, params: Dict[str, Any]) -> str:
+        """Return the hex SHA-256 of the exact model, messages and parameters."""
+        payload = json.dumps({"model": model, "messages": messages, "params": params},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+            if row is None:
+                self._misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self._hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store a response, evicting the least recently used entries beyond max_entries."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now)
+            )
+            if self.max_entries is not None:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._db.commit()
+
+    def purge_expired(self) -> int:
+        """Delete every entry older than the TTL; returns the number removed."""
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM responses WHERE created_at < ?",
+                                      (time.time() - self.ttl_seconds,))
+            self._db.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the number of stored entries."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups * 100, 2) if lookups else 0.0,
+                "entries": self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0],
+                "replay_only": self.replay_only
+            }
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+class CachedLLM(BaseLLM):
+    """
+    LLM wrapper that answers repeated prompts from an LLMResponseCache.
+
+    Every call is keyed by the wrapped model, the exact messages, the tool
+    schemas and the generation parameters. Only plain-text responses are
+    cached; tool-calling results always come from the model.
+    """
+
+    llm_type: str = "cached"
+    inner: Any = Field(default=None, exclude=True)
+    response_cache: Any = Field(default=None, exclude=True)
+    cache_hits: int = Field(default=0, exclude=True)
+
+    def __init__(self, inner: Optional[BaseLLM], response_cache: LLMResponseCache, **kwargs: Any):
+        """
+        Wrap an LLM.
+
+        Args:
+            inner: The real LLM; may be None in replay-only mode
+            response_cache: Cache holding the responses
+        """
+        if inner is None and not response_cache.replay_only:
+            raise ValueError("an inner LLM is required unless the cache is replay-only")
+        settings = {}
+        if inner is not None:
+            settings = {name: getattr(inner, name) for name in
+                        ("temperature", "top_p", "max_tokens", "seed", "stop", "provider")}
+        settings.update(kwargs)
+        settings.setdefault("model", inner.model if inner is not None else os.getenv("OPENAI_MODEL_NAME", "replay"))
+        super().__init__(inner=inner, response_cache=response_cache, **settings)
+
+    def _cache_key(self, messages: Any, tools: Optional[List[Dict]], response_model: Any) -> str:
+        """Key of one call: model, messages, tools and generation parameters."""
+        params = {
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "max_tokens": self.max_tokens,
+            "seed": self.seed,
+            "stop": list(self.stop_sequences),
+            "tools": tools,
+            "response_model": getattr(response_model, "__name__", None),
+            "additional_params": getattr(self.inner, "additional_params", None)
+        }
+        return LLMResponseCache.make_key(self.model, messages, params)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        """Return the cached response for the call, or call the wrapped LLM and cache it."""
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        key = self._cache_key(messages, tools, response_model)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        if self.response_cache.replay_only or self.inner is None:
+            raise CacheMissError(f"no cached response for {self.model} prompt {key[:12]} (replay-only mode)")
+
+        # The agent sets stop words on this wrapper; pass them on for this call only
+        with call_stop_override(self.inner, list(self.stop_sequences)):
+            response = self.inner.call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+                response_model=response_model
+            )
+        if isinstance(response, str) and response:
+            self.response_cache.put(key, self.model, response)
+        return response
+
+    def supports_function_calling(self) -> bool:
+        """Delegate to the wrapped LLM."""
+        supports = getattr(self.inner, "supports_function_calling", None)
+        return bool(supports and supports())
+
+    def supports_stop_words(self) -> bool:
+        """Delegate to the wrapped LLM."""
+        return self.inner.supports_stop_words() if self.inner is not None else True
+
+    def get_context_window_size(self) -> int:
+        """Delegate to the wrapped LLM."""
+        return self.inner.get_context_window_size() if self.inner is not None else super().get_context_window_size()
+
+    def get_token_usage_summary(self):
+        """Token usage of the wrapped LLM; cache hits use no tokens."""
+        return self.inner.get_token_usage_summary() if self.inner is not None else super().get_token_usage_summary()
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Return the process-wide LLM response cache, or None when it is disabled.
+
+    Configured through LLM_CACHE_PATH (SQLite file; unset disables the
+    cache), LLM_CACHE_TTL (seconds), LLM_CACHE_MAX_ENTRIES and
+    LLM_CACHE_MODE ("replay" never calls the model).
+    """
+    global _default_cache
+    path = os.getenv("LLM_CACHE_PATH")
+    if not path:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            ttl = os.getenv("LLM_CACHE_TTL")
+            _default_cache = LLMResponseCache(
+                path,
+                ttl_seconds=float(ttl) if ttl else None,
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                replay_only=os.getenv("LLM_CACHE_MODE", "").lower() == "replay"
+            )
+        return _default_cache
+
+
+def create_agent_llm() -> Optional[BaseLLM]:
+    """
+    Return the LLM for crew agents: the default model behind the response
+    cache when LLM_CACHE_PATH is set, otherwise None (crewai's default).
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return None
+    # Built even for replay so keys carry the same model and parameters as when recorded;
+    # constructing it makes no network calls
+    return CachedLLM(create_llm(None), cache)
@@ -0,0 +1,133 @@
+"""Background crew runs whose stage outputs can be shown as they arrive."""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from tools.condensation import condense_transcript, token_budget_from_env
+from .crew import CrewPool, get_crew_pool
+from .stage_scheduler import StagedCrew, StageRunCancelled
+
+STAGE_TITLES = {
+    "analysis": "Call Analysis",
+    "classification": "Classification",
+    "qa": "QA Review",
+    "action_plan": "Action Plan",
+    "crew": "Crew Output"
+}
+
+
+class ProgressiveCrewRun:
+    """
+    Runs the crew for one transcript in a background thread.
+
+    Each stage output is recorded as soon as its stage finishes, so a UI can
+    poll snapshot() and render partial results. cancel() keeps stages that
+    have not started from running; a stage already waiting on the LLM is
+    allowed to finish, then the crew goes back to the pool.
+    """
+
+    def __init__(self, transcript: str, quick_mode: bool = False, pool: Optional[CrewPool] = None):
+        """
+        Create a run; call start() to begin.
+
+        Args:
+            transcript: The customer call transcript
+            quick_mode: Run only analysis and classification
+            pool: Crew pool to borrow from; defaults to the shared pool for the mode
+        """
+        self.transcript = transcript
+        self.quick_mode = quick_mode
+        self.pool = pool or get_crew_pool(quick_mode)
+        self.status = "pending"
+        self.error: Optional[str] = None
+        self.tokens_saved = 0
+        self._stages: List[Dict] = []
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._started = 0.0
+        self._finished: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ProgressiveCrewRun":
+        """Start the run in a daemon thread."""
+        self.status = "running"
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="progressive-crew", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        """Ask the run to stop before its next stage."""
+        self._cancel.set()
+        with self._lock:
+            if self.status == "running":
+                self.status = "cancelling"
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for the background thread to end."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def done(self) -> bool:
+        """True once the run has finished, failed or been cancelled."""
+        return self.status in ("done", "error", "cancelled")
+
+    def _record(self, name: str, output: str) -> None:
+        with self._lock:
+            self._stages.append({
+                "name": name,
+                "title": STAGE_TITLES.get(name, name.replace("_", " ").title()),
+                "output": output,
+                "seconds": round(time.perf_counter() - self._started, 2)
+            })
+
+    def _finish(self, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.status = status
+            self.error = error
+            self._finished = time.perf_counter()
+
+    def _run(self) -> None:
+        try:
+            transcript = self.transcript
+            budget = token_budget_from_env()
+            if budget > 0:
+                condensed = condense_transcript(transcript, budget)
+                transcript, self.tokens_saved = condensed.text, condensed.tokens_saved
+            inputs = {
+                "call_transcript": transcript,
+                "analysis_result": "",
+                "classification_result": "",
+                "qa_result": ""
+            }
+            with self.pool.acquire() as crew:
+                if isinstance(crew, StagedCrew):
+                    crew.kickoff(inputs, self._record, self._cancel)
+                elif not self._cancel.is_set():
+                    # Sequential crews (CREW_PARALLEL_STAGES=0) only report their final output
+                    self._record("crew", str(crew.kickoff(inputs=inputs)))
+            self._finish("cancelled" if self._cancel.is_set() else "done")
+        except StageRunCancelled:
+            self._finish("cancelled")
+        except Exception as e:
+            self._finish("error", str(e))
+
+    def snapshot(self) -> Dict:
+        """
+        Return the run's progress.
+
+        Returns:
+            Status, the stages finished so far (name, title, output, seconds
+            since start), error message, elapsed seconds and tokens saved
+        """
+        with self._lock:
+            end = self._finished if self._finished is not None else time.perf_counter()
+            return {
+                "status": self.status,
+                "stages": list(self._stages),
+                "error": self.error,
+                "elapsed": round(end - self._started, 1) if self._started else 0.0,
+                "tokens_saved": self.tokens_saved
+            }
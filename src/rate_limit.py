@@ -0,0 +1,213 @@
+"""Client-side rate limiting and 429 backoff for LLM-bound crew runs."""
+
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+from openai import RateLimitError
+
+from tools.condensation import estimate_tokens
+
+T = TypeVar("T")
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 2.0
+DEFAULT_MAX_DELAY = 60.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate.
+
+    The bucket starts full, so up to ``capacity`` units can be spent in a
+    burst before callers are paced at the refill rate.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Create a bucket.
+
+        Args:
+            per_minute: Units added per minute
+            capacity: Maximum units held; defaults to one minute's worth
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1.0) -> float:
+        """
+        Take amount units if available.
+
+        Amounts above the capacity are clamped to it, so oversized requests
+        wait for a full bucket instead of forever.
+
+        Returns:
+            0.0 on success, otherwise the seconds to wait before enough units are available
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        Block until amount units are taken.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(amount)
+            if delay == 0.0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits shared by all workers.
+
+    After a 429, pause() holds back every worker until the server's
+    Retry-After has passed, instead of letting each one hit the limit again.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        """
+        Create a limiter.
+
+        Args:
+            requests_per_minute: Request quota; None for no request limit
+            tokens_per_minute: Token quota; None for no token limit
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, requests: int = 1, tokens: int = 0) -> float:
+        """
+        Block until the quota allows the given number of requests and tokens.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        with self._lock:
+            pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+            waited += pause
+        if self.requests is not None:
+            waited += self.requests.acquire(requests)
+        if self.tokens is not None and tokens:
+            waited += self.tokens.acquire(tokens)
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every acquire() for the next seconds."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def _rate_limit_cause(error: BaseException) -> Optional[BaseException]:
+    """
+    Return the HTTP 429 error behind an exception, or None.
+
+    Follows explicit ``raise ... from`` chains, since frameworks such as
+    crewai re-raise client errors wrapped in their own exceptions.
+    """
+    seen = set()
+    candidate: Optional[BaseException] = error
+    while candidate is not None and id(candidate) not in seen:
+        seen.add(id(candidate))
+        status = getattr(candidate, "status_code", None)
+        if status is None:
+            status = getattr(getattr(candidate, "response", None), "status_code", None)
+        if isinstance(candidate, RateLimitError) or status == 429:
+            return candidate
+        candidate = candidate.__cause__
+    return None
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Return True if an exception from an LLM client is (or was raised from) an HTTP 429."""
+    return _rate_limit_cause(error) is not None
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Return the Retry-After delay carried by a 429 error (or the 429 it was raised from), if any."""
+    response = getattr(_rate_limit_cause(error) or error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def call_with_backoff(func: Callable[[], T], limiter: Optional[RateLimiter] = None,
+                      requests: int = 1, tokens: int = 0,
+                      max_retries: int = DEFAULT_MAX_RETRIES,
+                      base_delay: float = DEFAULT_BASE_DELAY,
+                      max_delay: float = DEFAULT_MAX_DELAY,
+                      on_wait: Optional[Callable[[float], None]] = None,
+                      on_retry: Optional[Callable[[BaseException, float], None]] = None) -> T:
+    """
+    Call func within the rate limits, retrying on 429 responses.
+
+    Retries use exponential backoff with full jitter, or the server's
+    Retry-After when it sends one; other exceptions propagate unchanged.
+
+    Args:
+        func: The rate-limited call; a 429 runs all of it again, so keep it to
+            one LLM request or one crew stage
+        limiter: Shared limiter; None only backs off
+        requests: Requests func will make, charged before each attempt
+        tokens: Estimated tokens func will use, charged before each attempt
+        max_retries: Retries after the first attempt before giving up
+        base_delay: First backoff delay in seconds
+        max_delay: Longest backoff delay in seconds
+        on_wait: Optional callback receiving the seconds each attempt waited for the quota
+        on_retry: Optional callback receiving each 429 error and the backoff delay before its retry
+
+    Returns:
+        The result of func
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            waited = limiter.acquire(requests, tokens)
+            if on_wait is not None:
+                on_wait(waited)
+        try:
+            return func()
+        except Exception as e:
+            cause = _rate_limit_cause(e)
+            if cause is None or attempt >= max_retries:
+                raise
+            delay = retry_after_seconds(cause)
+            if delay is None:
+                delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            if on_retry is not None:
+                on_retry(e, delay)
+            if limiter is not None:
+                limiter.pause(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
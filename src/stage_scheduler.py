@@ -0,0 +1,287 @@
+"""Dependency-aware scheduling of crew stages.
+
+The sequential crews run analysis, classification, QA and the action plan
+one after another, although classification only needs the transcript. Here
+every stage is a single-task crew with declared dependencies: stages start
+as soon as the outputs they read exist, so analysis and classification run
+side by side and a full run takes as long as its longest dependency path.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from hashlib import md5
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import portalocker
+from crewai import Crew, Process, Task
+from .agents import (
+    create_call_analyzer_agent,
+    create_call_classifier_agent,
+    create_quality_assurance_agent,
+    create_action_plan_agent
+)
+from .tasks import (
+    create_analysis_task,
+    create_classification_task,
+    create_qa_review_task,
+    create_action_plan_task
+)
+
+try:
+    from crewai_core.lock_store import set_lock_backend
+except ImportError:  # crewai releases without a pluggable lock store
+    set_lock_backend = None
+
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+_locks_installed = False
+
+
+@contextmanager
+def _thread_then_file_lock(name: str, timeout: float = 120) -> Iterator[None]:
+    """
+    crewai's file lock, with the threads of this process queued on an in-process lock first.
+
+    crewai guards its stores (e.g. the task outputs written after every
+    task) with a file lock that waiters poll every 0.25 s, which adds up to a
+    quarter second per task when stages run side by side. Queueing threads
+    on an in-process lock first leaves the file lock to guard other
+    processes. The file is the one crewai's default backend takes, so those
+    processes are excluded whether they run staged crews, sequential crews
+    or the crewai CLI.
+    """
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(name, threading.Lock())
+    if not thread_lock.acquire(timeout=timeout):
+        raise TimeoutError(f"timed out waiting for crew lock {name!r}")
+    try:
+        # Same path as crewai_core.lock_store's default file lock
+        channel = f"crewai:{md5(name.encode(), usedforsecurity=False).hexdigest()}"
+        with portalocker.Lock(os.path.join(tempfile.gettempdir(), f"{channel}.lock"), timeout=timeout):
+            yield
+    finally:
+        thread_lock.release()
+
+
+def install_thread_aware_locks() -> None:
+    """
+    Make crewai take its named locks through _thread_then_file_lock.
+
+    Replaces crewai's process-wide lock backend, so call it once at startup,
+    before any crew runs. Left alone when REDIS_URL is set, where crewai
+    shares its locks through Redis.
+    """
+    global _locks_installed
+    if set_lock_backend is None or os.getenv("REDIS_URL"):
+        return
+    with _thread_locks_guard:
+        if not _locks_installed:
+            set_lock_backend(_thread_then_file_lock)
+            _locks_installed = True
+
+
+class StageRunCancelled(Exception):
+    """Raised by StageScheduler.run() when its cancel event stopped the run early."""
+
+    def __init__(self, outputs: Dict[str, str]):
+        super().__init__(f"run cancelled after {len(outputs)} stages")
+        self.outputs = outputs
+
+
+class Stage(NamedTuple):
+    """One node of a stage graph."""
+
+    name: str
+    output_key: str
+    run: Callable[[Dict[str, str]], str]
+    depends_on: Tuple[str, ...] = ()
+
+
+class StageRun:
+    """Outputs of one scheduled run; str() is the final stage's output, like a CrewOutput."""
+
+    def __init__(self, outputs: Dict[str, str], seconds: Dict[str, float], final_stage: str):
+        self.outputs = outputs
+        self.seconds = seconds
+        self.final_stage = final_stage
+
+    @property
+    def raw(self) -> str:
+        """Output of the final stage."""
+        return self.outputs[self.final_stage]
+
+    def __str__(self) -> str:
+        return self.raw
+
+
+class StageScheduler:
+    """
+    Runs a DAG of stages, each as soon as its dependencies have finished.
+
+    A stage receives the run inputs plus, under each upstream stage's
+    output_key, that stage's output. The first stage failure cancels the
+    stages not yet started and is raised from run().
+    """
+
+    def __init__(self, stages: Sequence[Stage], max_workers: Optional[int] = None):
+        """
+        Create a scheduler.
+
+        Args:
+            stages: The stages; dependencies must name other stages
+            max_workers: Stages running at the same time; defaults to all of them
+
+        Raises:
+            ValueError: If stage names repeat, a dependency is unknown or the graph has a cycle
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("stage names must be unique")
+        for stage in stages:
+            unknown = [name for name in stage.depends_on if name not in self.stages]
+            if unknown:
+                raise ValueError(f"stage {stage.name!r} depends on unknown stages {unknown}")
+        self.order = self._topological_order()
+        self.max_workers = max(1, max_workers or len(self.stages))
+
+    def _topological_order(self) -> List[str]:
+        """Return the stage names in dependency order."""
+        order: List[str] = []
+        done = set()
+        pending = list(self.stages)
+        while pending:
+            ready = [name for name in pending if set(self.stages[name].depends_on) <= done]
+            if not ready:
+                raise ValueError(f"stage graph has a cycle among {pending}")
+            order.extend(ready)
+            done.update(ready)
+            pending = [name for name in pending if name not in done]
+        return order
+
+    def critical_path(self, seconds: Dict[str, float]) -> float:
+        """Return the longest dependency path for the given stage durations."""
+        finish: Dict[str, float] = {}
+        for name in self.order:
+            start = max((finish[dep] for dep in self.stages[name].depends_on), default=0.0)
+            finish[name] = start + seconds.get(name, 0.0)
+        return max(finish.values(), default=0.0)
+
+    def run(self, inputs: Dict[str, str],
+            on_stage_complete: Optional[Callable[[str, str], None]] = None,
+            cancel_event: Optional[threading.Event] = None,
+            call_stage: Optional[Callable[[str, Callable[[], str]], str]] = None) -> StageRun:
+        """
+        Run every stage once.
+
+        Args:
+            inputs: Inputs shared by all stages
+            on_stage_complete: Optional callback receiving (stage name, output) as stages finish
+            cancel_event: Optional event that, once set, keeps further stages from
+                starting; stages already running are allowed to finish
+            call_stage: Optional wrapper every stage runs through, receiving the stage
+                name and a callable running it (e.g. to retry a rate-limited stage
+                without re-running the stages that already finished)
+
+        Returns:
+            The outputs and durations of all stages
+
+        Raises:
+            StageRunCancelled: If the cancel event stopped the run before every stage ran
+        """
+        outputs: Dict[str, str] = {}
+        seconds: Dict[str, float] = {}
+        running: Dict[Future, str] = {}
+
+        def execute(stage: Stage, stage_inputs: Dict[str, str]) -> Tuple[str, float]:
+            started = time.perf_counter()
+            if call_stage is not None:
+                output = call_stage(stage.name, lambda: stage.run(stage_inputs))
+            else:
+                output = stage.run(stage_inputs)
+            return output, time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = list(self.order)
+            while pending or running:
+                if cancel_event is not None and cancel_event.is_set():
+                    pending = []
+                for name in [n for n in pending if all(dep in outputs for dep in self.stages[n].depends_on)]:
+                    stage = self.stages[name]
+                    stage_inputs = dict(inputs)
+                    stage_inputs.update({self.stages[dep].output_key: outputs[dep] for dep in stage.depends_on})
+                    running[executor.submit(execute, stage, stage_inputs)] = name
+                    pending.remove(name)
+
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        outputs[name], seconds[name] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+                    if on_stage_complete is not None:
+                        on_stage_complete(name, outputs[name])
+
+        if len(outputs) < len(self.order):
+            raise StageRunCancelled(outputs)
+        return StageRun(outputs, seconds, self.order[-1])
+
+
+def _crew_stage(name: str, output_key: str, task: Task, depends_on: Tuple[str, ...] = ()) -> Stage:
+    """Wrap one task in a single-task crew stage."""
+    crew = Crew(agents=[task.agent], tasks=[task], process=Process.sequential, verbose=True)
+    return Stage(name, output_key, lambda inputs: crew.kickoff(inputs=inputs).raw, depends_on)
+
+
+class StagedCrew(StageScheduler):
+    """
+    Crew stand-in that runs its tasks as scheduled single-task crews.
+
+    Offers the kickoff(inputs=...) and tasks of a Crew, so it can be pooled
+    and rate limited like one; like a crew, it serves one caller at a time.
+    """
+
+    def __init__(self, stages: Sequence[Stage], tasks: List[Task]):
+        super().__init__(stages)
+        self.tasks = tasks
+
+    def kickoff(self, inputs: Dict[str, str],
+                on_stage_complete: Optional[Callable[[str, str], None]] = None,
+                cancel_event: Optional[threading.Event] = None,
+                call_stage: Optional[Callable[[str, Callable[[], str]], str]] = None) -> StageRun:
+        """Run the stages with the given inputs."""
+        return self.run(inputs, on_stage_complete, cancel_event, call_stage)
+
+
+def create_staged_crew(quick_mode: bool = False) -> StagedCrew:
+    """
+    Create the call analysis stages: analysis and classification in parallel,
+    then (full mode) QA on both and the action plan on all three.
+    """
+    analysis_task = create_analysis_task(create_call_analyzer_agent())
+    classification_task = create_classification_task(create_call_classifier_agent())
+    stages = [
+        _crew_stage("analysis", "analysis_result", analysis_task),
+        _crew_stage("classification", "classification_result", classification_task)
+    ]
+    tasks = [analysis_task, classification_task]
+
+    if not quick_mode:
+        qa_task = create_qa_review_task(create_quality_assurance_agent())
+        action_task = create_action_plan_task(create_action_plan_agent())
+        stages += [
+            _crew_stage("qa", "qa_result", qa_task, ("analysis", "classification")),
+            _crew_stage("action_plan", "action_plan_result", action_task, ("analysis", "classification", "qa"))
+        ]
+        tasks += [qa_task, action_task]
+
+    return StagedCrew(stages, tasks)
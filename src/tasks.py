@@ -1,6 +1,6 @@
 """Crew AI Tasks for customer call classification."""
 
-from crewai import Task
+from crewai import Agent, Task
 from .agents import (
     create_call_analyzer_agent,
     create_call_classifier_agent,
@@ -8,9 +8,19 @@ from .agents import (
     create_action_plan_agent
 )
 
+# Category list shared by the single-call and batched classification prompts
+CATEGORY_GUIDE = """        - Billing (invoices, payments, pricing)
+        - Technical Support (network, connectivity issues)
+        - Account Management (plan changes, account info)
+        - Customer Service (general inquiries, complaints)
+        - Retention (cancellation prevention, retention offers)
+        - Sales (upgrades, new services)
+        - Refund (refunds, credits, compensation)
+        - Fraud (fraud detection, security)"""
+
 
-def create_analysis_task() -> Task:
-    """Create task for analyzing customer calls."""
+def create_analysis_task(agent: Agent = None) -> Task:
+    """Create task for analyzing customer calls; builds its own agent unless one is given."""
     return Task(
         description="""Analyze the following customer call transcript:
         {call_transcript}
@@ -29,22 +39,15 @@ def create_analysis_task() -> Task:
         - Critical issues
         - Urgency level
         - Notable observations""",
-        agent=create_call_analyzer_agent()
+        agent=agent or create_call_analyzer_agent()
     )
 
 
-def create_classification_task() -> Task:
-    """Create task for classifying calls into categories."""
+def create_classification_task(agent: Agent = None) -> Task:
+    """Create task for classifying calls into categories; builds its own agent unless one is given."""
     return Task(
         description="""Based on the customer call analysis, classify the call into one of these categories:
-        - Billing (invoices, payments, pricing)
-        - Technical Support (network, connectivity issues)
-        - Account Management (plan changes, account info)
-        - Customer Service (general inquiries, complaints)
-        - Retention (cancellation prevention, retention offers)
-        - Sales (upgrades, new services)
-        - Refund (refunds, credits, compensation)
-        - Fraud (fraud detection, security)
+""" + CATEGORY_GUIDE + """
         
         Call transcript: {call_transcript}
         
@@ -60,12 +63,12 @@ def create_classification_task() -> Task:
         - Clear reasoning
         - Alternative categories considered
         - Department recommendation""",
-        agent=create_call_classifier_agent()
+        agent=agent or create_call_classifier_agent()
     )
 
 
-def create_qa_review_task() -> Task:
-    """Create task for quality assurance review."""
+def create_qa_review_task(agent: Agent = None) -> Task:
+    """Create task for quality assurance review; builds its own agent unless one is given."""
     return Task(
         description="""Review the call analysis and classification for quality and compliance.
         
@@ -86,12 +89,12 @@ def create_qa_review_task() -> Task:
         - Risk level
         - Required escalations
         - Recommendations for improvement""",
-        agent=create_quality_assurance_agent()
+        agent=agent or create_quality_assurance_agent()
     )
 
 
-def create_action_plan_task() -> Task:
-    """Create task for developing action plans."""
+def create_action_plan_task(agent: Agent = None) -> Task:
+    """Create task for developing action plans; builds its own agent unless one is given."""
     return Task(
         description="""Create a comprehensive action plan for handling this customer call.
         
@@ -115,5 +118,24 @@ def create_action_plan_task() -> Task:
         - Escalation procedures if needed
         - Customer retention strategy
         - Success metrics""",
-        agent=create_action_plan_agent()
+        agent=agent or create_action_plan_agent()
+    )
+
+
+def create_batch_classification_task(agent: Agent = None) -> Task:
+    """Create task for classifying several numbered calls in one request."""
+    return Task(
+        description="""Classify each of the numbered customer calls below into one of these categories:
+""" + CATEGORY_GUIDE + """
+        
+        Calls:
+        {call_batch}
+        
+        Answer with a JSON array holding one object per call, in any order, with the keys
+        "id" (the call number), "category" (the category name from the list above),
+        "confidence" (0-100), "reasoning" (one sentence) and "department" (routing).
+        Output only the JSON array.""",
+        expected_output="""A JSON array with one object per call:
+        [{"id": 1, "category": "Billing", "confidence": 90, "reasoning": "...", "department": "..."}]""",
+        agent=agent or create_call_classifier_agent()
     )
@@ -0,0 +1,231 @@
+"""Tracing spans for crew runs and their tasks: latency, tokens, cost, retries and cache hits."""
+
+import datetime
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# USD per million (prompt, completion) tokens; models not listed get no cost
+MODEL_PRICES = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60)
+}
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Return the USD cost of the tokens at MODEL_PRICES, or None for an unknown model."""
+    prices = MODEL_PRICES.get((model or "").split("/")[-1])
+    if prices is None:
+        return None
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+@dataclass
+class Span:
+    """One timed unit of work: a crew run or one of its tasks."""
+
+    kind: str
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    start: float = field(default_factory=time.time)
+    duration_ms: float = 0.0
+    status: str = "ok"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        """Increase a numeric attribute."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+
+def _usage(task: Any) -> Tuple[Dict[str, int], int]:
+    """Return the cumulative token usage and cache hits of the LLM of a task's agent."""
+    llm = getattr(getattr(task, "agent", None), "llm", None)
+    summary = getattr(llm, "get_token_usage_summary", None)
+    usage = summary().model_dump() if summary else {}
+    return usage, getattr(llm, "cache_hits", 0)
+
+
+def snapshot_tasks(crew: Any) -> Dict[int, Tuple[Any, Dict[str, int], int]]:
+    """
+    Record the state of a crew's tasks before a run, for Tracer.record_tasks().
+
+    Returns:
+        Per task id: (start time, token usage, cache hits)
+    """
+    return {id(task): (getattr(task, "start_time", None), *_usage(task)) for task in getattr(crew, "tasks", [])}
+
+
+class Tracer:
+    """
+    Collects spans, appends them to a JSON-lines file and aggregates them.
+
+    Thread-safe; every finished span is written at once, so a trace file is
+    complete up to the last finished span even if the process dies.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Create a tracer.
+
+        Args:
+            path: JSON-lines file the spans are appended to; None keeps them in memory only
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._totals: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def finish(self, span: Span) -> None:
+        """Aggregate a finished span and export it."""
+        with self._lock:
+            totals = self._totals.setdefault((span.kind, span.name), {"durations": []})
+            totals["durations"].append(span.duration_ms)
+            for key, value in span.attributes.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    totals[key] = totals.get(key, 0) + value
+            if span.status != "ok":
+                totals["errors"] = totals.get("errors", 0) + 1
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(span), default=str) + "\n")
+
+    @contextmanager
+    def run(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Time a crew run; the span is finished when the block exits.
+
+        Args:
+            name: Kind of run, e.g. the cascade tier
+            attributes: Initial span attributes
+        """
+        span = Span("run", name, uuid.uuid4().hex, attributes=dict(attributes))
+        started = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.status = "error"
+            span.attributes["error"] = str(e)
+            raise
+        finally:
+            span.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            self.finish(span)
+
+    def record_tasks(self, run: Span, crew: Any, before: Dict[int, Tuple[Any, Dict[str, int], int]]) -> None:
+        """
+        Add a span for each task of the crew that ran since snapshot_tasks().
+
+        Token counts and cache hits are the growth of each task's agent LLM
+        counters over the run; they are also added up on the run span.
+        """
+        for task in getattr(crew, "tasks", []):
+            started_before, usage_before, hits_before = before.get(id(task), (None, {}, 0))
+            start_time = getattr(task, "start_time", None)
+            if start_time is None or start_time == started_before:
+                continue
+            usage, hits = _usage(task)
+            delta = {key: value - usage_before.get(key, 0) for key, value in usage.items()
+                     if isinstance(value, int)}
+            llm = getattr(task.agent, "llm", None)
+            model = getattr(llm, "model", None)
+            # A task that failed keeps the end time of its previous run, if any
+            finished = task.end_time is not None and task.end_time >= task.start_time
+            end = task.end_time if finished else datetime.datetime.now()
+            span = Span("task", getattr(task, "name", None) or task.agent.role, run.trace_id,
+                        parent_id=run.span_id, start=task.start_time.timestamp(),
+                        duration_ms=round((end - task.start_time).total_seconds() * 1000, 3),
+                        status="ok" if finished else "error",
+                        attributes={
+                            "agent": task.agent.role,
+                            "model": model,
+                            "prompt_tokens": delta.get("prompt_tokens", 0),
+                            "completion_tokens": delta.get("completion_tokens", 0),
+                            "llm_requests": delta.get("successful_requests", 0),
+                            "cache_hits": hits - hits_before
+                        })
+            cost = estimate_cost(model, span.attributes["prompt_tokens"], span.attributes["completion_tokens"])
+            if cost is not None:
+                span.attributes["cost_usd"] = round(cost, 6)
+            for key in ("prompt_tokens", "completion_tokens", "llm_requests", "cache_hits", "cost_usd"):
+                if key in span.attributes:
+                    run.add(key, span.attributes[key])
+            self.finish(span)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Aggregate the finished spans by kind and name.
+
+        Returns:
+            One row per (kind, name): span count, mean/p50/p95 ms and the mean
+            of each numeric attribute (tokens, requests, retries, queue wait, cost)
+        """
+        rows = []
+        with self._lock:
+            for (kind, name), totals in self._totals.items():
+                durations = sorted(totals["durations"])
+                count = len(durations)
+                row = {
+                    "kind": kind,
+                    "name": name,
+                    "spans": count,
+                    "mean_ms": round(sum(durations) / count, 1),
+                    "p50_ms": round(durations[count // 2], 1),
+                    "p95_ms": round(durations[min(count - 1, int(count * 0.95))], 1)
+                }
+                for key, total in totals.items():
+                    if key == "errors":
+                        row["errors"] = total
+                    elif key != "durations":
+                        row[f"mean_{key}"] = round(total / count, 4)
+                rows.append(row)
+        return sorted(rows, key=lambda row: (row["kind"] != "run", -row["mean_ms"]))
+
+
+def print_trace_summary(tracer: Tracer) -> None:
+    """Print where crew time, tokens and money went."""
+    rows = tracer.summary()
+    if not rows:
+        return
+    print("\nCrew trace summary (means per span):")
+    for row in rows:
+        parts = [f"{row['mean_ms']:.0f} ms (p50 {row['p50_ms']:.0f}, p95 {row['p95_ms']:.0f})"]
+        if "mean_prompt_tokens" in row:
+            parts.append(f"{row['mean_prompt_tokens']:.0f} prompt + {row.get('mean_completion_tokens', 0):.0f} "
+                         f"completion tokens")
+        if row.get("mean_cost_usd"):
+            parts.append(f"${row['mean_cost_usd']:.5f}")
+        if row.get("mean_queue_wait_ms"):
+            parts.append(f"{row['mean_queue_wait_ms']:.0f} ms queued")
+        if row.get("mean_retries"):
+            parts.append(f"{row['mean_retries']:.2f} retries")
+        if row.get("mean_cache_hits"):
+            parts.append(f"{row['mean_cache_hits']:.2f} cache hits")
+        if row.get("errors"):
+            parts.append(f"{row['errors']} errors")
+        print(f"  {row['kind']:<4} {row['name'][:40]:<40} x{row['spans']:<5} " + ", ".join(parts))
+
+
+def create_tracer() -> Tracer:
+    """Create a tracer exporting to CREW_TRACE_PATH when it is set."""
+    return Tracer(os.getenv("CREW_TRACE_PATH") or None)
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer used by calls made outside a batch."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = create_tracer()
+        return _tracer
@@ -0,0 +1,91 @@
+"""Tests for background batch jobs over uploaded files."""
+
+import csv
+import io
+import json
+import threading
+import zipfile
+
+from data.sample_transcripts import SAMPLE_TRANSCRIPTS
+from tools.batch_jobs import BatchJob, BatchJobManager, iter_upload
+from tools.classification_tools import classify_transcript
+
+TRANSCRIPTS = [sample["transcript"] for sample in SAMPLE_TRANSCRIPTS]
+
+
+def _csv_upload(transcripts):
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=["call_id", "transcript"])
+    writer.writeheader()
+    writer.writerows({"call_id": f"c{i}", "transcript": text} for i, text in enumerate(transcripts))
+    return output.getvalue().encode("utf-8")
+
+
+def test_uploads_are_read_by_extension_including_zip_members():
+    """CSV, JSONL and ZIP uploads yield records; transcripts may contain --- lines."""
+    tricky = "Customer: My bill is wrong.\n---\nAgent: Let me check the charges."
+    jsonl = "\n".join(json.dumps({"id": f"j{i}", "text": text}) for i, text in enumerate([tricky, TRANSCRIPTS[0]]))
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("b/calls.jsonl", jsonl)
+        zf.writestr("a/calls.csv", _csv_upload(TRANSCRIPTS[:2]))
+        zf.writestr("__MACOSX/a/._calls.csv", b"\x00\x01")
+
+    assert [r["id"] for r in iter_upload("day.csv", _csv_upload(TRANSCRIPTS[:3]))] == ["c0", "c1", "c2"]
+    records = list(iter_upload("day.jsonl", jsonl.encode("utf-8")))
+    assert records[0] == {"id": "j0", "transcript": tricky}
+    assert [r["id"] for r in iter_upload("day.zip", archive.getvalue())] == ["c0", "c1", "j0", "j1"]
+
+
+def test_job_classifies_every_call_in_order():
+    """A finished job has one row per call, counts and throughput."""
+    manager = BatchJobManager(workers=1)
+    job = manager.submit("day.csv", _csv_upload(TRANSCRIPTS))
+    manager._executor.shutdown(wait=True)
+
+    snapshot = job.snapshot()
+    assert snapshot["status"] == "done"
+    assert snapshot["total"] == snapshot["processed"] == len(TRANSCRIPTS)
+    assert [row["id"] for row in job.rows] == [f"c{i}" for i in range(len(TRANSCRIPTS))]
+    expected = classify_transcript(TRANSCRIPTS[0])["classification"]["primary_category"]
+    assert job.rows[0]["primary_category"] == expected
+    assert sum(snapshot["categories"].values()) == len(TRANSCRIPTS)
+    assert snapshot["calls_per_second"] > 0
+    assert manager.get(job.id) is job
+
+    output = io.StringIO()
+    job.write_results(output, "csv")
+    assert len(list(csv.DictReader(io.StringIO(output.getvalue())))) == len(TRANSCRIPTS)
+
+
+def test_cancel_stops_a_running_job_and_skips_a_queued_one(monkeypatch):
+    """Cancelling keeps the rows done so far; a queued job never starts."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_classify(transcript):
+        started.set()
+        release.wait(5)
+        return {"status": "success", **classify_transcript(transcript)}
+
+    monkeypatch.setattr("tools.parallel_batch.classify_call_quietly", slow_classify)
+    manager = BatchJobManager(workers=1)
+    running = manager.submit("a.csv", _csv_upload(TRANSCRIPTS * 10))
+    queued = manager.submit("b.csv", _csv_upload(TRANSCRIPTS))
+    assert started.wait(5)
+
+    queued.cancel()
+    running.cancel()
+    release.set()
+    manager._executor.shutdown(wait=True)
+
+    assert running.status == "cancelled"
+    assert 0 < running.snapshot()["processed"] < len(TRANSCRIPTS) * 10
+    assert queued.status == "cancelled" and queued.snapshot()["processed"] == 0
+
+
+def test_bad_upload_fails_the_job_only():
+    """An unreadable archive ends its job with an error."""
+    job = BatchJob("broken.zip", b"not a zip")
+    job.run(workers=1)
+    assert job.status == "error" and job.error
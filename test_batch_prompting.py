@@ -0,0 +1,81 @@
+"""Tests for multi-transcript batched classification prompts."""
+
+import json
+import re
+import threading
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from src.batch_prompting import BatchPromptClassifier, pack_batches, parse_batch_response
+
+
+def test_pack_batches_respects_budget_and_size():
+    """Requests stay within the token budget and size cap; oversized calls go alone."""
+    transcripts = ["x" * 400] * 10 + ["y" * 40000] + ["z" * 400] * 3
+
+    batches = pack_batches(transcripts, token_budget=1000, max_batch_size=4)
+
+    assert [i for batch in batches for i in batch] == list(range(len(transcripts)))
+    assert all(len(batch) <= 4 for batch in batches)
+    assert [10] in batches
+
+
+def test_parse_salvages_objects_and_normalizes_categories():
+    """Category names map to ruleset keys; invalid or out-of-range entries are dropped."""
+    text = ('Here you go: [{"id": 1, "category": "Technical Support", "confidence": 88}, '
+            '{"id": 2, "category": "Weather", "confidence": 50}, '
+            '{"id": 7, "category": "Billing"}, {"id": 3, "category": "refund", "confid')
+
+    results = parse_batch_response(text, size=3)
+
+    assert results[1]["primary_category"] == "technical_support"
+    assert results[1]["confidence_score"] == 88.0
+    assert set(results) == {1}
+
+
+def test_missing_results_are_retried_individually():
+    """Calls absent from a batched answer are re-sent alone; order is preserved."""
+    requests = []
+    lock = threading.Lock()
+
+    def run_batch(call_batch):
+        calls = re.findall(r"### Call (\d+)\n(.*)", call_batch)
+        with lock:
+            requests.append(len(calls))
+        answer = []
+        for number, text in calls:
+            # Batched answers silently skip calls mentioning "refund"
+            if "refund" in text and len(calls) > 1:
+                continue
+            category = "Refund" if "refund" in text else "Billing"
+            answer.append({"id": int(number), "category": category, "confidence": 80})
+        return json.dumps(answer)
+
+    transcripts = [f"Customer: call {i} about my {'refund' if i % 4 == 0 else 'bill'}" for i in range(12)]
+    classifier = BatchPromptClassifier(max_batch_size=5, max_concurrency=2, run_batch=run_batch)
+
+    results = classifier.classify(transcripts)
+
+    assert [r["primary_category"] for r in results] == [
+        "refund" if i % 4 == 0 else "billing" for i in range(12)
+    ]
+    assert [r["retried"] for r in results] == [i % 4 == 0 for i in range(12)]
+    assert classifier.stats() == {"requests": 3 + 3, "retried_calls": 3}
+    assert sorted(requests) == [1, 1, 1, 2, 5, 5]
+
+
+def test_failed_request_is_raised_not_retried_per_call():
+    """A request error surfaces instead of being re-sent once per packed call."""
+    requests = []
+
+    def run_batch(call_batch):
+        requests.append(call_batch)
+        raise ConnectionError("upstream unavailable")
+
+    classifier = BatchPromptClassifier(max_batch_size=5, run_batch=run_batch)
+
+    with pytest.raises(ConnectionError):
+        classifier.classify([f"Customer: call {i} about my bill" for i in range(3)])
+    assert len(requests) == 1
@@ -0,0 +1,71 @@
+"""Tests for the vectorized batch classifier."""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from data.sample_transcripts import SAMPLE_TRANSCRIPTS
+from tools import batch_scoring
+from tools.batch_scoring import classify_batch, compile_automaton, keyword_hit_matrix
+from tools.classification_tools import classify_call_category
+
+
+def test_matches_per_call_classification():
+    """Categories, confidences and score vectors match classify_call_category."""
+    samples = [sample["transcript"] for sample in SAMPLE_TRANSCRIPTS]
+    rng = random.Random(11)
+    transcripts = samples + ["", "nothing relevant here"] + [
+        rng.choice(samples)[:rng.randint(0, 400)] + rng.choice(samples)[-rng.randint(0, 400):]
+        for _ in range(300)
+    ]
+    transcripts += transcripts[:20]  # duplicates are scored once and broadcast
+
+    batch = classify_batch(transcripts)
+
+    assert len(batch) == len(transcripts)
+    for i, transcript in enumerate(transcripts):
+        expected = classify_call_category(transcript)
+        assert batch.primary_categories[i] == expected["primary_category"]
+        assert batch.confidences[i] == expected["confidence_score"]
+        assert dict(zip(batch.categories, batch.all_scores[i].tolist())) == expected["all_scores"]
+
+
+def test_hit_matrix_matches_substring_semantics(monkeypatch):
+    """Hits agree with `keyword in text.lower()`, across lane boundaries and non-ASCII text."""
+    monkeypatch.setattr(batch_scoring, "SCAN_LANES", 7)
+    keywords = ("café", "down", "new", "renew", "wifi", "wifi down", "ß")
+    filler = [" ", "\n", "Customer:", "WiFi", "DOWN", "RENEW", "CAFÉ", "İ", "é", "x"]
+    rng = random.Random(5)
+    texts = ["", "".join(rng.choice(keywords + tuple(filler)) for _ in range(2000))] + [
+        "".join(rng.choice(keywords + tuple(filler)) for _ in range(rng.randint(0, 12))) for _ in range(300)
+    ]
+
+    indptr, indices = keyword_hit_matrix(texts, compile_automaton(keywords), len(keywords))
+
+    for i, text in enumerate(texts):
+        found = {keywords[j] for j in indices[indptr[i]:indptr[i + 1]].tolist()}
+        assert found == {keyword for keyword in keywords if keyword in text.lower()}
+
+
+def test_worker_processes_match_in_process_scoring(monkeypatch):
+    """A batch split over worker processes scores exactly like one scored in process."""
+    monkeypatch.setattr(batch_scoring, "PARALLEL_MIN_CHARS", 0)
+    transcripts = [f"{sample['transcript']}\nCall reference {i}"
+                   for i, sample in enumerate(SAMPLE_TRANSCRIPTS * 20)]
+
+    parallel = classify_batch(transcripts, workers=2)
+    sequential = classify_batch(transcripts, workers=1)
+
+    assert parallel.primary_categories.tolist() == sequential.primary_categories.tolist()
+    assert parallel.confidences.tolist() == sequential.confidences.tolist()
+    assert (parallel.all_scores == sequential.all_scores).all()
+
+
+def test_empty_batch():
+    """An empty batch yields empty arrays with the right shapes."""
+    batch = classify_batch([])
+
+    assert len(batch) == 0
+    assert batch.all_scores.shape == (0, len(batch.categories))
@@ -0,0 +1,57 @@
+"""Tests for the confidence-gated keyword/crew cascade in main.py."""
+
+import pytest
+
+pytest.importorskip("crewai")
+
+import main
+from data.sample_transcripts import SAMPLE_TRANSCRIPTS
+from src.crew import CrewPool
+
+
+class FakeCrew:
+    """Stands in for a crew; records the transcripts it was asked about."""
+
+    def __init__(self):
+        self.calls = []
+        self.tasks = ["analysis", "classification"]
+
+    def kickoff(self, inputs):
+        self.calls.append(inputs["call_transcript"])
+        return "crew verdict"
+
+
+@pytest.fixture
+def fake_crew(monkeypatch):
+    crew = FakeCrew()
+    pool = CrewPool(lambda: crew)
+    monkeypatch.setattr(main, "get_crew_pool", lambda quick_mode=False: pool)
+    return crew
+
+
+def test_only_uncertain_calls_reach_the_crew(fake_crew, capsys):
+    """Calls at or above the threshold are answered by the keyword engine."""
+    transcripts = [sample["transcript"] for sample in SAMPLE_TRANSCRIPTS]
+    stats = main.CascadeStats()
+
+    results = [main.classify_single_call(t, quick_mode=True, cascade_threshold=50, stats=stats)
+               for t in transcripts]
+
+    keyword = [r for r in results if r["tier"] == "keyword"]
+    crew = [r for r in results if r["tier"] == "quick_crew"]
+    assert keyword and crew
+    assert all(r["status"] == "success" and r["report"] for r in results)
+    assert len(fake_crew.calls) == len(crew)
+
+    summary = stats.summary()
+    assert summary["keyword"]["calls"] == len(keyword)
+    assert summary["quick_crew"]["calls"] == len(crew)
+    assert summary["keyword"]["fraction"] + summary["quick_crew"]["fraction"] == pytest.approx(1.0)
+
+
+def test_without_threshold_every_call_runs_the_crew(fake_crew, capsys):
+    """The cascade is opt-in."""
+    results = main.batch_classify_calls([SAMPLE_TRANSCRIPTS[0]["transcript"]] * 2)
+
+    assert [r["result"]["tier"] for r in results] == ["full_crew", "full_crew"]
+    assert len(fake_crew.calls) == 2
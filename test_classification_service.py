@@ -0,0 +1,77 @@
+"""Tests for the classification HTTP service and its client."""
+
+import json
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from classification_service import ClassificationService
+from data.sample_transcripts import SAMPLE_TRANSCRIPTS
+from tools.classification_tools import classify_transcript, render_report
+from tools.result_cache import ResultCache
+from tools.service_client import ClassificationClient, ServiceError, iter_classify_remote
+
+TRANSCRIPTS = [sample["transcript"] for sample in SAMPLE_TRANSCRIPTS]
+
+
+@pytest.fixture
+def service():
+    with ClassificationService(workers=1, chunk_size=3, cache=ResultCache()) as running:
+        yield running
+
+
+def test_single_call_matches_in_process_results_over_one_connection(service):
+    """Results and reports equal the local engine's; repeat calls reuse the socket and the cache."""
+    client = ClassificationClient(service.url)
+    expected = classify_transcript(TRANSCRIPTS[0])
+
+    first = client.classify(TRANSCRIPTS[0], reports=("text", "csv"))
+    socket = client._connection().sock
+    second = client.classify(TRANSCRIPTS[0])
+
+    assert first["status"] == "success"
+    assert {key: first[key] for key in expected} == json.loads(json.dumps(expected))
+    assert first["reports"]["csv"] == render_report(**expected, output_format="csv")
+    assert {key: second[key] for key in expected} == {key: first[key] for key in expected}
+    assert client._connection().sock is socket
+    assert client.health()["cache"]["hits"] >= 1
+    assert client.report(TRANSCRIPTS[1], "json") == render_report(**classify_transcript(TRANSCRIPTS[1]),
+                                                                   output_format="json")
+
+
+def test_batch_keeps_order_and_isolates_bad_calls(service):
+    """Each batch entry succeeds or fails on its own, in input order, across chunks."""
+    client = ClassificationClient(service.url)
+    transcripts = TRANSCRIPTS * 2
+    transcripts[2] = None
+
+    results = client.classify_batch(transcripts)
+
+    assert len(results) == len(transcripts)
+    assert results[2]["status"] == "error"
+    for transcript, result in zip(transcripts, results):
+        if transcript is not None:
+            expected = classify_transcript(transcript)["classification"]["primary_category"]
+            assert result["classification"]["primary_category"] == expected
+
+
+def test_invalid_requests_are_rejected(service):
+    """Bad bodies get a 400 with the reason."""
+    client = ClassificationClient(service.url)
+    with pytest.raises(ServiceError) as error:
+        client.classify("   ")
+    assert error.value.status == 400 and "transcript" in str(error.value)
+    with pytest.raises(ServiceError):
+        client.report(TRANSCRIPTS[0], "pdf")
+
+
+def test_remote_iteration_turns_an_unreachable_service_into_errors(service):
+    """A failed batch request yields one error per call instead of raising."""
+    url = service.url
+    results = list(iter_classify_remote(ClassificationClient(url), TRANSCRIPTS, chunk_size=4))
+    assert [r["status"] for r in results] == ["success"] * len(TRANSCRIPTS)
+
+    service.stop()
+    results = list(iter_classify_remote(ClassificationClient(url, timeout=2), TRANSCRIPTS[:3]))
+    assert [r["status"] for r in results] == ["error"] * 3
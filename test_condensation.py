@@ -0,0 +1,54 @@
+"""Tests for token-budgeted transcript condensation."""
+
+from tools.condensation import GAP_MARKER, condense_transcript, estimate_tokens, token_budget_from_env
+
+
+FILLER = "Agent: Let me pull up the account details while we talk about the weather today."
+
+
+def _long_transcript() -> str:
+    lines = ["Customer: My bill has an overcharge and I want a refund for the late fee."]
+    lines += [FILLER] * 60
+    lines += ["Customer: Also the payment page keeps failing.", FILLER * 2]
+    return "\n".join(lines)
+
+
+def test_short_transcript_is_unchanged():
+    """Transcripts within the budget are returned verbatim."""
+    transcript = "Customer: My internet is down.\nAgent: Let me check."
+
+    condensed = condense_transcript(transcript, token_budget=100)
+
+    assert condensed.text == transcript
+    assert condensed.tokens_saved == 0
+
+
+def test_condensed_transcript_fits_budget():
+    """Long transcripts are cut to the budget and report the tokens saved."""
+    transcript = _long_transcript()
+
+    condensed = condense_transcript(transcript, token_budget=120)
+
+    assert condensed.condensed_tokens <= 120
+    assert condensed.condensed_tokens == estimate_tokens(condensed.text)
+    assert condensed.tokens_saved == estimate_tokens(transcript) - condensed.condensed_tokens
+    assert condensed.dropped_sentences > 0
+
+
+def test_customer_and_keyword_sentences_are_kept():
+    """The customer's keyword-bearing sentences survive; dropped spans are marked."""
+    condensed = condense_transcript(_long_transcript(), token_budget=120)
+
+    assert "Customer: My bill has an overcharge" in condensed.text
+    assert "payment page keeps failing" in condensed.text
+    assert GAP_MARKER in condensed.text
+    assert condensed.text.index("overcharge") < condensed.text.index("payment page")
+
+
+def test_condensation_is_off_unless_configured(monkeypatch):
+    """Without TRANSCRIPT_TOKEN_BUDGET transcripts are sent verbatim."""
+    monkeypatch.delenv("TRANSCRIPT_TOKEN_BUDGET", raising=False)
+    assert token_budget_from_env() == 0
+
+    monkeypatch.setenv("TRANSCRIPT_TOKEN_BUDGET", "1500")
+    assert token_budget_from_env() == 1500
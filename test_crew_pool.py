@@ -0,0 +1,58 @@
+"""Tests for the reusable crew pool."""
+
+import queue
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from src.crew import CrewPool
+
+
+def test_crews_are_built_once_and_reused():
+    """Sequential calls share one crew."""
+    built = []
+    pool = CrewPool(lambda: built.append(object()) or built[-1])
+
+    for _ in range(5):
+        with pool.acquire() as crew:
+            assert crew is built[0]
+    assert len(built) == 1 and pool.size == 1
+
+
+def test_concurrent_callers_never_share_a_crew():
+    """Each crew is held by at most one caller; the pool never exceeds max_size."""
+    pool = CrewPool(object, max_size=3)
+    in_use, lock = set(), threading.Lock()
+    errors = []
+
+    def worker():
+        for _ in range(20):
+            with pool.acquire() as crew:
+                with lock:
+                    if crew in in_use:
+                        errors.append("shared")
+                    in_use.add(crew)
+                time.sleep(0.001)
+                with lock:
+                    in_use.discard(crew)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert pool.size <= 3
+
+
+def test_acquire_times_out_when_all_crews_are_busy():
+    """A full pool blocks until a crew is returned."""
+    pool = CrewPool(object, max_size=1)
+    with pool.acquire():
+        with pytest.raises(queue.Empty):
+            with pool.acquire(timeout=0.05):
+                pass
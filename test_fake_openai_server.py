@@ -0,0 +1,64 @@
+"""Tests for the offline chat-completions stand-in server."""
+
+import http.client
+import json
+
+from benchmarks.fake_openai_server import FakeOpenAIServer, ServerConfig
+from src.batch_prompting import format_call_batch, parse_batch_response
+
+
+def _post(server, body):
+    host, port = server._httpd.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+    connection.request("POST", "/v1/chat/completions", json.dumps(body), {"Content-Type": "application/json"})
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    headers = dict(response.getheaders())
+    connection.close()
+    return response.status, payload, headers
+
+
+def test_templated_answers_are_deterministic():
+    """Task prompts get stable answers derived from the keyword classifier."""
+    prompt = ("Based on the customer call analysis, classify the call...\n"
+              "Call transcript: Customer: I was charged twice on my bill and the payment failed\n\nProvide:\n1. ...")
+    body = {"model": "gpt-test", "messages": [{"role": "system", "content": "You are a classifier"},
+                                              {"role": "user", "content": prompt}]}
+    with FakeOpenAIServer() as server:
+        status, first, _ = _post(server, body)
+        _, second, _ = _post(server, body)
+        stats = server.stats()
+
+    content = first["choices"][0]["message"]["content"]
+    assert status == 200
+    assert "Final Answer: Primary category: billing" in content
+    assert content == second["choices"][0]["message"]["content"]
+    assert first["usage"]["total_tokens"] > 0
+    assert stats["by_task"] == {"classification": 2}
+
+
+def test_batch_prompts_round_trip_through_the_parser():
+    """Batched classification answers parse back into one result per call."""
+    calls = format_call_batch(["Customer: my wifi network has no signal",
+                               "Customer: I want to cancel and switch to a competitor deal"])
+    prompt = f"Classify each of the numbered customer calls below\nCalls:\n{calls}\n\nAnswer with a JSON array holding one object per call"
+    with FakeOpenAIServer() as server:
+        _, payload, _ = _post(server, {"messages": [{"role": "user", "content": prompt}]})
+
+    results = parse_batch_response(payload["choices"][0]["message"]["content"], 2)
+    assert results[1]["primary_category"] == "technical_support"
+    assert results[2]["primary_category"] == "retention"
+
+
+def test_rate_limits_and_errors():
+    """Over-quota requests get 429 with Retry-After; error_rate 1 fails everything."""
+    body = {"messages": [{"role": "user", "content": "hello"}]}
+    with FakeOpenAIServer(ServerConfig(requests_per_minute=1)) as server:
+        assert _post(server, body)[0] == 200
+        status, payload, headers = _post(server, body)
+        assert status == 429 and float(headers["Retry-After"]) > 0
+        assert payload["error"]["code"] == "rate_limit_exceeded"
+
+    with FakeOpenAIServer(ServerConfig(error_rate=1.0)) as server:
+        assert _post(server, body)[0] == 500
+        assert server.stats()["errors"] == 1
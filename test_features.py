@@ -0,0 +1,50 @@
+"""Tests for the shared per-call feature extraction stage."""
+
+import json
+
+import pytest
+
+from data.sample_transcripts import SAMPLE_TRANSCRIPTS
+from tools import classification_tools as tools
+from tools.features import split_turns
+
+
+def test_tools_accept_text_or_features():
+    """Passing extracted features gives the same results as passing raw text."""
+    for sample in SAMPLE_TRANSCRIPTS:
+        transcript = sample["transcript"]
+        features = tools.extract_features(transcript)
+
+        assert tools.extract_features(features) is features
+        assert tools.analyze_call_transcript(features) == tools.analyze_call_transcript(transcript)
+        assert tools.classify_call_category(features) == tools.classify_call_category(transcript)
+        assert tools.extract_customer_info(features) == tools.extract_customer_info(transcript)
+        assert tools.generate_classification_report(features) == tools.generate_classification_report(transcript)
+        assert features.word_count == len(transcript.split())
+
+
+def test_split_turns():
+    """Speaker prefixes start new turns and continuation lines stay with them."""
+    turns = split_turns("Customer: My wifi is down.\nIt has been a week.\n  Agent: Sorry to hear that.")
+
+    assert [turn.speaker for turn in turns] == ["Customer", "Agent"]
+    assert turns[0].text == "My wifi is down.\nIt has been a week."
+    assert turns[1].text == "Sorry to hear that."
+    assert split_turns("no speakers here")[0].speaker == "Unknown"
+    assert split_turns("   ") == ()
+
+
+def test_render_report_reuses_results():
+    """Reports render from existing results in every supported format."""
+    transcript = SAMPLE_TRANSCRIPTS[2]["transcript"]
+    results = tools.classify_transcript(transcript)
+
+    assert tools.render_report(**results) == tools.generate_classification_report(transcript)
+    assert json.loads(tools.render_report(**results, output_format="json")) == results
+
+    header, row = tools.render_report(**results, output_format="csv").splitlines()
+    assert header.split(",") == tools.REPORT_CSV_HEADER
+    assert row.startswith(results["classification"]["primary_category"] + ",")
+
+    with pytest.raises(ValueError):
+        tools.render_report(**results, output_format="pdf")
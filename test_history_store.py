@@ -0,0 +1,58 @@
+"""Tests for the persistent call history store."""
+
+from data.sample_transcripts import SAMPLE_TRANSCRIPTS
+from tools.classification_tools import classify_transcript
+from tools.history_store import CallHistoryStore
+
+
+def _fill(store, copies=3):
+    """Add every sample call `copies` times, one second apart; returns the results in insert order."""
+    results = []
+    for i in range(copies * len(SAMPLE_TRANSCRIPTS)):
+        transcript = SAMPLE_TRANSCRIPTS[i % len(SAMPLE_TRANSCRIPTS)]["transcript"]
+        result = classify_transcript(transcript)
+        store.add(transcript, result, created_at=1000.0 + i)
+        results.append(result)
+    return results
+
+
+def test_pages_are_newest_first_and_cover_every_call_once(tmp_path):
+    """Pages are bounded, ordered by time and survive reopening the file."""
+    path = str(tmp_path / "history.sqlite3")
+    store = CallHistoryStore(path)
+    results = _fill(store)
+    store.close()
+
+    store = CallHistoryStore(path)
+    total = store.count()
+    assert total == len(results)
+    pages = [store.page(page, 4) for page in range(1, total // 4 + 2)]
+    assert all(len(rows) <= 4 for rows in pages)
+    ids = [row["id"] for rows in pages for row in rows]
+    assert sorted(ids) == list(range(1, total + 1))
+    times = [row["created_at"] for rows in pages for row in rows]
+    assert times == sorted(times, reverse=True)
+
+    newest = store.get(ids[0])
+    assert newest["classification"] == results[-1]["classification"]
+    assert store.get(10 ** 6) is None
+
+
+def test_filters_and_summary_match_the_stored_results():
+    """Counts by category and sentiment agree with the results that were added."""
+    store = CallHistoryStore(":memory:")
+    results = _fill(store)
+    category = results[0]["classification"]["primary_category"]
+    expected = [r for r in results if r["classification"]["primary_category"] == category]
+
+    assert store.count(category=category) == len(expected)
+    assert {row["category"] for row in store.page(1, 100, category=category)} == {category}
+    assert store.count(since=1002.0, until=1004.0) == 2
+
+    summary = store.summary()
+    assert summary["total"] == len(results)
+    assert sum(summary["categories"].values()) == len(results)
+    assert summary["categories"][category] == len(expected)
+    mean = sum(r["classification"]["confidence_score"] for r in results) / len(results)
+    assert summary["avg_confidence"] == round(mean, 1)
+    assert store.summary(sentiment="no such sentiment")["total"] == 0
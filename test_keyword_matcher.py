@@ -0,0 +1,28 @@
+"""Tests for the single-pass keyword matcher."""
+
+import random
+
+from tools.keyword_matcher import KeywordMatcher
+from tools.classification_tools import scan_keywords
+from tools.ruleset import get_ruleset
+
+
+def test_overlapping_and_nested_keywords():
+    """Every overlapping occurrence is reported, like repeated substring scans."""
+    matcher = KeywordMatcher(["wifi", "wifi down", "down", "thank", "thanks", "new", "renew"])
+    hits = matcher.find_all("my wifi down again, thanks! please renew")
+
+    assert hits == {"wifi": 1, "wifi down": 1, "down": 1, "thank": 1, "thanks": 1, "new": 1, "renew": 1}
+
+
+def test_matches_substring_semantics():
+    """The automaton agrees with `keyword in text` for every known keyword."""
+    keywords = list(get_ruleset().matcher.keywords)
+    filler = ["the", " ", "\n", "Customer:", "Agent:", "no", "-", "x"]
+    rng = random.Random(7)
+
+    for _ in range(500):
+        parts = [rng.choice(keywords + filler) for _ in range(rng.randint(0, 30))]
+        text = "".join(parts)
+        expected = {keyword for keyword in keywords if keyword in text.lower()}
+        assert set(scan_keywords(text)) == expected
@@ -0,0 +1,74 @@
+"""Tests for the persistent LLM response cache."""
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.llms.base_llm import BaseLLM
+
+from src.llm_cache import CacheMissError, CachedLLM, LLMResponseCache
+
+
+class FakeLLM(BaseLLM):
+    """Counts calls and answers with the last user message."""
+
+    calls: int = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        self.calls += 1
+        return f"answer to {messages[-1]['content']}"
+
+
+def test_repeated_prompts_are_served_from_disk(tmp_path):
+    """Identical calls hit the cache, also after reopening it; parameters are part of the key."""
+    path = str(tmp_path / "llm.sqlite3")
+    inner = FakeLLM(model="fake-model", temperature=0.2)
+    llm = CachedLLM(inner, LLMResponseCache(path))
+
+    assert llm.call("classify call 1") == "answer to classify call 1"
+    assert llm.call("classify call 1") == "answer to classify call 1"
+    assert inner.calls == 1
+
+    reopened = CachedLLM(inner, LLMResponseCache(path))
+    assert reopened.call([{"role": "user", "content": "classify call 1"}]) == "answer to classify call 1"
+    assert inner.calls == 1
+
+    assert CachedLLM(inner, LLMResponseCache(path), temperature=0.9).call("classify call 1")
+    assert inner.calls == 2
+
+
+def test_ttl_and_size_eviction(monkeypatch):
+    """Entries expire after the TTL; the least recently used go first past max_entries."""
+    clock = [1000.0]
+    monkeypatch.setattr("src.llm_cache.time.time", lambda: clock[0])
+    cache = LLMResponseCache(":memory:", ttl_seconds=60, max_entries=2)
+
+    cache.put("a", "m", "A")
+    clock[0] += 1
+    cache.put("b", "m", "B")
+    clock[0] += 1
+    assert cache.get("a") == "A"  # "a" is now more recently used than "b"
+    clock[0] += 1
+    cache.put("c", "m", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+
+    clock[0] += 120
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 1
+    assert cache.purge_expired() == 1
+
+
+def test_replay_only_never_calls_the_model():
+    """Replay mode serves recorded responses and raises on anything else."""
+    cache = LLMResponseCache(":memory:")
+    inner = FakeLLM(model="fake-model")
+    CachedLLM(inner, cache).call("recorded prompt")
+
+    cache.replay_only = True
+    replay = CachedLLM(inner, cache)
+    assert replay.call("recorded prompt") == "answer to recorded prompt"
+    with pytest.raises(CacheMissError):
+        replay.call("new prompt")
+    assert inner.calls == 1
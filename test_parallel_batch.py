@@ -0,0 +1,31 @@
+"""Tests for the multi-core batch classification mode."""
+
+from data.sample_transcripts import SAMPLE_TRANSCRIPTS
+from tools.classification_tools import classify_transcript
+from tools.parallel_batch import iter_classify_parallel
+
+
+def test_parallel_results_keep_order_and_isolate_errors():
+    """Results come back in input order and a bad call only fails itself."""
+    transcripts = [sample["transcript"] for sample in SAMPLE_TRANSCRIPTS] * 5
+    transcripts[3] = None
+
+    results = list(iter_classify_parallel(iter(transcripts), workers=2, chunk_size=4))
+
+    assert len(results) == len(transcripts)
+    assert results[3]["status"] == "error"
+    for transcript, result in zip(transcripts, results):
+        if transcript is not None:
+            assert result == {"status": "success", **classify_transcript(transcript)}
+
+
+def test_parallel_and_sequential_batches_return_the_same_shape(capsys):
+    """The parallel batch mode renders the same per-call report as the sequential one."""
+    from classify_direct import batch_classify_calls_direct
+
+    transcripts = [sample["transcript"] for sample in SAMPLE_TRANSCRIPTS[:3]]
+
+    sequential = batch_classify_calls_direct(transcripts, workers=1)
+    parallel = batch_classify_calls_direct(transcripts, workers=2, chunk_size=1)
+
+    assert parallel == sequential
@@ -0,0 +1,80 @@
+"""Tests for background crew runs with streamed stage outputs."""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from src.crew import CrewPool
+from src.progressive import ProgressiveCrewRun
+from src.stage_scheduler import Stage, StagedCrew
+
+
+def _staged_pool(gate: threading.Event) -> CrewPool:
+    def slow_qa(inputs):
+        gate.wait(5)
+        return "qa output"
+
+    stages = [
+        Stage("analysis", "analysis_result", lambda inputs: "analysis output"),
+        Stage("classification", "classification_result", lambda inputs: "billing"),
+        Stage("qa", "qa_result", slow_qa, ("analysis", "classification")),
+        Stage("action_plan", "action_plan_result", lambda inputs: "plan", ("qa",))
+    ]
+    return CrewPool(lambda: StagedCrew(stages, []))
+
+
+def _wait_for(run, stages):
+    deadline = time.monotonic() + 5
+    while len(run.snapshot()["stages"]) < stages and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_stage_outputs_are_visible_before_the_run_ends():
+    """Finished stages show up in the snapshot while later stages still run."""
+    gate = threading.Event()
+    run = ProgressiveCrewRun("Customer: my bill is wrong", pool=_staged_pool(gate)).start()
+
+    _wait_for(run, 2)
+    snapshot = run.snapshot()
+    assert snapshot["status"] == "running"
+    assert {stage["name"] for stage in snapshot["stages"]} == {"analysis", "classification"}
+
+    gate.set()
+    run.join(5)
+    assert run.snapshot()["status"] == "done"
+    assert [stage["name"] for stage in run.snapshot()["stages"]][-1] == "action_plan"
+
+
+def test_cancel_stops_before_the_next_stage():
+    """A cancelled run lets the running stage finish but starts nothing after it."""
+    gate = threading.Event()
+    pool = _staged_pool(gate)
+    run = ProgressiveCrewRun("Customer: my bill is wrong", pool=pool).start()
+
+    _wait_for(run, 2)
+    run.cancel()
+    gate.set()
+    run.join(5)
+
+    snapshot = run.snapshot()
+    assert snapshot["status"] == "cancelled"
+    assert "action_plan" not in {stage["name"] for stage in snapshot["stages"]}
+    with pool.acquire(timeout=1):
+        pass
+
+
+def test_bad_token_budget_ends_the_run_with_an_error(monkeypatch):
+    """Setup failures before the crew starts still finish the run, so pollers stop."""
+    monkeypatch.setenv("TRANSCRIPT_TOKEN_BUDGET", "lots")
+    gate = threading.Event()
+    gate.set()
+    run = ProgressiveCrewRun("Customer: my bill is wrong", pool=_staged_pool(gate)).start()
+
+    run.join(5)
+
+    snapshot = run.snapshot()
+    assert snapshot["status"] == "error"
+    assert "lots" in snapshot["error"]
@@ -0,0 +1,124 @@
+"""Tests for rate limiting, 429 backoff and the concurrent crew batch runner."""
+
+import threading
+import time
+
+import pytest
+
+from src.rate_limit import RateLimiter, TokenBucket, call_with_backoff, is_rate_limit_error, retry_after_seconds
+
+
+class RateLimitError(Exception):
+    """Looks like the error an OpenAI-compatible client raises on HTTP 429."""
+
+    status_code = 429
+
+    def __init__(self, message="429 Too Many Requests", retry_after=None):
+        super().__init__(message)
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = type("Response", (), {"headers": headers})()
+
+
+def test_token_bucket_paces_after_the_burst():
+    """A full bucket allows a burst, then callers wait for the refill."""
+    bucket = TokenBucket(per_minute=1200, capacity=2)  # 20 per second
+
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() > 0.0
+
+    started = time.monotonic()
+    bucket.acquire()
+    assert 0.02 <= time.monotonic() - started < 0.5
+
+
+def test_backoff_retries_rate_limits_only():
+    """429s are retried until success; other errors propagate at once."""
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError("Error code: 429 - rate limit reached")
+        return "ok"
+
+    assert call_with_backoff(flaky, RateLimiter(), base_delay=0.01) == "ok"
+    assert len(attempts) == 3
+
+    with pytest.raises(ValueError):
+        call_with_backoff(lambda: (_ for _ in ()).throw(ValueError("bad input")), base_delay=0.01)
+    with pytest.raises(RateLimitError):
+        call_with_backoff(lambda: (_ for _ in ()).throw(RateLimitError()), max_retries=1, base_delay=0.01)
+
+    assert is_rate_limit_error(RateLimitError())
+    assert not is_rate_limit_error(ValueError("nope"))
+
+
+def test_rate_limits_are_recognized_by_type_or_status():
+    """A 429 is found by exception type or status code, also behind a wrapping error, never by message."""
+    openai = pytest.importorskip("openai")
+    import httpx
+
+    response = httpx.Response(429, headers={"retry-after": "3"}, request=httpx.Request("POST", "http://llm/v1"))
+    client_error = openai.RateLimitError("Too Many Requests", response=response, body=None)
+    try:
+        try:
+            raise client_error
+        except openai.RateLimitError as e:
+            raise ValueError("LLM call failed") from e
+    except ValueError as wrapped:
+        assert is_rate_limit_error(wrapped)
+        assert retry_after_seconds(wrapped) == 3.0
+
+    assert not is_rate_limit_error(ValueError("order 429 was not found"))
+    assert not is_rate_limit_error(RuntimeError("rate limit of the plan exceeded"))
+
+
+def test_concurrent_batch_keeps_order_and_caps_concurrency(monkeypatch, capsys):
+    """Results come back in input order with at most max_concurrency crews running; a 429 retries only its stage."""
+    pytest.importorskip("crewai")
+    import main
+    from src.crew import CrewPool
+    from src.stage_scheduler import Stage, StagedCrew
+
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0, "throttled": set(), "analyses": []}
+
+    def analysis(inputs):
+        with lock:
+            state["analyses"].append(inputs["call_transcript"])
+        return "analysis"
+
+    def classification(inputs):
+        transcript = inputs["call_transcript"]
+        with lock:
+            # The first attempt of every tenth call is rejected with a 429
+            if transcript.endswith("0") and transcript not in state["throttled"]:
+                state["throttled"].add(transcript)
+                raise RateLimitError(retry_after=0.01)
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+        return f"verdict for {transcript}"
+
+    def fake_crew():
+        return StagedCrew([
+            Stage("analysis", "analysis_result", analysis),
+            Stage("classification", "classification_result", classification, ("analysis",))
+        ], ["analysis", "classification"])
+
+    pool = CrewPool(fake_crew, max_size=4)
+    monkeypatch.setattr(main, "get_crew_pool", lambda quick_mode=False, max_size=1: pool)
+    transcripts = [f"Customer: call number {i}" for i in range(12)]
+
+    results = main.concurrent_batch_classify_calls(transcripts, quick_mode=True, max_concurrency=4,
+                                                   requests_per_minute=60000)
+
+    assert [r["call_number"] for r in results] == list(range(1, 13))
+    assert [r["result"]["result"] for r in results] == [f"verdict for {t}" for t in transcripts]
+    assert state["peak"] <= 4
+    assert state["throttled"]
+    # Stages that finished before a 429 are not run (and billed) again
+    assert sorted(state["analyses"]) == sorted(transcripts)
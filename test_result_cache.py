@@ -0,0 +1,36 @@
+"""Tests for the content-addressed classification result cache."""
+
+from tools.classification_tools import classify_transcript
+from tools.result_cache import ResultCache, cache_key, classify_transcript_cached
+
+
+def test_key_ignores_case_and_padding_but_not_ruleset():
+    """Equivalent transcripts share a key; a new ruleset version does not."""
+    assert cache_key("  Customer: My BILL is wrong\n") == cache_key("customer: my bill is wrong")
+    assert cache_key("my bill is wrong", "1.0") != cache_key("my bill is wrong", "2.0")
+    assert cache_key("my bill is wrong") != cache_key("my bill is right")
+
+
+def test_lru_eviction_and_stats():
+    """The memory tier is bounded and hits/misses are counted."""
+    cache = ResultCache(max_entries=2)
+    for transcript in ["billing call", "refund call", "billing call", "fraud call", "refund call"]:
+        assert classify_transcript_cached(transcript, cache) == classify_transcript(transcript)
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+    assert stats["memory_entries"] == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Results written to SQLite are served by a new cache instance."""
+    db_path = str(tmp_path / "cache.sqlite3")
+    first = ResultCache(db_path=db_path)
+    result = classify_transcript_cached("I was charged twice, refund me", first)
+    first.close()
+
+    second = ResultCache(db_path=db_path)
+    assert classify_transcript_cached("I was charged twice, refund me", second) == result
+    assert second.stats()["disk_hits"] == 1
+    second.close()
@@ -0,0 +1,58 @@
+"""Tests for the time-bucketed rollups of the call history."""
+
+import sqlite3
+
+from data.sample_transcripts import SAMPLE_TRANSCRIPTS
+from tools.classification_tools import classify_transcript
+from tools.history_store import CallHistoryStore
+from tools.rollups import bucket_start
+
+START = bucket_start(1_700_000_000, "day")
+
+
+def _fill(store):
+    """Add the sample calls spread over three days, every 17 minutes."""
+    results = [(sample["transcript"], classify_transcript(sample["transcript"])) for sample in SAMPLE_TRANSCRIPTS]
+    for i in range(3 * 24 * 60 // 17):
+        transcript, result = results[i % len(results)]
+        store.add(transcript, result, created_at=START + i * 17 * 60 + 5)
+
+
+def test_rollups_match_a_scan_of_the_calls():
+    """Summing the buckets gives the same totals as aggregating every call."""
+    store = CallHistoryStore(":memory:")
+    _fill(store)
+
+    for granularity in ("minute", "hour", "day"):
+        assert store.rollup_summary(granularity) == store.summary()
+    since = START + 86400
+    assert store.rollup_summary("hour", since) == store.summary(since=since)
+    assert store.rollup_summary("day", since, since + 86400) == store.summary(since=since, until=since + 86400)
+
+
+def test_series_has_one_point_per_bucket_with_calls():
+    """Hourly points are bucket-aligned and add up to the calls in range."""
+    store = CallHistoryStore(":memory:")
+    _fill(store)
+
+    series = store.rollup_series("hour", "category")
+    points = [point for values in series.values() for point in values]
+    assert all(bucket % 3600 == 0 for bucket, _ in points)
+    assert sum(calls for _, calls in points) == store.count()
+    assert sum(calls for values in store.rollup_series("day", "sentiment").values() for _, calls in values) == store.count()
+
+
+def test_existing_history_is_backfilled(tmp_path):
+    """A history recorded before rollups existed gets them on open."""
+    path = str(tmp_path / "history.sqlite3")
+    store = CallHistoryStore(path)
+    _fill(store)
+    expected = store.summary()
+    store.close()
+
+    db = sqlite3.connect(path)
+    db.execute("DELETE FROM rollups")
+    db.commit()
+    db.close()
+
+    assert CallHistoryStore(path).rollup_summary("minute") == expected
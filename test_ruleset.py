@@ -0,0 +1,75 @@
+"""Tests for the externalized, hot-reloadable keyword ruleset."""
+
+import json
+import os
+
+import pytest
+
+from tools import ruleset as rules
+from tools.classification_tools import classify_call_category
+from tools.result_cache import cache_key
+
+
+@pytest.fixture
+def ruleset_file(tmp_path):
+    """A writable copy of the bundled ruleset, made active for the test."""
+    with open(rules.DEFAULT_RULESET_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(data))
+    rules.use_ruleset_file(str(path))
+    yield path, data
+    rules.use_ruleset_file(None)
+
+
+def _rewrite(path, data):
+    """Write new ruleset data and make sure the file signature changes."""
+    path.write_text(json.dumps(data))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_changed_file_is_swapped_in(ruleset_file):
+    """Editing the file changes results and their recorded version after a reload."""
+    path, data = ruleset_file
+    transcript = "Customer: my router keeps rebooting"
+    before = classify_call_category(transcript)
+    assert before["ruleset_version"] == data["version"]
+
+    data["version"] = "test-2"
+    data["category_keywords"]["technical_support"].append("Router")
+    _rewrite(path, data)
+    key_before = cache_key(transcript)
+    rules.reload_ruleset()
+
+    after = classify_call_category(transcript)
+    assert after["ruleset_version"] == "test-2"
+    assert after["primary_category"] == "technical_support"
+    assert cache_key(transcript) != key_before
+
+
+def test_edit_without_version_bump_changes_cache_key(ruleset_file):
+    """The cache key follows the rules themselves, not only the hand-kept version."""
+    path, data = ruleset_file
+    transcript = "Customer: my router keeps rebooting"
+    key_before = cache_key(transcript)
+
+    data["category_keywords"]["technical_support"].append("Router")
+    _rewrite(path, data)
+    rules.reload_ruleset()
+
+    assert rules.get_ruleset().version == data["version"]
+    assert cache_key(transcript) != key_before
+
+
+def test_invalid_file_keeps_previous_ruleset(ruleset_file):
+    """A broken edit is rejected and the last good ruleset stays active."""
+    path, data = ruleset_file
+    active = rules.get_ruleset()
+
+    del data["categories"]["fraud"]
+    _rewrite(path, data)
+
+    assert rules.reload_ruleset() is active
+    with pytest.raises(rules.RulesetError):
+        rules.load_ruleset(str(path))
@@ -0,0 +1,105 @@
+"""Tests for dependency-aware scheduling of crew stages."""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from src.stage_scheduler import Stage, StageScheduler
+
+
+def _sleeping_stage(name, output_key, seconds, depends_on=(), seen=None):
+    def run(inputs):
+        if seen is not None:
+            seen[name] = dict(inputs)
+        time.sleep(seconds)
+        return f"{name} output"
+    return Stage(name, output_key, run, depends_on)
+
+
+def _call_stages(seen=None):
+    return [
+        _sleeping_stage("analysis", "analysis_result", 0.2, seen=seen),
+        _sleeping_stage("classification", "classification_result", 0.2, seen=seen),
+        _sleeping_stage("qa", "qa_result", 0.1, ("analysis", "classification"), seen),
+        _sleeping_stage("action_plan", "action_plan_result", 0.1, ("analysis", "classification", "qa"), seen)
+    ]
+
+
+def test_independent_stages_run_in_parallel():
+    """Analysis and classification are both running before either finishes."""
+    both_running = threading.Barrier(2, timeout=5)
+
+    def meet(name, output_key):
+        def run(inputs):
+            both_running.wait()
+            return f"{name} output"
+        return Stage(name, output_key, run)
+
+    stages = [meet("analysis", "analysis_result"), meet("classification", "classification_result")]
+    stages += _call_stages()[2:]
+    run = StageScheduler(stages).run({"call_transcript": "hello"})
+
+    assert str(run) == "action_plan output"
+    assert not both_running.broken
+
+
+def test_critical_path_follows_the_longest_dependency_chain():
+    """The critical path sums stage times along the slowest chain, not over every stage."""
+    scheduler = StageScheduler(_call_stages())
+    seconds = {"analysis": 0.3, "classification": 0.2, "qa": 0.1, "action_plan": 0.1}
+
+    assert scheduler.critical_path(seconds) == pytest.approx(0.5)
+
+
+def test_downstream_stages_receive_upstream_outputs():
+    """Stages see the shared inputs plus the outputs of their dependencies."""
+    seen = {}
+    completed = []
+
+    StageScheduler(_call_stages(seen)).run({"call_transcript": "hello"},
+                                           lambda name, output: completed.append(name))
+
+    assert seen["classification"] == {"call_transcript": "hello"}
+    assert seen["qa"]["analysis_result"] == "analysis output"
+    assert seen["action_plan"]["qa_result"] == "qa output"
+    assert completed[-2:] == ["qa", "action_plan"]
+
+
+def test_stage_failure_is_raised_and_stops_dependents():
+    """A failing stage surfaces from run() and its dependents never start."""
+    ran = threading.Event()
+
+    def fail(inputs):
+        raise RuntimeError("boom")
+
+    stages = [Stage("analysis", "analysis_result", fail),
+              Stage("qa", "qa_result", lambda inputs: ran.set() or "", ("analysis",))]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        StageScheduler(stages).run({})
+    assert not ran.is_set()
+
+
+def test_invalid_graphs_are_rejected():
+    """Unknown dependencies and cycles fail at construction."""
+    with pytest.raises(ValueError):
+        StageScheduler([Stage("qa", "qa_result", str, ("analysis",))])
+    with pytest.raises(ValueError):
+        StageScheduler([Stage("a", "a", str, ("b",)), Stage("b", "b", str, ("a",))])
+
+
+def test_thread_aware_lock_excludes_crewais_default_lock():
+    """The thread-aware backend takes the same file as crewai's default one."""
+    lock_store = pytest.importorskip("crewai_core.lock_store")
+    from portalocker.exceptions import LockException
+    from src.stage_scheduler import _thread_then_file_lock
+
+    with _thread_then_file_lock("call-analysis-test-store", timeout=5):
+        with pytest.raises(LockException):
+            with lock_store.lock("call-analysis-test-store", timeout=0.2):
+                pass
+    with lock_store.lock("call-analysis-test-store", timeout=5):
+        pass
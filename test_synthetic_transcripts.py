@@ -0,0 +1,54 @@
+"""Tests for the synthetic transcript generator."""
+
+from collections import Counter
+
+import pytest
+
+from data.synthetic_transcripts import SyntheticConfig, TranscriptGenerator, generate_transcripts
+from tools.classification_tools import classify_call_category
+
+
+def test_seeded_and_prefix_stable():
+    """The same seed gives the same corpus, and a prefix of a larger corpus."""
+    config = SyntheticConfig(seed=3, noise=0.2, duplicate_rate=0.1)
+
+    first = list(generate_transcripts(50, config))
+    assert first == list(generate_transcripts(50, config))
+    assert first[:20] == list(generate_transcripts(20, config))
+    assert list(generate_transcripts(10, config, start=40)) == first[40:]
+    assert first != list(generate_transcripts(50, SyntheticConfig(seed=4)))
+
+
+def test_category_mix_and_labels():
+    """Only weighted categories appear, and clean calls mostly classify as labeled."""
+    records = list(generate_transcripts(300, SyntheticConfig(category_mix={"billing": 3, "technical_support": 1})))
+    counts = Counter(record["category"] for record in records)
+
+    assert set(counts) == {"billing", "technical_support"}
+    assert counts["billing"] > counts["technical_support"]
+    correct = sum(classify_call_category(r["transcript"])["primary_category"] == r["category"] for r in records)
+    assert correct / len(records) > 0.7
+
+
+def test_duplicates_repeat_earlier_calls():
+    """Duplicates carry the transcript and label of the call they repeat."""
+    generator = TranscriptGenerator(SyntheticConfig(duplicate_rate=0.5))
+    records = [generator.generate(i) for i in range(100)]
+    duplicates = [record for record in records if "duplicate_of" in record]
+
+    assert 20 < len(duplicates) < 80
+    for record in duplicates:
+        original = records[record["duplicate_of"]]
+        assert record["duplicate_of"] < record["id"]
+        assert "duplicate_of" not in original
+        assert (record["transcript"], record["category"]) == (original["transcript"], original["category"])
+
+
+def test_length_bounds_and_unknown_category():
+    """Turn counts stay within bounds; unknown categories are rejected."""
+    config = SyntheticConfig(min_turns=3, max_turns=5, median_turns=40)
+    for record in generate_transcripts(30, config):
+        assert record["transcript"].count("\n") + 1 == 5
+
+    with pytest.raises(ValueError):
+        TranscriptGenerator(SyntheticConfig(category_mix={"weather": 1}))
@@ -0,0 +1,85 @@
+"""Tests for crew run and task tracing."""
+
+import datetime
+import json
+from types import SimpleNamespace
+
+from src.tracing import Tracer, estimate_cost, snapshot_tasks
+
+
+class FakeUsage:
+    def __init__(self, prompt, completion):
+        self.values = {"prompt_tokens": prompt, "completion_tokens": completion, "successful_requests": 1}
+
+    def model_dump(self):
+        return dict(self.values)
+
+
+class FakeLLM:
+    model = "gpt-4.1-mini"
+
+    def __init__(self):
+        self.prompt = self.completion = 0
+        self.cache_hits = 0
+
+    def get_token_usage_summary(self):
+        return FakeUsage(self.prompt, self.completion)
+
+
+def _task(role):
+    return SimpleNamespace(name=None, start_time=None, end_time=None,
+                           agent=SimpleNamespace(role=role, llm=FakeLLM()))
+
+
+def _run_task(task, prompt, completion, seconds=0.25):
+    task.start_time = datetime.datetime.now()
+    task.end_time = task.start_time + datetime.timedelta(seconds=seconds)
+    task.agent.llm.prompt += prompt
+    task.agent.llm.completion += completion
+
+
+def test_task_spans_record_token_growth_and_roll_up(tmp_path):
+    """Each task reports the tokens its agent used in this run; the run span sums them."""
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer(str(path))
+    crew = SimpleNamespace(tasks=[_task("Analyst"), _task("Classifier")])
+    _run_task(crew.tasks[0], 1000, 100)
+
+    with tracer.run("full_crew") as span:
+        before = snapshot_tasks(crew)
+        _run_task(crew.tasks[0], 400, 40)
+        _run_task(crew.tasks[1], 600, 60)
+        crew.tasks[1].agent.llm.cache_hits += 1
+        span.add("retries")
+        tracer.record_tasks(span, crew, before)
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    analyst = next(s for s in spans if s["name"] == "Analyst")
+    run = next(s for s in spans if s["kind"] == "run")
+    assert analyst["parent_id"] == run["span_id"]
+    assert analyst["attributes"]["prompt_tokens"] == 400
+    assert analyst["duration_ms"] == 250.0
+    assert run["attributes"]["prompt_tokens"] == 1000
+    assert run["attributes"]["cache_hits"] == 1
+    assert run["attributes"]["retries"] == 1
+    assert run["attributes"]["cost_usd"] == round(estimate_cost("gpt-4.1-mini", 1000, 100), 6)
+
+
+def test_tasks_that_did_not_run_get_no_span():
+    """Only tasks started during the run are recorded; failed runs are marked as errors."""
+    tracer = Tracer()
+    crew = SimpleNamespace(tasks=[_task("Analyst"), _task("Classifier")])
+
+    try:
+        with tracer.run("quick_crew") as span:
+            before = snapshot_tasks(crew)
+            _run_task(crew.tasks[0], 10, 1)
+            tracer.record_tasks(span, crew, before)
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    rows = {(row["kind"], row["name"]): row for row in tracer.summary()}
+    assert ("task", "Classifier") not in rows
+    assert rows[("run", "quick_crew")]["errors"] == 1
+    assert rows[("task", "Analyst")]["mean_prompt_tokens"] == 10
@@ -0,0 +1,40 @@
+"""Tests for streaming transcript input and result output."""
+
+import io
+import json
+
+from tools.transcript_io import ResultWriter, iter_transcripts, read_csv, read_delimited_text, read_jsonl
+
+
+def test_readers_yield_records():
+    """Each input format yields {"id", "transcript"} records lazily."""
+    jsonl = io.StringIO('{"id": "a", "transcript": "bill"}\n"refund please"\nnot json\n\n{"text": "fraud"}\n')
+    assert list(read_jsonl(jsonl, "f")) == [
+        {"id": "a", "transcript": "bill"},
+        {"id": "f:2", "transcript": "refund please"},
+        {"id": "f:5", "transcript": "fraud"}
+    ]
+
+    rows = io.StringIO('call_id,transcript\n7,"Customer: hi,\nthere"\n,\n')
+    assert list(read_csv(rows, "c")) == [{"id": "7", "transcript": "Customer: hi,\nthere"}]
+
+    text = io.StringIO("Customer: my plan -- and a --- inside\n---\n\n---\nAgent: second call\n")
+    assert [record["transcript"] for record in read_delimited_text(text)] == [
+        "Customer: my plan -- and a --- inside",
+        "Agent: second call"
+    ]
+
+
+def test_directory_input_and_writers(tmp_path):
+    """Directories are read per file by extension and results stream out as written."""
+    (tmp_path / "b.jsonl").write_text('{"id": 2, "transcript": "second"}\n')
+    (tmp_path / "a.txt").write_text("first\n---\nthird\n")
+    assert [record["transcript"] for record in iter_transcripts(str(tmp_path))] == ["first", "third", "second"]
+
+    output = io.StringIO()
+    ResultWriter(output, "jsonl").write("x", {"status": "error", "error": "boom"})
+    assert json.loads(output.getvalue()) == {"id": "x", "status": "error", "error": "boom"}
+
+    output = io.StringIO()
+    ResultWriter(output, "csv").write("x", {"status": "error", "error": "boom"})
+    assert output.getvalue().splitlines()[1].startswith("x,error,")
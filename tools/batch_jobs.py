@@ -0,0 +1,283 @@
+"""Background batch jobs for uploaded transcript files.
+
+An upload (CSV, JSONL, delimited text or a ZIP of any of these) becomes a
+job that is classified on the multi-core batch engine in a background
+thread. Jobs belong to a process-wide manager rather than to a script run,
+so a Streamlit session can rerun, switch tabs or reconnect while its jobs
+keep going, and poll snapshot() for progress.
+"""
+
+import csv
+import io
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, IO, Iterator, List, Optional
+
+from .parallel_batch import DEFAULT_CHUNK_SIZE, ThroughputMeter, iter_classify_parallel, resolve_workers
+from .service_client import ClassificationClient, ServiceError, get_service_client, iter_classify_remote
+from .transcript_io import RESULT_CSV_FIELDS, detect_format, flatten_result, read_stream
+
+UPLOAD_TYPES = ("csv", "jsonl", "ndjson", "txt", "zip")
+
+# Finished jobs kept for display; older ones are dropped when new jobs arrive
+DEFAULT_JOB_HISTORY = 20
+
+
+def _text_stream(binary: IO[bytes], input_format: str) -> IO[str]:
+    """Decode a binary upload the way transcript_io opens files."""
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="" if input_format == "csv" else None)
+
+
+def iter_upload(name: str, data: bytes) -> Iterator[Dict]:
+    """
+    Stream transcript records from an uploaded file.
+
+    Args:
+        name: File name; its extension selects the format
+        data: File contents; a ZIP is read member by member, in name order
+
+    Yields:
+        {"id": str, "transcript": str} records
+    """
+    if os.path.splitext(name)[1].lower() != ".zip":
+        input_format = detect_format(name)
+        yield from read_stream(_text_stream(io.BytesIO(data), input_format), input_format, name)
+        return
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for member in sorted(archive.infolist(), key=lambda info: info.filename):
+            basename = os.path.basename(member.filename)
+            if member.is_dir() or not basename or basename.startswith(".") or member.filename.startswith("__MACOSX/"):
+                continue
+            input_format = detect_format(member.filename)
+            with archive.open(member) as binary:
+                yield from read_stream(_text_stream(binary, input_format), input_format, member.filename)
+
+
+def _mp_context():
+    """Worker processes are started from a server thread; avoid forking it where possible."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+
+def _reachable(client: ClassificationClient) -> bool:
+    """Whether the classification service answers its health check."""
+    try:
+        client.health()
+        return True
+    except (ServiceError, OSError, ValueError):
+        return False
+
+
+class BatchJob:
+    """
+    One uploaded file being classified.
+
+    Statuses go queued -> running -> done, or end in cancelled or error.
+    Results are kept as flattened rows (see transcript_io.flatten_result).
+    """
+
+    def __init__(self, name: str, data: bytes):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.data = data
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.total: Optional[int] = None
+        self.rows: List[Dict] = []
+        self.created = time.time()
+        self._categories: Counter = Counter()
+        self._sentiments: Counter = Counter()
+        self._meter: Optional[ThroughputMeter] = None
+        self._summary: Optional[Dict] = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def cancel(self) -> None:
+        """Stop the job; calls already handed to workers are finished first."""
+        self._cancel.set()
+        with self._lock:
+            if self.status == "queued":
+                self.status = "cancelled"
+            elif self.status == "running":
+                self.status = "cancelling"
+
+    @property
+    def done(self) -> bool:
+        """True once the job has finished, failed or been cancelled."""
+        return self.status in ("done", "error", "cancelled")
+
+    def run(self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+            client: Optional[ClassificationClient] = None) -> None:
+        """
+        Classify every record of the upload; called on a manager thread.
+
+        With a service client the calls are sent to the classification
+        service in batches, unless it cannot be reached when the job starts.
+        """
+        with self._lock:
+            if self._cancel.is_set():
+                self.data = b""
+                return
+            self.status = "running"
+        try:
+            # Parsing is far cheaper than classifying, so count first for a real progress bar
+            self.total = sum(1 for _ in iter_upload(self.name, self.data))
+            self._meter = ThroughputMeter()
+            call_ids = deque()
+
+            def transcripts() -> Iterator[str]:
+                for record in iter_upload(self.name, self.data):
+                    if self._cancel.is_set():
+                        return
+                    call_ids.append(record["id"])
+                    yield record["transcript"]
+
+            if client is not None and not _reachable(client):
+                client = None
+            if client is not None:
+                results = iter_classify_remote(client, transcripts())
+            else:
+                results = iter_classify_parallel(transcripts(), workers, chunk_size,
+                                                 _mp_context() if resolve_workers(workers) > 1 else None)
+            for result in results:
+                row = flatten_result(call_ids.popleft(), result)
+                with self._lock:
+                    self._meter.record(result)
+                    self.rows.append(row)
+                    if result.get("status") == "success":
+                        self._categories[row["primary_category"]] += 1
+                        self._sentiments[row["sentiment"]] += 1
+            self._finish("cancelled" if self._cancel.is_set() else "done")
+        except Exception as e:
+            self._finish("error", str(e))
+        finally:
+            # The upload is not needed once classified
+            self.data = b""
+
+    def _finish(self, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.status = status
+            self.error = error
+            if self._meter is not None:
+                self._summary = self._meter.summary()
+
+    def snapshot(self) -> Dict:
+        """
+        Return the job's progress.
+
+        Returns:
+            Id, name, status, error, total and processed calls, errors,
+            elapsed seconds, calls per second and category/sentiment counts
+        """
+        with self._lock:
+            throughput = self._summary or (self._meter.summary() if self._meter is not None else {})
+            return {
+                "id": self.id,
+                "name": self.name,
+                "status": self.status,
+                "error": self.error,
+                "total": self.total,
+                "processed": len(self.rows),
+                "errors": throughput.get("errors", 0),
+                "elapsed": throughput.get("elapsed_seconds", 0.0),
+                "calls_per_second": throughput.get("calls_per_second", 0.0),
+                "categories": dict(self._categories.most_common()),
+                "sentiments": dict(self._sentiments.most_common())
+            }
+
+    def write_results(self, stream: IO[str], output_format: str = "csv") -> None:
+        """Write the rows classified so far as CSV or JSONL."""
+        with self._lock:
+            rows = list(self.rows)
+        if output_format == "csv":
+            writer = csv.DictWriter(stream, fieldnames=RESULT_CSV_FIELDS, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+        elif output_format == "jsonl":
+            stream.writelines(json.dumps(row) + "\n" for row in rows)
+        else:
+            raise ValueError(f"Unknown output format: {output_format}")
+
+
+class BatchJobManager:
+    """
+    Runs batch jobs in the background, max_jobs at a time.
+
+    Each job classifies its calls on its own process pool; further jobs
+    wait in submission order.
+    """
+
+    def __init__(self, max_jobs: int = 1, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, history: int = DEFAULT_JOB_HISTORY,
+                 client: Optional[ClassificationClient] = None):
+        """
+        Create a manager.
+
+        Args:
+            max_jobs: Jobs running at the same time
+            workers: Worker processes per job; None or 0 uses every core
+            chunk_size: Transcripts handed to a worker at a time
+            history: Finished jobs kept before the oldest are dropped
+            client: Classification service to send the calls to; None classifies in this process
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.history = history
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_jobs), thread_name_prefix="batch-job")
+        self._jobs: Dict[str, BatchJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, data: bytes) -> BatchJob:
+        """Queue an uploaded file for classification and return its job."""
+        job = BatchJob(name, data)
+        with self._lock:
+            finished = [job_id for job_id, other in self._jobs.items() if other.done]
+            for job_id in finished[:max(0, len(finished) - self.history + 1)]:
+                del self._jobs[job_id]
+            self._jobs[job.id] = job
+        self._executor.submit(job.run, self.workers, self.chunk_size, self.client)
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        """Return a job by id, or None if it is unknown or was dropped."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[BatchJob]:
+        """Return the known jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+
+
+_manager: Optional[BatchJobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> BatchJobManager:
+    """
+    Return the process-wide batch job manager.
+
+    Configured through BATCH_JOB_WORKERS (worker processes per job; 0, the
+    default, uses every core) and BATCH_MAX_JOBS (jobs run at once, default 1).
+    When CLASSIFICATION_SERVICE_URL is set, jobs send their calls to the
+    classification service instead.
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = BatchJobManager(
+                max_jobs=int(os.getenv("BATCH_MAX_JOBS", "1")),
+                workers=int(os.getenv("BATCH_JOB_WORKERS", "0")),
+                client=get_service_client()
+            )
+        return _manager
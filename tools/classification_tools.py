@@ -1,68 +1,108 @@
 """Tools for customer call classification and analysis."""
 
-from typing import Dict, List
+from typing import Dict, List, Mapping, Sequence, Union
+import csv
+import io
 import json
 
-# Define call categories for ABC Telecom
-CALL_CATEGORIES = {
-    "billing": "Billing, payments, invoices, and pricing inquiries",
-    "technical_support": "Network issues, connectivity problems, service troubleshooting",
-    "account_management": "Account changes, plan modifications, account information",
-    "customer_service": "General inquiries, complaints, escalations",
-    "retention": "Cancellation prevention, upgrade offers, loyalty programs",
-    "sales": "New service sales, plan upgrades, promotional offers",
-    "refund": "Refund requests, credits, compensation",
-    "fraud": "Fraud detection, security concerns, identity verification"
-}
+from .features import TranscriptFeatures, build_features
+from .ruleset import Ruleset, get_ruleset
 
+# Column order of the one-row CSV report
+REPORT_CSV_HEADER = ["Category", "Confidence", "Sentiment", "Urgency", "Duration"]
 
-def analyze_call_transcript(transcript: str) -> Dict:
+
+def __getattr__(name: str):
     """
-    Analyze a customer call transcript to extract key information.
+    Expose the active ruleset's categories and version as module attributes.
+    
+    The keyword tables live in the ruleset file (see tools/ruleset.py) and
+    can change at runtime, so these names always reflect the current rules.
+    """
+    if name == "CALL_CATEGORIES":
+        return dict(get_ruleset().categories)
+    if name == "RULESET_VERSION":
+        return get_ruleset().version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def scan_keywords(transcript: str) -> Dict[str, int]:
+    """
+    Find every known keyword in a transcript with a single pass.
     
     Args:
         transcript: The customer call transcript text
         
+    Returns:
+        Mapping of matched keyword to occurrence count (case-insensitive)
+    """
+    return get_ruleset().matcher.find_all(transcript.lower())
+
+
+def extract_features(transcript: Union[str, TranscriptFeatures], ruleset: Ruleset = None) -> TranscriptFeatures:
+    """
+    Run the feature-extraction stage for a transcript.
+    
+    Every public tool accepts either raw text or the features object returned
+    here, so callers that analyze the same call several times extract once.
+    The features keep a reference to the ruleset they were built with, so a
+    ruleset swapped in mid-call never mixes old hits with new tables.
+    
+    Args:
+        transcript: Raw transcript text, or features that were already extracted
+        ruleset: Ruleset to use; defaults to the active one
+        
+    Returns:
+        Immutable features (normalized text, word count, keyword hits, turns)
+    """
+    if isinstance(transcript, TranscriptFeatures):
+        return transcript
+    return build_features(transcript, ruleset or get_ruleset())
+
+
+def _select(table: Mapping[str, Sequence[str]], features: TranscriptFeatures) -> List[str]:
+    """Return the table labels that have at least one keyword hit, in table order."""
+    return [label for label, keywords in table.items() if features.has_any(keywords)]
+
+
+def analyze_call_transcript(transcript: Union[str, TranscriptFeatures]) -> Dict:
+    """
+    Analyze a customer call transcript to extract key information.
+    
+    Args:
+        transcript: The customer call transcript text or its extracted features
+        
     Returns:
         Dictionary containing analysis results
     """
+    features = extract_features(transcript)
     analysis = {
-        "sentiment": detect_sentiment(transcript),
-        "duration_estimate": estimate_duration(transcript),
-        "key_topics": extract_topics(transcript),
-        "urgency_level": assess_urgency(transcript)
+        "sentiment": detect_sentiment(features),
+        "duration_estimate": estimate_duration(features),
+        "word_count": features.word_count,
+        "key_topics": extract_topics(features),
+        "urgency_level": assess_urgency(features)
     }
     return analysis
 
 
-def classify_call_category(transcript: str, analysis: Dict = None) -> Dict:
+def classify_call_category(transcript: Union[str, TranscriptFeatures], analysis: Dict = None) -> Dict:
     """
     Classify a customer call into one of the predefined categories.
     
     Args:
-        transcript: The customer call transcript
+        transcript: The customer call transcript or its extracted features
         analysis: Optional analysis results
         
     Returns:
         Classification result with category and confidence
     """
-    keywords = {
-        "billing": ["bill", "payment", "invoice", "charge", "cost", "price", "amount", "balance"],
-        "technical_support": ["connection", "network", "wifi", "signal", "not working", "issue", "problem", "error"],
-        "account_management": ["account", "plan", "change", "update", "modify", "information"],
-        "customer_service": ["complaint", "issue", "help", "support", "problem", "service"],
-        "retention": ["cancel", "leave", "switch", "competitor", "deal", "offer"],
-        "sales": ["upgrade", "new", "package", "plan", "buy", "purchase", "offer"],
-        "refund": ["refund", "credit", "compensation", "return", "money back"],
-        "fraud": ["fraud", "security", "unauthorized", "suspicious", "identity", "verification"]
-    }
-    
-    transcript_lower = transcript.lower()
+    features = extract_features(transcript)
+    ruleset = features.ruleset
     category_scores = {}
     
-    for category, keywords_list in keywords.items():
-        score = sum(1 for keyword in keywords_list if keyword in transcript_lower)
-        category_scores[category] = score
+    for category, keywords_list in ruleset.category_keywords.items():
+        category_scores[category] = features.count_present(keywords_list)
     
     # Get category with highest score
     primary_category = max(category_scores, key=category_scores.get)
@@ -70,45 +110,88 @@ def classify_call_category(transcript: str, analysis: Dict = None) -> Dict:
     
     return {
         "primary_category": primary_category,
-        "category_description": CALL_CATEGORIES[primary_category],
+        "category_description": ruleset.categories[primary_category],
         "confidence_score": round(confidence, 2),
         "all_scores": category_scores,
-        "recommendation": f"This call should be routed to the {primary_category.replace('_', ' ').title()} department"
+        "recommendation": f"This call should be routed to the {primary_category.replace('_', ' ').title()} department",
+        "ruleset_version": ruleset.version
     }
 
 
-def extract_customer_info(transcript: str) -> Dict:
+def extract_customer_info(transcript: Union[str, TranscriptFeatures]) -> Dict:
     """
     Extract customer information from the transcript.
     
     Args:
-        transcript: The customer call transcript
+        transcript: The customer call transcript or its extracted features
         
     Returns:
         Extracted customer information
     """
+    features = extract_features(transcript)
     info = {
-        "mentioned_services": extract_services(transcript),
-        "issues_reported": extract_issues(transcript),
-        "requests": extract_requests(transcript),
-        "sentiment_markers": extract_sentiment_indicators(transcript)
+        "mentioned_services": extract_services(features),
+        "issues_reported": extract_issues(features),
+        "requests": extract_requests(features),
+        "sentiment_markers": extract_sentiment_indicators(features)
     }
     return info
 
 
-def generate_classification_report(transcript: str) -> str:
+def classify_transcript(transcript: Union[str, TranscriptFeatures]) -> Dict:
     """
-    Generate a comprehensive classification report for a customer call.
+    Run analysis, classification and extraction for one call.
     
     Args:
-        transcript: The customer call transcript
+        transcript: The customer call transcript or its extracted features
         
     Returns:
-        Formatted report string
+        Dictionary with "analysis", "classification" and "customer_info" results
+    """
+    features = extract_features(transcript)
+    analysis = analyze_call_transcript(features)
+    return {
+        "analysis": analysis,
+        "classification": classify_call_category(features, analysis),
+        "customer_info": extract_customer_info(features)
+    }
+
+
+def render_report(classification: Dict, analysis: Dict, customer_info: Dict, output_format: str = "text") -> str:
     """
-    analysis = analyze_call_transcript(transcript)
-    classification = classify_call_category(transcript, analysis)
-    customer_info = extract_customer_info(transcript)
+    Render already-computed results without re-running any analysis.
+    
+    Args:
+        classification: Result of classify_call_category
+        analysis: Result of analyze_call_transcript
+        customer_info: Result of extract_customer_info
+        output_format: One of "text", "json" or "csv"
+        
+    Returns:
+        Report in the requested format
+    """
+    if output_format == "json":
+        return json.dumps({
+            "classification": classification,
+            "analysis": analysis,
+            "customer_info": customer_info
+        }, indent=2)
+    
+    if output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(REPORT_CSV_HEADER)
+        writer.writerow([
+            classification['primary_category'],
+            classification['confidence_score'],
+            analysis['sentiment'],
+            analysis['urgency_level'],
+            analysis['duration_estimate']
+        ])
+        return buffer.getvalue()
+    
+    if output_format != "text":
+        raise ValueError(f"Unknown report format: {output_format}")
     
     report = f"""
 CUSTOMER CALL CLASSIFICATION REPORT
@@ -140,14 +223,27 @@ ACTION ITEMS:
     return report
 
 
-def detect_sentiment(transcript: str) -> str:
-    """Detect sentiment from transcript."""
-    transcript_lower = transcript.lower()
-    negative_words = ["angry", "frustrated", "unhappy", "disappointed", "problem", "issue", "not working"]
-    positive_words = ["happy", "satisfied", "grateful", "thanks", "appreciate", "working fine"]
+def generate_classification_report(transcript: Union[str, TranscriptFeatures]) -> str:
+    """
+    Generate a comprehensive classification report for a customer call.
     
-    negative_count = sum(1 for word in negative_words if word in transcript_lower)
-    positive_count = sum(1 for word in positive_words if word in transcript_lower)
+    Callers that already hold the analysis results should use render_report
+    instead, which formats them without recomputing.
+    
+    Args:
+        transcript: The customer call transcript or its extracted features
+        
+    Returns:
+        Formatted report string
+    """
+    return render_report(**classify_transcript(transcript))
+
+
+def detect_sentiment(transcript: Union[str, TranscriptFeatures]) -> str:
+    """Detect sentiment from transcript."""
+    features = extract_features(transcript)
+    negative_count = features.count_present(features.ruleset.negative_words)
+    positive_count = features.count_present(features.ruleset.positive_words)
     
     if negative_count > positive_count:
         return "Negative"
@@ -157,9 +253,12 @@ def detect_sentiment(transcript: str) -> str:
         return "Neutral"
 
 
-def estimate_duration(transcript: str) -> str:
+def estimate_duration(transcript: Union[str, TranscriptFeatures]) -> str:
     """Estimate call duration based on transcript length."""
-    word_count = len(transcript.split())
+    if isinstance(transcript, TranscriptFeatures):
+        word_count = transcript.word_count
+    else:
+        word_count = len(transcript.split())
     if word_count < 100:
         return "Short (< 5 minutes)"
     elif word_count < 300:
@@ -168,104 +267,46 @@ def estimate_duration(transcript: str) -> str:
         return "Long (> 15 minutes)"
 
 
-def extract_topics(transcript: str) -> List[str]:
+def extract_topics(transcript: Union[str, TranscriptFeatures]) -> List[str]:
     """Extract main topics from transcript."""
-    topics = []
-    topic_keywords = {
-        "billing": ["bill", "payment", "invoice", "charge"],
-        "network": ["network", "wifi", "signal", "connection"],
-        "plan": ["plan", "package", "service"],
-        "outage": ["down", "outage", "not working"]
-    }
-    
-    transcript_lower = transcript.lower()
-    for topic, keywords in topic_keywords.items():
-        if any(keyword in transcript_lower for keyword in keywords):
-            topics.append(topic)
-    
+    features = extract_features(transcript)
+    topics = _select(features.ruleset.topic_keywords, features)
     return topics if topics else ["general"]
 
 
-def assess_urgency(transcript: str) -> str:
+def assess_urgency(transcript: Union[str, TranscriptFeatures]) -> str:
     """Assess urgency level of the call."""
-    transcript_lower = transcript.lower()
-    urgent_keywords = ["urgent", "immediately", "asap", "emergency", "critical", "down"]
-    
-    if any(keyword in transcript_lower for keyword in urgent_keywords):
+    features = extract_features(transcript)
+    if features.has_any(features.ruleset.urgent_keywords):
         return "High"
-    elif any(word in transcript_lower for word in ["problem", "issue"]):
+    elif features.has_any(features.ruleset.medium_urgency_keywords):
         return "Medium"
     else:
         return "Low"
 
 
-def extract_services(transcript: str) -> List[str]:
+def extract_services(transcript: Union[str, TranscriptFeatures]) -> List[str]:
     """Extract mentioned services."""
-    services = []
-    service_keywords = {
-        "mobile": ["mobile", "phone", "cellular", "wireless"],
-        "internet": ["internet", "broadband", "wifi", "data"],
-        "tv": ["tv", "television", "cable", "streaming"],
-        "home": ["home", "residential", "fios"],
-        "business": ["business", "corporate", "enterprise"]
-    }
-    
-    transcript_lower = transcript.lower()
-    for service, keywords in service_keywords.items():
-        if any(keyword in transcript_lower for keyword in keywords):
-            services.append(service)
-    
-    return services
+    features = extract_features(transcript)
+    return _select(features.ruleset.service_keywords, features)
 
 
-def extract_issues(transcript: str) -> List[str]:
+def extract_issues(transcript: Union[str, TranscriptFeatures]) -> List[str]:
     """Extract reported issues."""
-    issues = []
-    issue_keywords = {
-        "connectivity": ["no signal", "no connection", "can't connect", "wifi down"],
-        "billing": ["wrong charge", "overcharge", "unexpected bill"],
-        "speed": ["slow", "buffering", "lag"],
-        "outage": ["service down", "outage", "not working"]
-    }
-    
-    transcript_lower = transcript.lower()
-    for issue, keywords in issue_keywords.items():
-        if any(keyword in transcript_lower for keyword in keywords):
-            issues.append(issue)
-    
-    return issues
+    features = extract_features(transcript)
+    return _select(features.ruleset.issue_keywords, features)
 
 
-def extract_requests(transcript: str) -> List[str]:
+def extract_requests(transcript: Union[str, TranscriptFeatures]) -> List[str]:
     """Extract customer requests."""
-    requests = []
-    request_keywords = {
-        "discount": ["discount", "reduce", "lower price"],
-        "upgrade": ["upgrade", "faster", "more data"],
-        "cancel": ["cancel", "stop service", "leave"],
-        "credit": ["credit", "refund", "compensation"],
-        "technician": ["technician", "repair", "fix it"]
-    }
-    
-    transcript_lower = transcript.lower()
-    for request, keywords in request_keywords.items():
-        if any(keyword in transcript_lower for keyword in keywords):
-            requests.append(request)
-    
-    return requests
+    features = extract_features(transcript)
+    return _select(features.ruleset.request_keywords, features)
 
 
-def extract_sentiment_indicators(transcript: str) -> List[str]:
+def extract_sentiment_indicators(transcript: Union[str, TranscriptFeatures]) -> List[str]:
     """Extract sentiment indicators from transcript."""
-    indicators = []
-    
-    if any(word in transcript.lower() for word in ["angry", "frustrated", "upset"]):
-        indicators.append("Customer showing frustration")
-    if any(word in transcript.lower() for word in ["thank", "appreciate", "thanks"]):
-        indicators.append("Customer expressing gratitude")
-    if any(word in transcript.lower() for word in ["urgent", "immediately", "asap"]):
-        indicators.append("Time-sensitive issue")
-    if any(word in transcript.lower() for word in ["first time", "repeat", "again"]):
-        indicators.append("Potential repeat issue")
-    
-    return indicators
+    features = extract_features(transcript)
+    return [
+        indicator for indicator, words in features.ruleset.sentiment_indicators
+        if features.has_any(words)
+    ]
@@ -0,0 +1,121 @@
+"""Token-budgeted condensation of transcripts before they are sent to an LLM."""
+
+import os
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from .classification_tools import extract_features
+from .ruleset import Ruleset
+
+GAP_MARKER = "[...]"
+
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of English text (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def token_budget_from_env() -> int:
+    """Read TRANSCRIPT_TOKEN_BUDGET; unset or 0 means transcripts are sent verbatim."""
+    return int(os.getenv("TRANSCRIPT_TOKEN_BUDGET") or 0)
+
+
+class CondensedTranscript(NamedTuple):
+    """A transcript reduced to fit a token budget."""
+
+    text: str
+    original_tokens: int
+    condensed_tokens: int
+    dropped_sentences: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated prompt tokens saved per use of the transcript."""
+        return self.original_tokens - self.condensed_tokens
+
+
+def _sentences(transcript: str, ruleset: Optional[Ruleset]) -> Tuple[List[Tuple[int, str, str, float]], int]:
+    """
+    Split a transcript into scored sentences.
+
+    Returns:
+        ((turn index, speaker, sentence, score) per sentence, number of sentences)
+    """
+    features = extract_features(transcript, ruleset)
+    ruleset = features.ruleset
+    category_keywords = {keyword for keywords in ruleset.category_keywords.values() for keyword in keywords}
+    first_customer_turn = next(
+        (i for i, turn in enumerate(features.turns) if turn.speaker.lower() == "customer"), None
+    )
+
+    scored = []
+    for turn_index, turn in enumerate(features.turns):
+        is_customer = turn.speaker.lower() == "customer"
+        for sentence in _SENTENCE_PATTERN.split(" ".join(turn.text.split())):
+            if not sentence:
+                continue
+            hits = ruleset.matcher.find_all(sentence.lower())
+            score = sum(3.0 if keyword in category_keywords else 1.0 for keyword in hits)
+            if is_customer:
+                # Customers state the reason for the call; their opening turn most of all
+                score += 2.0 if turn_index == first_customer_turn else 1.0
+            scored.append((turn_index, turn.speaker, sentence, score))
+    return scored, len(scored)
+
+
+def condense_transcript(transcript: str, token_budget: int,
+                        ruleset: Optional[Ruleset] = None) -> CondensedTranscript:
+    """
+    Reduce a transcript to the sentences most relevant for classification.
+
+    Sentences are ranked by the keywords they contain (category keywords
+    count most) and by whether the customer said them; the best ones that
+    fit the budget are kept in their original order, grouped by speaker
+    turn, with gap markers where sentences were dropped. Transcripts that
+    already fit are returned unchanged.
+
+    Args:
+        transcript: The customer call transcript
+        token_budget: Maximum estimated tokens of the result
+        ruleset: Ruleset whose keywords drive the ranking; defaults to the active ruleset
+
+    Returns:
+        The condensed transcript and its token accounting
+    """
+    original_tokens = estimate_tokens(transcript)
+    if original_tokens <= token_budget:
+        return CondensedTranscript(transcript, original_tokens, original_tokens)
+
+    sentences, total = _sentences(transcript, ruleset)
+    ranked = sorted(range(total), key=lambda i: (-sentences[i][3], i))
+    # Budget in characters, charging every sentence for a worst-case speaker
+    # prefix and gap marker and reserving the trailing marker, so the result
+    # is guaranteed to fit
+    char_budget = (token_budget - 1) * 4 - len(GAP_MARKER) - 1
+    kept = set()
+    used = 0
+    for i in ranked:
+        _, speaker, sentence, _ = sentences[i]
+        cost = len(sentence) + len(speaker) + len(GAP_MARKER) + 4
+        if used + cost <= char_budget:
+            kept.add(i)
+            used += cost
+
+    lines = []
+    previous = -1
+    for i in sorted(kept):
+        turn_index, speaker, sentence, _ = sentences[i]
+        if i != previous + 1:
+            lines.append(GAP_MARKER)
+        if lines and previous >= 0 and i == previous + 1 and sentences[previous][0] == turn_index:
+            lines[-1] += " " + sentence
+        else:
+            lines.append(f"{speaker}: {sentence}")
+        previous = i
+    if previous != total - 1:
+        lines.append(GAP_MARKER)
+
+    text = "\n".join(lines)
+    return CondensedTranscript(text, original_tokens, estimate_tokens(text), total - len(kept))
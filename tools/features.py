@@ -0,0 +1,106 @@
+"""Per-call feature extraction shared by every classification tool."""
+
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Tuple
+
+from .ruleset import Ruleset
+
+# "Customer: ..." / "Agent: ..." style speaker prefixes at the start of a line
+_TURN_PATTERN = re.compile(r"^[ \t]*([A-Za-z][A-Za-z ]{0,30}?)[ \t]*:", re.MULTILINE)
+
+
+class Turn(NamedTuple):
+    """One speaker turn of a transcript."""
+
+    speaker: str
+    text: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class TranscriptFeatures:
+    """
+    Everything the analyzers need from a transcript, computed once per call.
+
+    Attributes:
+        text: The original transcript text
+        normalized: Lower-cased transcript used for keyword matching
+        word_count: Number of whitespace-separated tokens
+        keyword_hits: Read-only mapping of matched keyword to occurrence count
+        ruleset: Ruleset whose matcher produced ``keyword_hits``
+        turns: Speaker turns with character offsets into ``text``, split on
+            first use (only transcript condensation needs them)
+    """
+
+    text: str
+    normalized: str
+    word_count: int
+    keyword_hits: Mapping[str, int]
+    ruleset: Ruleset
+
+    @cached_property
+    def turns(self) -> Tuple[Turn, ...]:
+        """Speaker turns of the transcript."""
+        return split_turns(self.text)
+
+    def has_any(self, keywords) -> bool:
+        """Return True if any of the keywords occurs in the transcript."""
+        hits = self.keyword_hits
+        return any(keyword in hits for keyword in keywords)
+
+    def count_present(self, keywords) -> int:
+        """Return how many of the keywords occur in the transcript."""
+        hits = self.keyword_hits
+        return sum(1 for keyword in keywords if keyword in hits)
+
+    def speaker_text(self, speaker: str) -> str:
+        """Return the concatenated text of one speaker's turns."""
+        speaker = speaker.lower()
+        return "\n".join(turn.text for turn in self.turns if turn.speaker.lower() == speaker)
+
+
+def split_turns(text: str) -> Tuple[Turn, ...]:
+    """
+    Split a transcript into speaker turns.
+
+    Args:
+        text: Transcript with lines such as "Customer: ..." and "Agent: ..."
+
+    Returns:
+        Tuple of turns; text without speaker prefixes becomes one "Unknown" turn
+    """
+    matches = list(_TURN_PATTERN.finditer(text))
+    if not matches:
+        stripped = text.strip()
+        return (Turn("Unknown", stripped, 0, len(text)),) if stripped else ()
+
+    turns = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        turns.append(Turn(match.group(1), text[match.end():end].strip(), match.start(), end))
+    return tuple(turns)
+
+
+def build_features(transcript: str, ruleset: Ruleset) -> TranscriptFeatures:
+    """
+    Run the single extraction pass over a transcript.
+
+    Args:
+        transcript: The customer call transcript text
+        ruleset: Compiled ruleset whose matcher finds the keyword hits
+
+    Returns:
+        Immutable features object
+    """
+    normalized = transcript.lower()
+    return TranscriptFeatures(
+        text=transcript,
+        normalized=normalized,
+        word_count=len(transcript.split()),
+        keyword_hits=MappingProxyType(ruleset.matcher.find_all(normalized)),
+        ruleset=ruleset
+    )
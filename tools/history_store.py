@@ -0,0 +1,220 @@
+"""Persistent history of classified calls with filtered, paginated queries."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .rollups import create_rollup_table, rebuild_rollups, record_call, rollup_series, rollup_summary
+
+DEFAULT_HISTORY_PATH = "call_history.sqlite3"
+DEFAULT_PAGE_SIZE = 50
+
+# Characters of the transcript returned with each row of a page
+PREVIEW_CHARS = 120
+
+FILTER_COLUMNS = ("category", "sentiment", "urgency")
+
+
+class CallHistoryStore:
+    """
+    SQLite store of classified calls.
+
+    Category, sentiment, urgency and timestamp are indexed columns, so
+    filters, counts and pages are answered by queries instead of by loading
+    the history; a page holds at most page_size rows and only a preview of
+    each transcript. Minute, hour and day rollups (see tools.rollups) are
+    updated with every call, for dashboards over long time ranges. All
+    methods are thread-safe.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_HISTORY_PATH):
+        """
+        Create or open a store.
+
+        Args:
+            db_path: SQLite file (":memory:" for a throwaway store)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        if db_path != ":memory:":
+            # Readers in other sessions never wait on a writer
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS calls ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL NOT NULL, "
+            "category TEXT NOT NULL, sentiment TEXT NOT NULL, urgency TEXT NOT NULL, "
+            "confidence REAL NOT NULL, transcript TEXT NOT NULL, result TEXT NOT NULL)"
+        )
+        for column in ("created_at",) + FILTER_COLUMNS:
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS calls_{column} ON calls ({column})")
+        create_rollup_table(self._db)
+        # Histories recorded before rollups existed are backfilled once
+        if (self._db.execute("SELECT 1 FROM calls LIMIT 1").fetchone() is not None
+                and self._db.execute("SELECT 1 FROM rollups LIMIT 1").fetchone() is None):
+            rebuild_rollups(self._db)
+        self._db.commit()
+
+    def add(self, transcript: str, result: Dict, created_at: Optional[float] = None) -> int:
+        """
+        Record a classified call.
+
+        Args:
+            transcript: The customer call transcript
+            result: Its "classification", "analysis" and "customer_info" results
+            created_at: Unix time of the call; defaults to now
+
+        Returns:
+            The id of the new row
+        """
+        classification = result["classification"]
+        analysis = result["analysis"]
+        stored = {key: result[key] for key in ("classification", "analysis", "customer_info") if key in result}
+        columns = (created_at if created_at is not None else time.time(), classification["primary_category"],
+                   analysis["sentiment"], analysis["urgency_level"], classification["confidence_score"])
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO calls (created_at, category, sentiment, urgency, confidence, transcript, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                columns + (transcript, json.dumps(stored))
+            )
+            record_call(self._db, *columns)
+            self._db.commit()
+            return cursor.lastrowid
+
+    @staticmethod
+    def _where(filters: Dict[str, Optional[str]], since: Optional[float],
+               until: Optional[float]) -> Tuple[str, List]:
+        """Build the WHERE clause for equality filters and a time range."""
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Unknown filter: {column}")
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, since: Optional[float] = None, until: Optional[float] = None, **filters: Optional[str]) -> int:
+        """Return the number of calls matching the filters (category, sentiment, urgency)."""
+        where, params = self._where(filters, since, until)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM calls{where}", params).fetchone()[0]
+
+    def page(self, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE, since: Optional[float] = None,
+             until: Optional[float] = None, **filters: Optional[str]) -> List[Dict]:
+        """
+        Return one page of calls, newest first.
+
+        Args:
+            page: 1-based page number
+            page_size: Calls per page
+            since: Only calls at or after this Unix time
+            until: Only calls before this Unix time
+            filters: Equality filters on category, sentiment and urgency
+
+        Returns:
+            Rows with id, created_at, category, sentiment, urgency, confidence
+            and a transcript preview
+        """
+        where, params = self._where(filters, since, until)
+        page_size = max(1, page_size)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, created_at, category, sentiment, urgency, confidence, "
+                f"substr(transcript, 1, {PREVIEW_CHARS}) FROM calls{where} "
+                "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                params + [page_size, (max(1, page) - 1) * page_size]
+            ).fetchall()
+        columns = ("id", "created_at", "category", "sentiment", "urgency", "confidence", "preview")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def get(self, call_id: int) -> Optional[Dict]:
+        """Return a call's transcript and full results, or None if there is no such call."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, created_at, transcript, result FROM calls WHERE id = ?", (call_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "created_at": row[1], "transcript": row[2], **json.loads(row[3])}
+
+    def summary(self, since: Optional[float] = None, until: Optional[float] = None,
+                **filters: Optional[str]) -> Dict:
+        """
+        Aggregate the calls matching the filters.
+
+        Returns:
+            Total calls, mean confidence and per-category, per-sentiment and
+            per-urgency counts (most common first)
+        """
+        where, params = self._where(filters, since, until)
+        with self._lock:
+            total, avg_confidence = self._db.execute(
+                f"SELECT COUNT(*), AVG(confidence) FROM calls{where}", params
+            ).fetchone()
+            counts = {
+                column: dict(self._db.execute(
+                    f"SELECT {column}, COUNT(*) AS n FROM calls{where} GROUP BY {column} ORDER BY n DESC, {column}",
+                    params
+                ).fetchall())
+                for column in FILTER_COLUMNS
+            }
+        return {
+            "total": total,
+            "avg_confidence": round(avg_confidence, 1) if avg_confidence is not None else 0.0,
+            "categories": counts["category"],
+            "sentiments": counts["sentiment"],
+            "urgencies": counts["urgency"]
+        }
+
+    def rollup_summary(self, granularity: str = "day", since: Optional[float] = None,
+                       until: Optional[float] = None) -> Dict:
+        """Same totals as summary() without filters, read from the rollups (since is rounded to its bucket)."""
+        with self._lock:
+            return rollup_summary(self._db, granularity, since, until)
+
+    def rollup_series(self, granularity: str, dimension: str = "category", since: Optional[float] = None,
+                      until: Optional[float] = None) -> Dict[str, List[Tuple[int, int]]]:
+        """Calls per minute, hour or day bucket for each category, sentiment or urgency."""
+        with self._lock:
+            return rollup_series(self._db, granularity, dimension, since, until)
+
+    def clear(self) -> None:
+        """Delete every call and its rollups."""
+        with self._lock:
+            self._db.execute("DELETE FROM calls")
+            self._db.execute("DELETE FROM rollups")
+            self._db.commit()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+_default_store: Optional[CallHistoryStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_history_store() -> CallHistoryStore:
+    """
+    Return the process-wide call history.
+
+    Stored in CALL_HISTORY_PATH (default call_history.sqlite3 in the working
+    directory; ":memory:" keeps it for the life of the process only).
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = CallHistoryStore(os.getenv("CALL_HISTORY_PATH") or DEFAULT_HISTORY_PATH)
+        return _default_store
@@ -0,0 +1,53 @@
+"""Multi-pattern keyword matching for call transcripts.
+
+The classification tools look up several hundred keyword occurrences per
+transcript. Instead of one substring scan per keyword, an Aho-Corasick
+automaton (pyahocorasick, implemented in C) is built once from every
+keyword table and walked over the transcript a single time, reporting all
+(possibly overlapping) hits.
+"""
+
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, Iterable, Tuple
+
+import ahocorasick
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of keywords.
+
+    Matching uses plain substring semantics, so ``matcher.find_all(text)``
+    reports exactly the keywords for which ``keyword in text`` is true,
+    together with how many times each one occurs (overlaps included).
+    The automaton is immutable once built and safe to share across threads.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Build the automaton.
+
+        Args:
+            keywords: Keywords to match; duplicates and empty strings are ignored
+        """
+        self.keywords: Tuple[str, ...] = tuple(sorted({k for k in keywords if k}))
+        self._automaton = ahocorasick.Automaton()
+        for keyword in self.keywords:
+            self._automaton.add_word(keyword, keyword)
+        self._automaton.make_automaton()
+
+    def find_all(self, text: str) -> Dict[str, int]:
+        """
+        Scan text once and count every keyword occurrence.
+
+        Args:
+            text: Text to scan (callers normalize case beforehand)
+
+        Returns:
+            Mapping of matched keyword to its occurrence count
+        """
+        if not self.keywords:
+            return {}
+        # Counter tallies in C; the automaton yields (end index, keyword) pairs
+        return dict(Counter(map(itemgetter(1), self._automaton.iter(text))))
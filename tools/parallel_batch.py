@@ -0,0 +1,119 @@
+"""Multi-core batch classification with per-call error isolation."""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .classification_tools import classify_transcript
+
+DEFAULT_CHUNK_SIZE = 64
+
+
+def classify_call_quietly(transcript: str) -> Dict:
+    """
+    Classify one call without printing, capturing any error in the result.
+
+    Args:
+        transcript: Customer call transcript text
+
+    Returns:
+        {"status": "success", ...results} or {"status": "error", "error": message}
+    """
+    try:
+        if not isinstance(transcript, str):
+            raise TypeError(f"transcript must be a string, not {type(transcript).__name__}")
+        return {"status": "success", **classify_transcript(transcript)}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+def _classify_chunk(chunk: List[str]) -> List[Dict]:
+    """Worker entry point: classify a chunk, one isolated result per call."""
+    return [classify_call_quietly(transcript) for transcript in chunk]
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    """Yield consecutive lists of up to size items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Map a worker setting to a process count (None or 0 means all cores)."""
+    return workers if workers and workers > 0 else (os.cpu_count() or 1)
+
+
+def iter_classify_parallel(transcripts: Iterable[str], workers: Optional[int] = None,
+                           chunk_size: int = DEFAULT_CHUNK_SIZE, mp_context=None) -> Iterator[Dict]:
+    """
+    Classify transcripts on a process pool, yielding results in input order.
+
+    Transcripts are consumed lazily and at most two chunks per worker are in
+    flight, so memory stays bounded even for unbounded input streams.
+
+    Args:
+        transcripts: Transcript texts (any iterable, including generators)
+        workers: Number of worker processes; None or 0 uses every core
+        chunk_size: Transcripts sent to a worker per task
+        mp_context: Optional multiprocessing context for the workers (e.g. forkserver
+            when called from a threaded server)
+
+    Yields:
+        One classify_call_quietly result per transcript
+    """
+    workers = resolve_workers(workers)
+    chunk_size = max(1, chunk_size)
+
+    if workers == 1:
+        for transcript in transcripts:
+            yield classify_call_quietly(transcript)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        pending = deque()
+        for chunk in _chunks(transcripts, chunk_size):
+            pending.append((len(chunk), executor.submit(_classify_chunk, chunk)))
+            if len(pending) >= workers * 2:
+                yield from _collect(*pending.popleft())
+        while pending:
+            yield from _collect(*pending.popleft())
+
+
+def _collect(size: int, future) -> List[Dict]:
+    """Return a chunk's results, turning a crashed worker into per-call errors."""
+    try:
+        return future.result()
+    except Exception as e:
+        return [{"status": "error", "error": f"worker failed: {e}"} for _ in range(size)]
+
+
+class ThroughputMeter:
+    """Counts processed calls and errors and summarizes throughput."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls = 0
+        self.errors = 0
+
+    def record(self, result: Dict) -> None:
+        """Count one result."""
+        self.calls += 1
+        if result.get("status") != "success":
+            self.errors += 1
+
+    def summary(self) -> Dict:
+        """Return calls, errors, elapsed seconds and calls per second."""
+        elapsed = time.perf_counter() - self.started
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "elapsed_seconds": round(elapsed, 3),
+            "calls_per_second": round(self.calls / elapsed, 1) if elapsed > 0 else 0.0
+        }
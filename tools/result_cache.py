@@ -0,0 +1,214 @@
+"""Content-addressed cache for classification results."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from .classification_tools import classify_transcript, extract_features
+from .ruleset import get_ruleset
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def normalize_transcript(transcript: str) -> str:
+    """
+    Normalize a transcript for hashing.
+
+    Only differences that can never change a result are removed (case and
+    surrounding whitespace), so equal keys always mean equal results.
+    """
+    return transcript.strip().lower()
+
+
+def cache_key(transcript: str, ruleset_fingerprint: Optional[str] = None) -> str:
+    """
+    Compute the cache key of a transcript.
+
+    Args:
+        transcript: The customer call transcript
+        ruleset_fingerprint: Fingerprint (Ruleset.fingerprint) of the keyword
+            rules that produce the result; defaults to the active ruleset
+
+    Returns:
+        Hex SHA-256 digest of the ruleset fingerprint and normalized transcript
+    """
+    if ruleset_fingerprint is None:
+        ruleset_fingerprint = get_ruleset().fingerprint
+    digest = hashlib.sha256(ruleset_fingerprint.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_transcript(transcript).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of classification results keyed by transcript content.
+
+    The memory tier is a bounded LRU. The optional disk tier is a SQLite
+    database that survives restarts; entries found there are promoted into
+    memory. Values are stored as JSON, so callers always get a fresh copy
+    they are free to mutate. All methods are thread-safe.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, db_path: Optional[str] = None):
+        """
+        Create a cache.
+
+        Args:
+            max_entries: Maximum number of results held in memory
+            db_path: Optional SQLite file for the persistent tier
+        """
+        self.max_entries = max(1, max_entries)
+        self.db_path = db_path
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._db = None
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for a key, or None on a miss."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._hits += 1
+                return json.loads(value)
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self._hits += 1
+                    self._disk_hits += 1
+                    return json.loads(row[0])
+
+            self._misses += 1
+            return None
+
+    def put(self, key: str, result: Dict) -> None:
+        """Store a result in memory and, if configured, on disk."""
+        value = json.dumps(result)
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, time.time())
+                )
+                self._db.commit()
+
+    def get_or_compute(self, transcript: str, compute: Callable[[str], Dict],
+                       ruleset_fingerprint: Optional[str] = None) -> Dict:
+        """
+        Return the cached result for a transcript, computing it on a miss.
+
+        Args:
+            transcript: The customer call transcript
+            compute: Function producing the result from the transcript
+            ruleset_fingerprint: Fingerprint of the rules behind compute; defaults to the active ruleset
+
+        Returns:
+            The (possibly cached) result
+        """
+        key = cache_key(transcript, ruleset_fingerprint)
+        result = self.get(key)
+        if result is None:
+            result = compute(transcript)
+            self.put(key, result)
+        return result
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            stats = {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups * 100, 2) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries
+            }
+            if self._db is not None:
+                stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return stats
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            self._hits = self._disk_hits = self._misses = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, value: str) -> None:
+        """Insert into the memory tier, evicting the least recently used entry."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+_default_cache: Optional[ResultCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> ResultCache:
+    """
+    Return the process-wide cache.
+
+    Configured through CLASSIFICATION_CACHE_SIZE (memory entries) and
+    CLASSIFICATION_CACHE_PATH (SQLite file; unset keeps the cache in memory).
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache(
+                max_entries=int(os.getenv("CLASSIFICATION_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+                db_path=os.getenv("CLASSIFICATION_CACHE_PATH") or None
+            )
+        return _default_cache
+
+
+def classify_transcript_cached(transcript: str, cache: Optional[ResultCache] = None) -> Dict:
+    """
+    Cached version of classify_transcript.
+
+    Args:
+        transcript: The customer call transcript
+        cache: Cache to use; defaults to the process-wide cache
+
+    Returns:
+        Dictionary with "analysis", "classification" and "customer_info" results
+    """
+    cache = cache if cache is not None else get_default_cache()
+    # Pin one ruleset so the key and the computed result always agree on its rules
+    ruleset = get_ruleset()
+    return cache.get_or_compute(
+        transcript,
+        lambda text: classify_transcript(extract_features(text, ruleset)),
+        ruleset.fingerprint
+    )
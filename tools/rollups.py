@@ -0,0 +1,133 @@
+"""Time-bucketed rollups of classified calls.
+
+For every minute, hour and day, the rollup table keeps the number of calls
+and the sum of their confidence scores per category, sentiment and urgency.
+Recording a call upserts a fixed nine rows (three granularities by three
+dimensions), so the cost of keeping the rollups does not grow with the
+history. Dashboards then read a few buckets instead of scanning every call.
+
+The functions take the caller's SQLite connection and leave committing to
+it, so a call and its rollups are written in one transaction.
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Bucket width in seconds; days start at local midnight instead
+GRANULARITIES = {
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400
+}
+
+DIMENSIONS = ("category", "sentiment", "urgency")
+
+_UPSERT = (
+    "INSERT INTO rollups (granularity, bucket, dimension, value, calls, confidence_sum) "
+    "VALUES (?, ?, ?, ?, 1, ?) "
+    "ON CONFLICT (granularity, bucket, dimension, value) DO UPDATE SET "
+    "calls = calls + 1, confidence_sum = confidence_sum + excluded.confidence_sum"
+)
+
+
+def bucket_start(timestamp: float, granularity: str) -> int:
+    """Return the Unix time at which the bucket holding the timestamp starts."""
+    if granularity == "day":
+        return int(datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+    width = GRANULARITIES[granularity]
+    return int(timestamp // width * width)
+
+
+def create_rollup_table(db: sqlite3.Connection) -> None:
+    """Create the rollup table if it does not exist."""
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS rollups ("
+        "granularity TEXT NOT NULL, bucket INTEGER NOT NULL, dimension TEXT NOT NULL, value TEXT NOT NULL, "
+        "calls INTEGER NOT NULL, confidence_sum REAL NOT NULL, "
+        "PRIMARY KEY (granularity, bucket, dimension, value)) WITHOUT ROWID"
+    )
+
+
+def record_call(db: sqlite3.Connection, created_at: float, category: str, sentiment: str,
+                urgency: str, confidence: float) -> None:
+    """Add one call to its minute, hour and day buckets."""
+    values = {"category": category, "sentiment": sentiment, "urgency": urgency}
+    db.executemany(_UPSERT, [
+        (granularity, bucket_start(created_at, granularity), dimension, values[dimension], confidence)
+        for granularity in GRANULARITIES
+        for dimension in DIMENSIONS
+    ])
+
+
+def rebuild_rollups(db: sqlite3.Connection) -> None:
+    """Recompute every rollup from the calls table (for histories recorded without rollups)."""
+    db.execute("DELETE FROM rollups")
+    for created_at, category, sentiment, urgency, confidence in db.execute(
+            "SELECT created_at, category, sentiment, urgency, confidence FROM calls").fetchall():
+        record_call(db, created_at, category, sentiment, urgency, confidence)
+
+
+def _range(since: Optional[float], until: Optional[float], granularity: str) -> Tuple[str, List]:
+    """WHERE clause for the buckets overlapping [since, until)."""
+    clauses, params = ["granularity = ?"], [granularity]
+    if since is not None:
+        clauses.append("bucket >= ?")
+        params.append(bucket_start(since, granularity))
+    if until is not None:
+        clauses.append("bucket < ?")
+        params.append(until)
+    return " AND ".join(clauses), params
+
+
+def rollup_summary(db: sqlite3.Connection, granularity: str = "day", since: Optional[float] = None,
+                   until: Optional[float] = None) -> Dict:
+    """
+    Sum the buckets overlapping a time range.
+
+    Ranges are widened to whole buckets: since is rounded down to the start
+    of its bucket.
+
+    Returns:
+        Total calls, mean confidence and per-category, per-sentiment and
+        per-urgency counts (most common first)
+    """
+    where, params = _range(since, until, granularity)
+    rows = db.execute(
+        f"SELECT dimension, value, SUM(calls) AS n, SUM(confidence_sum) FROM rollups WHERE {where} "
+        "GROUP BY dimension, value ORDER BY n DESC, value", params
+    ).fetchall()
+    counts: Dict[str, Dict[str, int]] = {dimension: {} for dimension in DIMENSIONS}
+    total, confidence_sum = 0, 0.0
+    for dimension, value, calls, confidence in rows:
+        counts[dimension][value] = calls
+        # Every call is counted once per dimension; add up one of them
+        if dimension == "category":
+            total += calls
+            confidence_sum += confidence
+    return {
+        "total": total,
+        "avg_confidence": round(confidence_sum / total, 1) if total else 0.0,
+        "categories": counts["category"],
+        "sentiments": counts["sentiment"],
+        "urgencies": counts["urgency"]
+    }
+
+
+def rollup_series(db: sqlite3.Connection, granularity: str, dimension: str = "category",
+                  since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Return calls per bucket for each value of a dimension.
+
+    Returns:
+        Per value, (bucket start, calls) pairs in time order; empty buckets are omitted
+    """
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Unknown dimension: {dimension}")
+    where, params = _range(since, until, granularity)
+    series: Dict[str, List[Tuple[int, int]]] = {}
+    for bucket, value, calls in db.execute(
+            f"SELECT bucket, value, calls FROM rollups WHERE {where} AND dimension = ? ORDER BY bucket, value",
+            params + [dimension]).fetchall():
+        series.setdefault(value, []).append((bucket, calls))
+    return series
@@ -0,0 +1,268 @@
+"""Versioned keyword ruleset, compiled once and hot-reloaded from disk.
+
+The categories and every keyword table used by the classification tools
+live in a JSON (or, with PyYAML installed, YAML) ruleset file. A ruleset
+is compiled into an immutable ``Ruleset`` holding the tables and a shared
+``KeywordMatcher``. ``get_ruleset()`` returns the current one and, at most
+every ``RELOAD_INTERVAL`` seconds, checks whether the file changed; a
+changed file is compiled and swapped in atomically, so running workers and
+the Streamlit app pick up new rules without a restart. A file that fails
+to load leaves the previous ruleset in place.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+from .keyword_matcher import KeywordMatcher
+
+DEFAULT_RULESET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rulesets", "default.json")
+
+# Seconds between checks of the ruleset file for changes
+RELOAD_INTERVAL = 2.0
+
+KeywordTable = Mapping[str, Tuple[str, ...]]
+
+
+class RulesetError(ValueError):
+    """Raised when a ruleset file is missing fields or malformed."""
+
+
+@dataclass(frozen=True, eq=False)
+class Ruleset:
+    """
+    Compiled, immutable classification rules.
+
+    Attributes:
+        version: Ruleset version, recorded on results
+        fingerprint: Version plus a SHA-256 of the ruleset's canonical JSON,
+            used in cache keys so edits without a version bump still count
+        categories: Category name to description
+        category_keywords: Category name to keywords scored for it
+        negative_words / positive_words: Sentiment keywords
+        topic_keywords, service_keywords, issue_keywords, request_keywords: Label to keywords
+        urgent_keywords / medium_urgency_keywords: Urgency keywords
+        sentiment_indicators: (indicator text, keywords) pairs
+        matcher: Automaton over every keyword above
+        source: File the ruleset was loaded from
+    """
+
+    version: str
+    categories: Mapping[str, str]
+    category_keywords: KeywordTable
+    negative_words: Tuple[str, ...]
+    positive_words: Tuple[str, ...]
+    topic_keywords: KeywordTable
+    urgent_keywords: Tuple[str, ...]
+    medium_urgency_keywords: Tuple[str, ...]
+    service_keywords: KeywordTable
+    issue_keywords: KeywordTable
+    request_keywords: KeywordTable
+    sentiment_indicators: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    fingerprint: str
+    source: Optional[str] = None
+    matcher: KeywordMatcher = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "matcher", KeywordMatcher(self.all_keywords()))
+
+    def all_keywords(self) -> Iterator[str]:
+        """Yield every keyword referenced by the ruleset (with repeats)."""
+        yield from self.negative_words
+        yield from self.positive_words
+        yield from self.urgent_keywords
+        yield from self.medium_urgency_keywords
+        for table in (self.category_keywords, self.topic_keywords, self.service_keywords,
+                      self.issue_keywords, self.request_keywords):
+            for keywords in table.values():
+                yield from keywords
+        for _, keywords in self.sentiment_indicators:
+            yield from keywords
+
+
+def _keywords(value, where: str) -> Tuple[str, ...]:
+    """Validate a keyword list and lower-case it to match normalized text."""
+    if not isinstance(value, list) or not all(isinstance(k, str) and k for k in value):
+        raise RulesetError(f"{where} must be a list of non-empty strings")
+    return tuple(keyword.lower() for keyword in value)
+
+
+def _table(data: Dict, key: str) -> KeywordTable:
+    """Validate a label -> keywords table."""
+    value = data.get(key)
+    if not isinstance(value, dict):
+        raise RulesetError(f"'{key}' must be a mapping of label to keyword list")
+    return MappingProxyType({label: _keywords(keywords, f"{key}.{label}") for label, keywords in value.items()})
+
+
+def _section(data: Dict, key: str) -> Dict:
+    """Return a required mapping section."""
+    value = data.get(key)
+    if not isinstance(value, dict):
+        raise RulesetError(f"'{key}' must be a mapping")
+    return value
+
+
+def ruleset_fingerprint(data: Dict) -> str:
+    """Return "<version>:<sha256 of the canonical JSON>" for a ruleset document."""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return f"{data.get('version')}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+
+def compile_ruleset(data: Dict, source: Optional[str] = None) -> Ruleset:
+    """
+    Validate raw ruleset data and compile it.
+
+    Args:
+        data: Parsed ruleset document
+        source: Where the data came from, for error messages
+
+    Returns:
+        Compiled ruleset
+    """
+    if not isinstance(data, dict):
+        raise RulesetError("ruleset must be a mapping")
+    version = data.get("version")
+    if version in (None, ""):
+        raise RulesetError("ruleset is missing 'version'")
+
+    categories = _section(data, "categories")
+    if not categories:
+        raise RulesetError("'categories' must not be empty")
+    category_keywords = _table(data, "category_keywords")
+    if list(category_keywords) != list(categories):
+        raise RulesetError("'category_keywords' must list exactly the categories, in the same order")
+
+    sentiment = _section(data, "sentiment")
+    urgency = _section(data, "urgency")
+    indicators = data.get("sentiment_indicators")
+    if not isinstance(indicators, list) or not all(isinstance(item, dict) for item in indicators):
+        raise RulesetError("'sentiment_indicators' must be a list of {label, keywords} mappings")
+
+    return Ruleset(
+        version=str(version),
+        categories=MappingProxyType({str(name): str(description) for name, description in categories.items()}),
+        category_keywords=category_keywords,
+        negative_words=_keywords(sentiment.get("negative"), "sentiment.negative"),
+        positive_words=_keywords(sentiment.get("positive"), "sentiment.positive"),
+        topic_keywords=_table(data, "topic_keywords"),
+        urgent_keywords=_keywords(urgency.get("high"), "urgency.high"),
+        medium_urgency_keywords=_keywords(urgency.get("medium"), "urgency.medium"),
+        service_keywords=_table(data, "service_keywords"),
+        issue_keywords=_table(data, "issue_keywords"),
+        request_keywords=_table(data, "request_keywords"),
+        sentiment_indicators=tuple(
+            (str(item.get("label")), _keywords(item.get("keywords"), f"sentiment_indicators[{i}]"))
+            for i, item in enumerate(indicators)
+        ),
+        fingerprint=ruleset_fingerprint(data),
+        source=source
+    )
+
+
+def load_ruleset(path: str) -> Ruleset:
+    """
+    Load and compile a ruleset file.
+
+    Args:
+        path: JSON file, or YAML file (.yaml/.yml) when PyYAML is installed
+
+    Returns:
+        Compiled ruleset
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise RulesetError("PyYAML is required to load YAML rulesets") from e
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    return compile_ruleset(data, source=path)
+
+
+class _RulesetState:
+    """The active ruleset plus what is needed to notice file changes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.path: Optional[str] = None
+        self.ruleset: Optional[Ruleset] = None
+        self.signature = None
+        self.checked_at = 0.0
+
+
+_state = _RulesetState()
+
+
+def ruleset_path() -> str:
+    """Return the configured ruleset file (CLASSIFICATION_RULESET_PATH or the bundled default)."""
+    return _state.path or os.getenv("CLASSIFICATION_RULESET_PATH") or DEFAULT_RULESET_PATH
+
+
+def _file_signature(path: str):
+    """Return (mtime, size) of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def reload_ruleset(force: bool = False) -> Ruleset:
+    """
+    Reload the ruleset file if it changed (or unconditionally with force).
+
+    A file that cannot be loaded is reported on stderr and the previously
+    active ruleset stays in use; with no previous ruleset the error is raised.
+
+    Returns:
+        The active ruleset after the check
+    """
+    with _state.lock:
+        path = ruleset_path()
+        signature = _file_signature(path)
+        _state.checked_at = time.monotonic()
+        if not force and _state.ruleset is not None and signature == _state.signature:
+            return _state.ruleset
+
+        try:
+            ruleset = load_ruleset(path)
+        except (OSError, ValueError) as e:
+            if _state.ruleset is None:
+                raise
+            print(f"Keeping ruleset {_state.ruleset.version}: failed to load {path} ({e})", file=sys.stderr)
+            _state.signature = signature
+            return _state.ruleset
+
+        # A single reference assignment: readers see either the old or the new ruleset
+        _state.ruleset = ruleset
+        _state.signature = signature
+        return ruleset
+
+
+def get_ruleset() -> Ruleset:
+    """Return the active ruleset, picking up file changes at most every RELOAD_INTERVAL seconds."""
+    ruleset = _state.ruleset
+    if ruleset is not None and time.monotonic() - _state.checked_at < RELOAD_INTERVAL:
+        return ruleset
+    return reload_ruleset()
+
+
+def use_ruleset_file(path: Optional[str]) -> Ruleset:
+    """
+    Switch to another ruleset file (None returns to the configured default).
+
+    Returns:
+        The newly loaded ruleset
+    """
+    with _state.lock:
+        _state.path = path
+    return reload_ruleset(force=True)
@@ -0,0 +1,175 @@
+"""Client of the classification HTTP service (classification_service.py).
+
+Uses the standard library only, so UIs can call the service without
+loading the keyword engine. Each thread keeps one persistent connection,
+so consecutive calls reuse it instead of opening a socket per request.
+"""
+
+import http.client
+import json
+import os
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 30.0
+
+# Transcripts sent per batch request by iter_classify_remote()
+DEFAULT_REMOTE_CHUNK_SIZE = 256
+
+
+class ServiceError(RuntimeError):
+    """Raised when the service answers with an error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"classification service returned {status}: {message}")
+        self.status = status
+
+
+class ClassificationClient:
+    """
+    Keep-alive client of the classification service.
+
+    Thread-safe: every thread gets its own connection. A connection the
+    server has closed while idle is reopened and the request sent again;
+    every endpoint is free of side effects, so a retry is always safe.
+    """
+
+    def __init__(self, base_url: str, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Create a client.
+
+        Args:
+            base_url: Service URL, e.g. http://127.0.0.1:8000
+            timeout: Seconds to wait for a connection or a response
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"invalid classification service URL: {base_url!r}")
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connection_class(self._host, self._port, timeout=self.timeout)
+        return connection
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _request(self, method: str, path: str, body: Optional[Dict] = None) -> bytes:
+        """Send a request on the kept-alive connection and return the response body; reconnects once if stale."""
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, self._prefix + path, body=payload, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                    ConnectionResetError, BrokenPipeError):
+                self.close()
+                if attempt:
+                    raise
+                continue
+            except OSError:
+                self.close()
+                raise
+            if response.status >= 400:
+                try:
+                    message = json.loads(data).get("error", data.decode("utf-8", "replace"))
+                except (ValueError, AttributeError):
+                    message = data.decode("utf-8", "replace")
+                raise ServiceError(response.status, message)
+            return data
+
+    def _json(self, method: str, path: str, body: Optional[Dict] = None):
+        return json.loads(self._request(method, path, body))
+
+    def health(self) -> Dict:
+        """Return the service's ruleset version and fingerprint, worker count and cache stats."""
+        return self._json("GET", "/health")
+
+    def classify(self, transcript: str, reports: Sequence[str] = ()) -> Dict:
+        """
+        Classify one call.
+
+        Args:
+            transcript: The customer call transcript
+            reports: Report formats ("text", "json", "csv") to render along with the results
+
+        Returns:
+            {"status": "success", "classification", "analysis", "customer_info"}
+            plus {"reports": {format: text}} when reports were requested
+        """
+        body = {"transcript": transcript}
+        if reports:
+            body["reports"] = list(reports)
+        return self._json("POST", "/v1/classify", body)
+
+    def classify_batch(self, transcripts: List[str]) -> List[Dict]:
+        """Classify many calls in one request; each result has its own status, in input order."""
+        return self._json("POST", "/v1/classify/batch", {"transcripts": list(transcripts)})["results"]
+
+    def report(self, transcript: str, output_format: str = "text") -> str:
+        """Return the rendered classification report of one call."""
+        return self._request("POST", "/v1/report", {"transcript": transcript, "format": output_format}).decode("utf-8")
+
+
+def iter_classify_remote(client: ClassificationClient, transcripts: Iterable[str],
+                         chunk_size: int = DEFAULT_REMOTE_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Classify transcripts through the service, yielding results in input order.
+
+    Transcripts are sent chunk_size at a time; a chunk whose request fails
+    turns into one error result per call, like a crashed worker in
+    parallel_batch.iter_classify_parallel.
+    """
+    def send(chunk: List[str]) -> List[Dict]:
+        try:
+            return client.classify_batch(chunk)
+        except (ServiceError, OSError, ValueError) as e:
+            return [{"status": "error", "error": f"service request failed: {e}"} for _ in chunk]
+
+    chunk: List[str] = []
+    for transcript in transcripts:
+        chunk.append(transcript)
+        if len(chunk) >= chunk_size:
+            yield from send(chunk)
+            chunk = []
+    if chunk:
+        yield from send(chunk)
+
+
+_default_client: Optional[ClassificationClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_service_client() -> Optional[ClassificationClient]:
+    """
+    Return the process-wide service client, or None to classify in-process.
+
+    Configured through CLASSIFICATION_SERVICE_URL (unset classifies in
+    this process) and CLASSIFICATION_SERVICE_TIMEOUT (seconds).
+    """
+    global _default_client
+    url = os.getenv("CLASSIFICATION_SERVICE_URL")
+    if not url:
+        return None
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = ClassificationClient(
+                url, float(os.getenv("CLASSIFICATION_SERVICE_TIMEOUT", DEFAULT_TIMEOUT))
+            )
+        return _default_client
@@ -0,0 +1,193 @@
+"""Streaming transcript readers and result writers.
+
+Readers yield one record per call and never hold more than the current
+call in memory, so arbitrarily large exports can be piped through the
+classifier. Supported inputs are JSONL, CSV and plain text with calls
+separated by a line containing only ``---``.
+"""
+
+import csv
+import json
+import os
+import sys
+from typing import Dict, IO, Iterator, List, Optional
+
+INPUT_FORMATS = ("jsonl", "csv", "text")
+OUTPUT_FORMATS = ("jsonl", "csv")
+
+# Field names accepted for the transcript text and the call identifier
+TRANSCRIPT_FIELDS = ("transcript", "text", "call_transcript")
+ID_FIELDS = ("id", "call_id")
+
+CALL_DELIMITER = "---"
+
+# Column order of flattened CSV results
+RESULT_CSV_FIELDS = [
+    "id", "status", "primary_category", "confidence_score", "sentiment",
+    "urgency_level", "duration_estimate", "key_topics", "mentioned_services",
+    "issues_reported", "requests", "ruleset_version", "error"
+]
+
+_EXTENSION_FORMATS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".txt": "text",
+    ".text": "text"
+}
+
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+def detect_format(path: str, default: str = "text") -> str:
+    """Guess an input or output format from a file extension."""
+    return _EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower(), default)
+
+
+def _record(fields: Dict, fallback_id: str) -> Optional[Dict]:
+    """Normalize a parsed row into {"id", "transcript"}; None if it has no text."""
+    transcript = next((fields[name] for name in TRANSCRIPT_FIELDS if fields.get(name)), None)
+    if transcript is None:
+        return None
+    call_id = next((fields[name] for name in ID_FIELDS if fields.get(name) not in (None, "")), fallback_id)
+    return {"id": str(call_id), "transcript": transcript}
+
+
+def read_jsonl(stream: IO[str], source: str = "stdin") -> Iterator[Dict]:
+    """Yield records from JSON lines; bare JSON strings are taken as transcripts."""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Skipping {source}:{line_number}: invalid JSON ({e})", file=sys.stderr)
+            continue
+        fields = {"transcript": value} if isinstance(value, str) else value
+        if not isinstance(fields, dict):
+            continue
+        record = _record(fields, f"{source}:{line_number}")
+        if record is not None:
+            yield record
+
+
+def read_csv(stream: IO[str], source: str = "stdin") -> Iterator[Dict]:
+    """Yield records from CSV rows with a transcript (or text) column."""
+    for row_number, row in enumerate(csv.DictReader(stream), 1):
+        record = _record(row, f"{source}:{row_number}")
+        if record is not None:
+            yield record
+
+
+def read_delimited_text(stream: IO[str], source: str = "stdin") -> Iterator[Dict]:
+    """Yield records from text where calls are separated by a line of only ---."""
+    lines: List[str] = []
+    call_number = 0
+    for line in stream:
+        if line.strip() != CALL_DELIMITER:
+            lines.append(line)
+            continue
+        text = "".join(lines).strip()
+        lines = []
+        if text:
+            call_number += 1
+            yield {"id": f"{source}:{call_number}", "transcript": text}
+
+    text = "".join(lines).strip()
+    if text:
+        yield {"id": f"{source}:{call_number + 1}", "transcript": text}
+
+
+_READERS = {
+    "jsonl": read_jsonl,
+    "csv": read_csv,
+    "text": read_delimited_text
+}
+
+
+def read_stream(stream: IO[str], input_format: str, source: str = "stdin") -> Iterator[Dict]:
+    """Yield records from an open text stream in the given format."""
+    if input_format not in _READERS:
+        raise ValueError(f"Unknown input format: {input_format}")
+    return _READERS[input_format](stream, source)
+
+
+def iter_transcripts(source: str, input_format: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream transcript records from a file, a directory or stdin.
+
+    Args:
+        source: File path, directory path (read recursively in name order) or "-" for stdin
+        input_format: "jsonl", "csv" or "text"; None detects it per file from the extension
+
+    Yields:
+        {"id": str, "transcript": str} records
+    """
+    if source == "-":
+        yield from read_stream(sys.stdin, input_format or "text")
+        return
+
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.startswith("."):
+                    continue
+                yield from iter_transcripts(os.path.join(root, name), input_format)
+        return
+
+    file_format = input_format or detect_format(source)
+    with open(source, "r", encoding="utf-8", newline="" if file_format == "csv" else None) as stream:
+        yield from read_stream(stream, file_format, source)
+
+
+def flatten_result(call_id: str, result: Dict) -> Dict:
+    """Flatten a classification result into one CSV row."""
+    classification = result.get("classification", {})
+    analysis = result.get("analysis", {})
+    customer_info = result.get("customer_info", {})
+    return {
+        "id": call_id,
+        "status": result.get("status", ""),
+        "primary_category": classification.get("primary_category", ""),
+        "confidence_score": classification.get("confidence_score", ""),
+        "sentiment": analysis.get("sentiment", ""),
+        "urgency_level": analysis.get("urgency_level", ""),
+        "duration_estimate": analysis.get("duration_estimate", ""),
+        "key_topics": ";".join(analysis.get("key_topics", [])),
+        "mentioned_services": ";".join(customer_info.get("mentioned_services", [])),
+        "issues_reported": ";".join(customer_info.get("issues_reported", [])),
+        "requests": ";".join(customer_info.get("requests", [])),
+        "ruleset_version": classification.get("ruleset_version", ""),
+        "error": result.get("error", "")
+    }
+
+
+class ResultWriter:
+    """Writes classification results one at a time as JSONL or CSV."""
+
+    def __init__(self, stream: IO[str], output_format: str = "jsonl"):
+        """
+        Create a writer.
+
+        Args:
+            stream: Open text stream to write to
+            output_format: "jsonl" (full results) or "csv" (flattened rows)
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.stream = stream
+        self.output_format = output_format
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=RESULT_CSV_FIELDS, lineterminator="\n")
+            self._csv.writeheader()
+
+    def write(self, call_id: str, result: Dict) -> None:
+        """Write one result and flush it so consumers see it immediately."""
+        if self._csv is not None:
+            self._csv.writerow(flatten_result(call_id, result))
+        else:
+            self.stream.write(json.dumps({"id": call_id, **result}) + "\n")
+        self.stream.flush()